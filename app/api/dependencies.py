@@ -1,55 +1,347 @@
-from collections.abc import Iterator
-from functools import lru_cache
-from typing import Annotated
+from collections.abc import AsyncIterator, Callable
+from contextlib import AbstractAsyncContextManager, asynccontextmanager
+from functools import lru_cache, partial
+from typing import Annotated, Any
 
-from fastapi import Depends
+from anyio import to_thread
+from fastapi import Depends, Query, Request
+from pydantic import PositiveInt
 from sqlalchemy import Engine, create_engine
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine
 from sqlalchemy.orm import Session
 
-from app.application.services.post import PostService
-from app.application.services.user import UserService
-from app.core.config import Settings, get_settings
-from app.infrastructure.repositories.post import PostSQLAlchemyRepository
-from app.infrastructure.repositories.user import UserSQLAlchemyRepository
+from app.api.replicas import RECENT_WRITE_COOKIE
+from app.application.dtos import PostCreate, PostUpdate, UserCreate, UserUpdate
+from app.application.services.post import AsyncPostService
+from app.application.services.user import AsyncUserService
+from app.core.config import ReplicaSelection, Settings, get_settings
+from app.domain.constants import PaginationConstants
+from app.domain.models import PaginationParams, PostDomain, UserDomain
+from app.domain.repository import AsyncAbstractRepository, AsyncPostRepository
+from app.infrastructure.cache import EntityCache, LRUCache
+from app.infrastructure.pool import (
+    InstrumentedAsyncAdaptedQueuePool,
+    InstrumentedQueuePool,
+    PoolOptions,
+    instrument,
+)
+from app.infrastructure.prepared import PreparedStatementOptions
+from app.infrastructure.replicas import ReplicaSet, RoutingSession
+from app.infrastructure.repositories.cached import (
+    AsyncCachedPostRepository,
+    AsyncCachedRepository,
+)
+from app.infrastructure.repositories.post import (
+    AsyncPostSQLAlchemyRepository,
+    post_dependents,
+)
+from app.infrastructure.repositories.user import (
+    AsyncUserSQLAlchemyRepository,
+    user_dependents,
+)
+
+READ_METHODS = frozenset({"GET", "HEAD"})
 
 
 def get_database_uri(settings: Annotated[Settings, Depends(get_settings)]) -> str:
     return str(settings.SQLALCHEMY_DATABASE_URI)
 
 
+def get_replica_uris(
+    settings: Annotated[Settings, Depends(get_settings)],
+) -> tuple[str, ...]:
+    return tuple(str(uri) for uri in settings.SQLALCHEMY_REPLICA_URIS)
+
+
+def get_pool_options(
+    settings: Annotated[Settings, Depends(get_settings)],
+) -> PoolOptions:
+    return PoolOptions(
+        size=settings.DATABASE_POOL_SIZE,
+        max_overflow=settings.DATABASE_MAX_OVERFLOW,
+        timeout=settings.DATABASE_POOL_TIMEOUT,
+        recycle=settings.DATABASE_POOL_RECYCLE,
+        pre_ping=settings.DATABASE_POOL_PRE_PING,
+        use_lifo=settings.DATABASE_POOL_USE_LIFO,
+    )
+
+
+def get_prepared_statement_options(
+    settings: Annotated[Settings, Depends(get_settings)],
+) -> PreparedStatementOptions:
+    return PreparedStatementOptions(
+        threshold=settings.DATABASE_PREPARE_THRESHOLD,
+        max_prepared=settings.DATABASE_PREPARED_MAX,
+    )
+
+
 @lru_cache
-def get_engine(database_uri: Annotated[str, Depends(get_database_uri)]) -> Engine:
-    return create_engine(database_uri)
+def get_engine(
+    database_uri: Annotated[str, Depends(get_database_uri)],
+    pool_options: Annotated[PoolOptions, Depends(get_pool_options)],
+    prepared: Annotated[
+        PreparedStatementOptions, Depends(get_prepared_statement_options)
+    ],
+) -> Engine:
+    engine = create_engine(
+        database_uri,
+        poolclass=InstrumentedQueuePool,
+        connect_args=prepared.connect_args(database_uri),
+        **pool_options.engine_options(),
+    )
+    instrument(engine.pool)  # type: ignore[arg-type]
+    prepared.configure(engine.pool, database_uri)
+    return engine
+
+
+@lru_cache
+def get_async_engine(
+    database_uri: Annotated[str, Depends(get_database_uri)],
+    pool_options: Annotated[PoolOptions, Depends(get_pool_options)],
+    prepared: Annotated[
+        PreparedStatementOptions, Depends(get_prepared_statement_options)
+    ],
+) -> AsyncEngine:
+    engine = create_async_engine(
+        database_uri,
+        poolclass=InstrumentedAsyncAdaptedQueuePool,
+        connect_args=prepared.connect_args(database_uri),
+        **pool_options.engine_options(),
+    )
+    instrument(engine.pool)  # type: ignore[arg-type]
+    prepared.configure(engine.pool, database_uri)
+    return engine
+
+
+def get_pool(
+    settings: Annotated[Settings, Depends(get_settings)],
+) -> InstrumentedQueuePool:
+    """Pool of the engine serving requests."""
+    database_uri = get_database_uri(settings)
+    pool_options = get_pool_options(settings)
+    prepared = get_prepared_statement_options(settings)
+    if settings.DATABASE_ASYNC:
+        pool = get_async_engine(database_uri, pool_options, prepared).pool
+    else:
+        pool = get_engine(database_uri, pool_options, prepared).pool
+    return pool  # type: ignore[return-value]
+
+
+@lru_cache
+def _replica_set(
+    replica_uris: tuple[str, ...],
+    pool_options: PoolOptions,
+    prepared: PreparedStatementOptions,
+    selection: ReplicaSelection,
+    use_async: bool,
+) -> ReplicaSet:
+    engines = [
+        get_async_engine(uri, pool_options, prepared).sync_engine
+        if use_async
+        else get_engine(uri, pool_options, prepared)
+        for uri in replica_uris
+    ]
+    return ReplicaSet(engines, selection=selection)
+
+
+# Opens a session, for work that outlives the request session
+SessionFactory = Callable[[], AbstractAsyncContextManager[Session | AsyncSession]]
+
+
+def get_session_factory(
+    request: Request,
+    settings: Annotated[Settings, Depends(get_settings)],
+    database_uri: Annotated[str, Depends(get_database_uri)],
+    replica_uris: Annotated[tuple[str, ...], Depends(get_replica_uris)],
+) -> SessionFactory:
+    """
+    Sessions of the request, reading from a replica when there are some.
+
+    Only reads of clients that did not write recently go to a replica. Writes
+    mark their client with a cookie, set once the write succeeded.
+    """
+    pool_options = get_pool_options(settings)
+    prepared = get_prepared_statement_options(settings)
+    replicas = None
+    if replica_uris and request.method not in READ_METHODS:
+        request.state.recent_write_window = settings.READ_YOUR_WRITES_WINDOW
+    elif replica_uris and RECENT_WRITE_COOKIE not in request.cookies:
+        replicas = _replica_set(
+            replica_uris,
+            pool_options,
+            prepared,
+            settings.REPLICA_SELECTION,
+            settings.DATABASE_ASYNC,
+        )
+
+    return partial(
+        _open_session,
+        database_uri=database_uri,
+        pool_options=pool_options,
+        prepared=prepared,
+        replicas=replicas,
+        use_async=settings.DATABASE_ASYNC,
+    )
 
 
-def get_session(engine: Annotated[Engine, Depends(get_engine)]) -> Iterator[Session]:
-    with Session(engine) as session:
+@asynccontextmanager
+async def _open_session(
+    database_uri: str,
+    pool_options: PoolOptions,
+    prepared: PreparedStatementOptions,
+    replicas: ReplicaSet | None,
+    use_async: bool,
+) -> AsyncIterator[Session | AsyncSession]:
+    if use_async:
+        async_engine = get_async_engine(database_uri, pool_options, prepared)
+        async with AsyncSession(
+            async_engine, sync_session_class=RoutingSession, replicas=replicas
+        ) as async_session:
+            yield async_session
+        return
+
+    engine = get_engine(database_uri, pool_options, prepared)
+    session = RoutingSession(engine, replicas=replicas)
+    try:
+        yield session
+    finally:
+        await to_thread.run_sync(session.close)
+
+
+async def get_session(
+    session_factory: Annotated[SessionFactory, Depends(get_session_factory)],
+) -> AsyncIterator[Session | AsyncSession]:
+    async with session_factory() as session:
         yield session
 
 
+def get_search_pagination(
+    limit: Annotated[PositiveInt, Query(le=PaginationConstants.MAX_LIMIT)] = 100,
+    after: str | None = None,
+) -> PaginationParams:
+    """Pagination of searches, which follow cursors only."""
+    return PaginationParams(limit=limit, after=after)
+
+
+def get_trusted_mapping(settings: Annotated[Settings, Depends(get_settings)]) -> bool:
+    return settings.TRUSTED_MAPPING and not settings.VALIDATE_MAPPING
+
+
+@lru_cache
+def _entity_cache(maxsize: int, ttl: float, negative_ttl: float) -> EntityCache:
+    return EntityCache(
+        backend=LRUCache(maxsize=maxsize, ttl=ttl), negative_ttl=negative_ttl
+    )
+
+
+def get_entity_cache(
+    settings: Annotated[Settings, Depends(get_settings)],
+) -> EntityCache | None:
+    if not settings.ENTITY_CACHE:
+        return None
+    return _entity_cache(
+        settings.ENTITY_CACHE_SIZE,
+        settings.ENTITY_CACHE_TTL,
+        settings.ENTITY_CACHE_NEGATIVE_TTL,
+    )
+
+
+def _reads_from_replica(session: Session | AsyncSession) -> bool:
+    if isinstance(session, AsyncSession):
+        session = session.sync_session
+    return isinstance(session, RoutingSession) and session.replicas is not None
+
+
 @lru_cache
 def get_user_repository(
-    session: Annotated[Session, Depends(get_session)],
-) -> UserSQLAlchemyRepository:
-    return UserSQLAlchemyRepository(session=session)
+    session: Annotated[Session | AsyncSession, Depends(get_session)],
+    trusted_mapping: Annotated[bool, Depends(get_trusted_mapping)],
+    cache: Annotated[EntityCache | None, Depends(get_entity_cache)],
+) -> AsyncAbstractRepository[UserDomain, UserCreate, UserUpdate]:
+    repository = AsyncUserSQLAlchemyRepository(
+        session=session, trusted_mapping=trusted_mapping
+    )
+    if cache is None:
+        return repository
+    # Replicas may lag behind writes that dropped entities from the cache,
+    # which would keep their stale copies for clients reading their writes
+    return AsyncCachedRepository(
+        repository,
+        cache=cache,
+        dependents=user_dependents,
+        fill=not _reads_from_replica(session),
+    )
 
 
 @lru_cache
 def get_post_repository(
-    session: Annotated[Session, Depends(get_session)],
-) -> PostSQLAlchemyRepository:
-    return PostSQLAlchemyRepository(session=session)
+    session: Annotated[Session | AsyncSession, Depends(get_session)],
+    trusted_mapping: Annotated[bool, Depends(get_trusted_mapping)],
+    cache: Annotated[EntityCache | None, Depends(get_entity_cache)],
+) -> AsyncPostRepository[PostCreate, PostUpdate]:
+    repository = AsyncPostSQLAlchemyRepository(
+        session=session, trusted_mapping=trusted_mapping
+    )
+    if cache is None:
+        return repository
+    return AsyncCachedPostRepository(
+        repository,
+        cache=cache,
+        dependents=post_dependents,
+        fill=not _reads_from_replica(session),
+    )
 
 
 @lru_cache
 def get_user_service(
-    repository: Annotated[UserSQLAlchemyRepository, Depends(get_user_repository)],
-) -> UserService:
-    return UserService(repository=repository)
+    repository: Annotated[
+        AsyncAbstractRepository[UserDomain, UserCreate, UserUpdate],
+        Depends(get_user_repository),
+    ],
+) -> AsyncUserService:
+    return AsyncUserService(repository=repository)
 
 
 @lru_cache
 def get_post_service(
-    repository: Annotated[PostSQLAlchemyRepository, Depends(get_post_repository)],
-) -> PostService:
-    return PostService(repository=repository)
+    repository: Annotated[
+        AsyncPostRepository[PostCreate, PostUpdate], Depends(get_post_repository)
+    ],
+) -> AsyncPostService:
+    return AsyncPostService(repository=repository)
+
+
+def get_user_exporter(
+    session_factory: Annotated[SessionFactory, Depends(get_session_factory)],
+    trusted_mapping: Annotated[bool, Depends(get_trusted_mapping)],
+) -> Callable[..., AsyncIterator[list[UserDomain]]]:
+    async def export(**kwargs: Any) -> AsyncIterator[list[UserDomain]]:
+        # FastAPI closes the request session before a streamed body is sent
+        async with session_factory() as session:
+            repository = AsyncUserSQLAlchemyRepository(
+                session=session, trusted_mapping=trusted_mapping
+            )
+            async for batch in AsyncUserService(repository=repository).iter_all(
+                **kwargs
+            ):
+                yield batch
+
+    return export
+
+
+def get_post_exporter(
+    session_factory: Annotated[SessionFactory, Depends(get_session_factory)],
+    trusted_mapping: Annotated[bool, Depends(get_trusted_mapping)],
+) -> Callable[..., AsyncIterator[list[PostDomain]]]:
+    async def export(**kwargs: Any) -> AsyncIterator[list[PostDomain]]:
+        # FastAPI closes the request session before a streamed body is sent
+        async with session_factory() as session:
+            repository = AsyncPostSQLAlchemyRepository(
+                session=session, trusted_mapping=trusted_mapping
+            )
+            async for batch in AsyncPostService(repository=repository).iter_all(
+                **kwargs
+            ):
+                yield batch
+
+    return export
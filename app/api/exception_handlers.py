@@ -5,7 +5,11 @@ from app.domain.exceptions import TooManyTagsError
 from app.infrastructure.exceptions import (
     DatabaseError,
     EntityAlreadyExistsError,
+    EntityConflictError,
     EntityNotFoundError,
+    InvalidCursorError,
+    InvalidFieldsError,
+    InvalidQueryError,
 )
 
 
@@ -19,8 +23,12 @@ class ExceptionHandlers:
         self.app.exception_handler(EntityAlreadyExistsError)(
             self.handle_entity_already_exists
         )
+        self.app.exception_handler(EntityConflictError)(self.handle_entity_conflict)
         self.app.exception_handler(DatabaseError)(self.handle_database_error)
         self.app.exception_handler(TooManyTagsError)(self.handle_too_many_tags)
+        self.app.exception_handler(InvalidCursorError)(self.handle_invalid_cursor)
+        self.app.exception_handler(InvalidFieldsError)(self.handle_invalid_fields)
+        self.app.exception_handler(InvalidQueryError)(self.handle_invalid_query)
 
     @staticmethod
     async def handle_entity_not_found(
@@ -47,6 +55,19 @@ class ExceptionHandlers:
             },
         )
 
+    @staticmethod
+    async def handle_entity_conflict(
+        request: Request, exc: EntityConflictError
+    ) -> JSONResponse:
+        return JSONResponse(
+            status_code=status.HTTP_409_CONFLICT,
+            content={
+                "message": str(exc),
+                "type": exc.entity_type,
+                "id": exc.entity_id,
+            },
+        )
+
     @staticmethod
     async def handle_database_error(
         request: Request, exc: DatabaseError
@@ -70,3 +91,39 @@ class ExceptionHandlers:
                 "max_tags": exc.max_tags,
             },
         )
+
+    @staticmethod
+    async def handle_invalid_cursor(
+        request: Request, exc: InvalidCursorError
+    ) -> JSONResponse:
+        return JSONResponse(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            content={
+                "message": str(exc),
+                "cursor": exc.cursor,
+            },
+        )
+
+    @staticmethod
+    async def handle_invalid_fields(
+        request: Request, exc: InvalidFieldsError
+    ) -> JSONResponse:
+        return JSONResponse(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            content={
+                "message": str(exc),
+                "fields": exc.fields,
+            },
+        )
+
+    @staticmethod
+    async def handle_invalid_query(
+        request: Request, exc: InvalidQueryError
+    ) -> JSONResponse:
+        return JSONResponse(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            content={
+                "message": str(exc),
+                "field": exc.field,
+            },
+        )
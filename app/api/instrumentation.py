@@ -0,0 +1,115 @@
+"""
+Per-request SQL instrumentation.
+
+`QueryInstrumentationMiddleware` counts the statements, rows and database
+time of each request and reports them in a `Server-Timing` header, with an
+optional log line. `QueryBudget` caps the statements of a route: exceeding
+it logs a warning, or fails the request when budgets are strict (in tests),
+so N+1 regressions show up before they reach production.
+"""
+
+import logging
+import time
+from typing import Annotated, Any
+
+from fastapi import Depends, Request
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import Settings, get_settings
+from app.infrastructure.instrumentation import QueryStats, track_queries
+
+logger = logging.getLogger(__name__)
+
+
+class QueryBudgetExceededError(Exception):
+    def __init__(self, route: str, statements: int, budget: int) -> None:
+        super().__init__(
+            f"{route} ran {statements} SQL statements, over its budget of {budget}."
+        )
+
+
+class QueryBudget:
+    """
+    Dependency setting the statement budget of the routes it applies to.
+
+    Without a limit, it applies the `QUERY_BUDGET` setting. Route budgets
+    override application-wide ones, as route dependencies run last.
+    """
+
+    def __init__(self, max_statements: int | None = None) -> None:
+        self.max_statements = max_statements
+
+    def __call__(
+        self, request: Request, settings: Annotated[Settings, Depends(get_settings)]
+    ) -> None:
+        if self.max_statements is not None:
+            request.state.query_budget = self.max_statements
+        elif not hasattr(request.state, "query_budget"):
+            request.state.query_budget = settings.QUERY_BUDGET
+        request.state.query_budget_strict = settings.QUERY_BUDGET_STRICT
+        request.state.query_log = settings.QUERY_LOG
+
+
+class QueryInstrumentationMiddleware:
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        with track_queries() as stats:
+
+            async def send_with_timing(message: Message) -> None:
+                # Statements of streamed bodies run after the headers are sent
+                if message["type"] == "http.response.start":
+                    elapsed = time.perf_counter() - start
+                    headers = MutableHeaders(scope=message)
+                    headers.append("Server-Timing", server_timing(stats, elapsed))
+                    self._report(scope, message["status"], stats, elapsed)
+                await send(message)
+
+            await self.app(scope, receive, send_with_timing)
+
+    @staticmethod
+    def _report(scope: Scope, status: int, stats: QueryStats, elapsed: float) -> None:
+        state: dict[str, Any] = scope.get("state", {})
+        route = getattr(scope.get("route"), "path", scope["path"])
+        name = f"{scope['method']} {route}"
+        if state.get("query_log"):
+            logger.info(
+                "%s status=%d statements=%d rows=%d db_ms=%.1f total_ms=%.1f",
+                name,
+                status,
+                stats.statements,
+                stats.rows,
+                stats.db_time * 1000,
+                elapsed * 1000,
+                extra={
+                    "route": name,
+                    "status": status,
+                    "statements": stats.statements,
+                    "rows": stats.rows,
+                    "db_ms": stats.db_time * 1000,
+                    "total_ms": elapsed * 1000,
+                },
+            )
+
+        budget = state.get("query_budget")
+        if budget is None or stats.statements <= budget:
+            return
+        error = QueryBudgetExceededError(name, stats.statements, budget)
+        if state.get("query_budget_strict"):
+            raise error
+        logger.warning(str(error))
+
+
+def server_timing(stats: QueryStats, elapsed: float) -> str:
+    description = f"{stats.statements} statements, {stats.rows} rows"
+    return (
+        f'db;dur={stats.db_time * 1000:.1f};desc="{description}", '
+        f"total;dur={elapsed * 1000:.1f}"
+    )
@@ -0,0 +1,44 @@
+"""
+Read-your-writes for clients of an application with read replicas.
+
+Clients that wrote get a cookie for `READ_YOUR_WRITES_WINDOW` seconds, during
+which their reads go to the primary. `RecentWriteMiddleware` sets it on
+successful responses only: a write that failed leaves nothing to read back.
+"""
+
+from typing import Any
+
+from fastapi import Response
+from starlette.datastructures import MutableHeaders
+from starlette.status import HTTP_400_BAD_REQUEST
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+RECENT_WRITE_COOKIE = "recent_write"
+
+
+class RecentWriteMiddleware:
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        async def send_with_cookie(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                state: dict[str, Any] = scope.get("state", {})
+                # Set by the session dependency of writes, with replicas only
+                window = state.get("recent_write_window")
+                if window is not None and message["status"] < HTTP_400_BAD_REQUEST:
+                    headers = MutableHeaders(scope=message)
+                    headers.append("set-cookie", recent_write_cookie(window))
+            await send(message)
+
+        await self.app(scope, receive, send_with_cookie)
+
+
+def recent_write_cookie(max_age: int) -> str:
+    response = Response()
+    response.set_cookie(RECENT_WRITE_COOKIE, "1", max_age=max_age, httponly=True)
+    return response.headers["set-cookie"]
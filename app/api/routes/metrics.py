@@ -0,0 +1,42 @@
+from typing import Annotated
+
+from fastapi import APIRouter, Depends
+
+from app.api.dependencies import get_entity_cache, get_pool
+from app.api.schemas import CacheStatsResponse, PoolStatsResponse
+from app.infrastructure.cache import EntityCache
+from app.infrastructure.pool import InstrumentedQueuePool
+
+router = APIRouter(prefix="/metrics", tags=["metrics"])
+
+
+@router.get("/cache")
+async def get_cache_stats(
+    cache: Annotated[EntityCache | None, Depends(get_entity_cache)],
+) -> CacheStatsResponse:
+    if cache is None:
+        return CacheStatsResponse(enabled=False)
+    return CacheStatsResponse(
+        enabled=True,
+        hits=cache.stats.hits,
+        misses=cache.stats.misses,
+        negative_hits=cache.stats.negative_hits,
+        invalidations=cache.stats.invalidations,
+    )
+
+
+@router.get("/pool")
+async def get_pool_stats(
+    pool: Annotated[InstrumentedQueuePool, Depends(get_pool)],
+) -> PoolStatsResponse:
+    return PoolStatsResponse(
+        size=pool.size(),
+        checked_out=pool.stats.checked_out,
+        overflow=max(pool.overflow(), 0),
+        checkouts=pool.stats.checkouts,
+        timeouts=pool.stats.timeouts,
+        connects=pool.stats.connects,
+        invalidations=pool.stats.invalidations,
+        wait_time=pool.stats.wait_time,
+        max_wait_time=pool.stats.max_wait_time,
+    )
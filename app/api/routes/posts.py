@@ -1,53 +1,198 @@
 import uuid
+from collections.abc import AsyncIterator, Callable
 from typing import Annotated, Any
 
-from fastapi import APIRouter, Depends, status
+from fastapi import APIRouter, Body, Depends, Query, status
+from fastapi.responses import StreamingResponse
 
-from app.api.dependencies import get_post_service
-from app.api.schemas import PaginatedResponse, PostResponse
+from app.api.conditional import ConditionalGet
+from app.api.dependencies import (
+    get_post_exporter,
+    get_post_service,
+    get_search_pagination,
+)
+from app.api.instrumentation import QueryBudget
+from app.api.routing import DomainRoute, SparseFields
+from app.api.schemas import (
+    BatchResponse,
+    BulkResponse,
+    PaginatedResponse,
+    PaginationQuery,
+    PostQuery,
+    PostResponse,
+    PostSearchResponse,
+)
+from app.api.streaming import NDJSON_MEDIA_TYPE, ndjson_response
 from app.application.dtos import PostCreate, PostUpdate
-from app.application.services.post import PostService
-from app.domain.models import PaginationParams
+from app.application.services.post import AsyncPostService
+from app.domain.constants import BatchConstants, BulkConstants
+from app.domain.models import PaginationParams, PostDomain, PostInclude
 
-router = APIRouter(prefix="/posts", tags=["posts"])
+router = APIRouter(prefix="/posts", tags=["posts"], route_class=DomainRoute)
 
 
-@router.get("/", response_model=PaginatedResponse[PostResponse])
-def get_posts(
-    pagination: Annotated[PaginationParams, Depends()],
-    service: Annotated[PostService, Depends(get_post_service)],
+@router.get(
+    "/",
+    response_model=PaginatedResponse[PostResponse],
+    # 3 statements to load the page, 2 to read its version for If-None-Match
+    dependencies=[Depends(QueryBudget(5))],
+)
+async def get_posts(
+    pagination: Annotated[PaginationQuery, Depends()],
+    query: Annotated[PostQuery, Query()],
+    conditional: Annotated[ConditionalGet, Depends()],
+    service: Annotated[AsyncPostService, Depends(get_post_service)],
+    fields: Annotated[set[str] | None, Depends(SparseFields(PostResponse))],
 ) -> Any:
-    return service.get_all(pagination=pagination)
+    options: dict[str, Any] = {
+        "spec": query.spec,
+        "include": query.include,
+        "fields": fields,
+    }
+    if response := await conditional.not_modified(
+        lambda: service.get_page_version(pagination=pagination, **options)
+    ):
+        return response
+    page = await service.get_all(pagination=pagination, **options)
+    conditional.tag(page.version_token())
+    return page
 
 
-@router.get("/{post_id}", response_model=PostResponse)
-def get_post(
+@router.get(
+    "/export",
+    response_class=StreamingResponse,
+    responses={200: {"content": {NDJSON_MEDIA_TYPE: {}}}},
+)
+async def export_posts(
+    exporter: Annotated[
+        Callable[..., AsyncIterator[list[PostDomain]]], Depends(get_post_exporter)
+    ],
+    fields: Annotated[set[str] | None, Depends(SparseFields(PostResponse))],
+    include: PostInclude | None = None,
+) -> StreamingResponse:
+    """Every post, as one JSON document per line."""
+    return ndjson_response(
+        exporter(include=include, fields=fields),
+        response_model=PostResponse,
+        fields=fields,
+    )
+
+
+@router.get(
+    "/search",
+    response_model=PaginatedResponse[PostSearchResponse],
+    dependencies=[Depends(QueryBudget(2))],
+)
+async def search_posts(
+    q: Annotated[str, Query(min_length=1)],
+    pagination: Annotated[PaginationParams, Depends(get_search_pagination)],
+    service: Annotated[AsyncPostService, Depends(get_post_service)],
+    fields: Annotated[
+        set[str] | None,
+        Depends(SparseFields(PostSearchResponse, always=("id", "rank", "snippet"))),
+    ],
+    include: PostInclude | None = None,
+) -> Any:
+    """
+    Posts matching a full-text query, the most relevant first.
+
+    Pages follow `next_cursor` through `after`. Snippets are HTML-escaped
+    post content, with the matched terms wrapped in <mark> tags.
+    """
+    return await service.search(
+        q, pagination=pagination, include=include, fields=fields
+    )
+
+
+@router.get(
+    "/batch-get",
+    response_model=BatchResponse[PostResponse],
+    dependencies=[Depends(QueryBudget(3))],
+)
+async def get_posts_batch(
+    ids: Annotated[
+        list[uuid.UUID], Query(min_length=1, max_length=BatchConstants.MAX_IDS)
+    ],
+    service: Annotated[AsyncPostService, Depends(get_post_service)],
+    fields: Annotated[set[str] | None, Depends(SparseFields(PostResponse))],
+    include: PostInclude | None = None,
+) -> Any:
+    """
+    Posts of `ids`, e.g. `?ids=...&ids=...`, in the same order.
+
+    Ids without a post get an item with `found: false`. The posts load in
+    one statement, plus one per 500 posts for their tags.
+    """
+    return await service.get_many(ids, include=include, fields=fields)
+
+
+@router.post(
+    "/batch-get",
+    response_model=BatchResponse[PostResponse],
+    dependencies=[Depends(QueryBudget(3))],
+)
+async def post_posts_batch(
+    ids: Annotated[
+        list[uuid.UUID], Body(min_length=1, max_length=BatchConstants.MAX_IDS)
+    ],
+    service: Annotated[AsyncPostService, Depends(get_post_service)],
+    fields: Annotated[set[str] | None, Depends(SparseFields(PostResponse))],
+    include: PostInclude | None = None,
+) -> Any:
+    """Same as `GET /posts/batch-get`, for lists of ids too long for a URL."""
+    return await service.get_many(ids, include=include, fields=fields)
+
+
+@router.get(
+    "/{post_id}",
+    response_model=PostResponse,
+    # 2 statements to load the post, 1 to read its version for If-None-Match
+    dependencies=[Depends(QueryBudget(3))],
+)
+async def get_post(
     post_id: uuid.UUID,
-    service: Annotated[PostService, Depends(get_post_service)],
+    conditional: Annotated[ConditionalGet, Depends()],
+    service: Annotated[AsyncPostService, Depends(get_post_service)],
+    fields: Annotated[set[str] | None, Depends(SparseFields(PostResponse))],
+    include: PostInclude | None = None,
 ) -> Any:
-    return service.get_by_id(post_id)
+    if response := await conditional.not_modified(
+        lambda: service.get_version(post_id, include=include, fields=fields)
+    ):
+        return response
+    post = await service.get_by_id(post_id, include=include, fields=fields)
+    conditional.tag(post.version_token())
+    return post
 
 
 @router.post("/", status_code=status.HTTP_201_CREATED, response_model=PostResponse)
-def create_post(
+async def create_post(
     post_create: PostCreate,
-    service: Annotated[PostService, Depends(get_post_service)],
+    service: Annotated[AsyncPostService, Depends(get_post_service)],
+) -> Any:
+    return await service.create(post_create)
+
+
+@router.post("/bulk", response_model=BulkResponse[PostResponse])
+async def create_posts_bulk(
+    posts_create: Annotated[list[PostCreate], Body(max_length=BulkConstants.MAX_ITEMS)],
+    service: Annotated[AsyncPostService, Depends(get_post_service)],
 ) -> Any:
-    return service.create(post_create)
+    return await service.create_many(posts_create)
 
 
 @router.put("/{post_id}", response_model=PostResponse)
-def update_post(
+async def update_post(
     post_id: uuid.UUID,
     post_update: PostUpdate,
-    service: Annotated[PostService, Depends(get_post_service)],
+    service: Annotated[AsyncPostService, Depends(get_post_service)],
 ) -> Any:
-    return service.update(post_id, post_update)
+    return await service.update(post_id, post_update)
 
 
 @router.delete("/{post_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_post(
+async def delete_post(
     post_id: uuid.UUID,
-    service: Annotated[PostService, Depends(get_post_service)],
+    service: Annotated[AsyncPostService, Depends(get_post_service)],
 ) -> None:
-    service.delete(post_id)
+    await service.delete(post_id)
@@ -1,53 +1,127 @@
 import uuid
+from collections.abc import AsyncIterator, Callable
 from typing import Annotated, Any
 
-from fastapi import APIRouter, Depends, status
+from fastapi import APIRouter, Body, Depends, Query, status
+from fastapi.responses import StreamingResponse
 
-from app.api.dependencies import get_user_service
-from app.api.schemas import PaginatedResponse, UserResponse
+from app.api.conditional import ConditionalGet
+from app.api.dependencies import get_user_exporter, get_user_service
+from app.api.instrumentation import QueryBudget
+from app.api.routing import DomainRoute, SparseFields
+from app.api.schemas import (
+    BulkResponse,
+    PaginatedResponse,
+    PaginationQuery,
+    UserQuery,
+    UserResponse,
+)
+from app.api.streaming import NDJSON_MEDIA_TYPE, ndjson_response
 from app.application.dtos import UserCreate, UserUpdate
-from app.application.services.user import UserService
-from app.domain.models import PaginationParams
+from app.application.services.user import AsyncUserService
+from app.domain.constants import BulkConstants
+from app.domain.models import UserDomain, UserInclude
 
-router = APIRouter(prefix="/users", tags=["users"])
+router = APIRouter(prefix="/users", tags=["users"], route_class=DomainRoute)
 
 
-@router.get("/", response_model=PaginatedResponse[UserResponse])
-def get_users(
-    pagination: Annotated[PaginationParams, Depends()],
-    service: Annotated[UserService, Depends(get_user_service)],
+@router.get(
+    "/",
+    response_model=PaginatedResponse[UserResponse],
+    # 4 statements to load the page, 3 to read its version for If-None-Match
+    dependencies=[Depends(QueryBudget(7))],
+)
+async def get_users(
+    pagination: Annotated[PaginationQuery, Depends()],
+    query: Annotated[UserQuery, Query()],
+    conditional: Annotated[ConditionalGet, Depends()],
+    service: Annotated[AsyncUserService, Depends(get_user_service)],
+    fields: Annotated[set[str] | None, Depends(SparseFields(UserResponse))],
 ) -> Any:
-    return service.get_all(pagination=pagination)
+    options: dict[str, Any] = {
+        "spec": query.spec,
+        "include": query.include,
+        "fields": fields,
+    }
+    if response := await conditional.not_modified(
+        lambda: service.get_page_version(pagination=pagination, **options)
+    ):
+        return response
+    page = await service.get_all(pagination=pagination, **options)
+    conditional.tag(page.version_token())
+    return page
 
 
-@router.get("/{user_id}", response_model=UserResponse)
-def get_user(
+@router.get(
+    "/export",
+    response_class=StreamingResponse,
+    responses={200: {"content": {NDJSON_MEDIA_TYPE: {}}}},
+)
+async def export_users(
+    exporter: Annotated[
+        Callable[..., AsyncIterator[list[UserDomain]]], Depends(get_user_exporter)
+    ],
+    fields: Annotated[set[str] | None, Depends(SparseFields(UserResponse))],
+    include: UserInclude | None = None,
+) -> StreamingResponse:
+    """Every user, as one JSON document per line."""
+    return ndjson_response(
+        exporter(include=include, fields=fields),
+        response_model=UserResponse,
+        fields=fields,
+    )
+
+
+@router.get(
+    "/{user_id}",
+    response_model=UserResponse,
+    # 3 statements to load the user, 2 to read its version for If-None-Match
+    dependencies=[Depends(QueryBudget(5))],
+)
+async def get_user(
     user_id: uuid.UUID,
-    service: Annotated[UserService, Depends(get_user_service)],
+    conditional: Annotated[ConditionalGet, Depends()],
+    service: Annotated[AsyncUserService, Depends(get_user_service)],
+    fields: Annotated[set[str] | None, Depends(SparseFields(UserResponse))],
+    include: UserInclude | None = None,
 ) -> Any:
-    return service.get_by_id(user_id)
+    if response := await conditional.not_modified(
+        lambda: service.get_version(user_id, include=include, fields=fields)
+    ):
+        return response
+    user = await service.get_by_id(user_id, include=include, fields=fields)
+    conditional.tag(user.version_token())
+    return user
 
 
 @router.post("/", status_code=status.HTTP_201_CREATED)
-def create_user(
+async def create_user(
     user_create: UserCreate,
-    service: Annotated[UserService, Depends(get_user_service)],
+    service: Annotated[AsyncUserService, Depends(get_user_service)],
+) -> Any:
+    return await service.create(user_create)
+
+
+@router.post("/bulk", response_model=BulkResponse[UserResponse])
+async def create_users_bulk(
+    users_create: Annotated[list[UserCreate], Body(max_length=BulkConstants.MAX_ITEMS)],
+    service: Annotated[AsyncUserService, Depends(get_user_service)],
 ) -> Any:
-    return service.create(user_create)
+    return await service.create_many(users_create)
 
 
 @router.put("/{user_id}", response_model=UserResponse)
-def update_user(
+async def update_user(
     user_id: uuid.UUID,
     user_update: UserUpdate,
-    service: Annotated[UserService, Depends(get_user_service)],
+    service: Annotated[AsyncUserService, Depends(get_user_service)],
 ) -> Any:
-    return service.update(user_id, user_update)
+    return await service.update(user_id, user_update)
 
 
 @router.delete("/{user_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_user(
+async def delete_user(
     user_id: uuid.UUID,
-    service: Annotated[UserService, Depends(get_user_service)],
+    service: Annotated[AsyncUserService, Depends(get_user_service)],
 ) -> None:
-    service.delete(user_id)
+    await service.delete(user_id)
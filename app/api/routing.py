@@ -0,0 +1,155 @@
+"""
+Response serialization straight from domain objects.
+
+By default FastAPI validates whatever a route returns into its
+`response_model`, then serializes that copy. Domain objects are already
+valid, so `DomainRoute` dumps them to JSON in one pass, keeping only the
+fields declared by the response model. The response model still drives the
+OpenAPI schema.
+
+Sparse fieldsets apply there too: `SparseFields` validates the `fields` query
+parameter against a response model, and objects of that model then dump only
+those fields. Repositories load only those fields too.
+
+As FastAPI does for the responses it builds, headers set on the injected
+`Response` (e.g. by dependencies) are kept.
+"""
+
+import functools
+import inspect
+import types
+from collections.abc import Callable, Collection, Coroutine
+from typing import Any, Union, get_args, get_origin
+
+from fastapi import Request, Response
+from fastapi.routing import APIRoute
+from pydantic import BaseModel
+from starlette.status import HTTP_200_OK
+
+from app.infrastructure.exceptions import InvalidFieldsError
+
+# Fields to dump: True for a whole value, a nested mapping for models
+IncludeSpec = dict[str, Any]
+
+# Model a sparse fieldset applies to, and the fields it keeps
+SparseFieldset = tuple[type[BaseModel], frozenset[str]]
+
+# Parameters added to endpoints to receive what FastAPI injects
+_REQUEST_PARAMETER = "domain_route_request"
+_RESPONSE_PARAMETER = "domain_route_response"
+
+
+class DomainRoute(APIRoute):
+    def __init__(self, path: str, endpoint: Callable[..., Any], **kwargs: Any) -> None:
+        response_model = kwargs.get("response_model")
+        if isinstance(response_model, type) and issubclass(response_model, BaseModel):
+            endpoint = serialize_with(
+                endpoint,
+                response_model=response_model,
+                status_code=kwargs.get("status_code") or HTTP_200_OK,
+            )
+        super().__init__(path, endpoint, **kwargs)
+
+
+def serialize_with(
+    endpoint: Callable[..., Coroutine[Any, Any, Any]],
+    response_model: type[BaseModel],
+    status_code: int,
+) -> Callable[..., Coroutine[Any, Any, Any]]:
+    signature = inspect.signature(endpoint)
+    if _RESPONSE_PARAMETER in signature.parameters:
+        # Already wrapped, e.g. when a router is included in another
+        return endpoint
+
+    @functools.wraps(endpoint)
+    async def wrapper(*args: Any, **kwargs: Any) -> Any:
+        request: Request = kwargs.pop(_REQUEST_PARAMETER)
+        injected_response: Response = kwargs.pop(_RESPONSE_PARAMETER)
+        content = await endpoint(*args, **kwargs)
+        if not isinstance(content, BaseModel):
+            return content
+        include = response_include(
+            response_model, getattr(request.state, "sparse_fieldset", None)
+        )
+        response = Response(
+            content=content.model_dump_json(include=include),
+            status_code=status_code,
+            media_type="application/json",
+        )
+        response.headers.raw.extend(injected_response.headers.raw)
+        return response
+
+    injected_parameters = [
+        inspect.Parameter(name, inspect.Parameter.KEYWORD_ONLY, annotation=annotation)
+        for name, annotation in (
+            (_REQUEST_PARAMETER, Request),
+            (_RESPONSE_PARAMETER, Response),
+        )
+    ]
+    wrapper.__signature__ = signature.replace(  # type: ignore[attr-defined]
+        parameters=[*signature.parameters.values(), *injected_parameters]
+    )
+    return wrapper
+
+
+class SparseFields:
+    """
+    Sparse fieldset of `model`, from a comma-separated `fields` query parameter.
+
+    Objects of `model` in the response then dump only the requested fields and
+    those of `always`. The fieldset is also returned, so that repositories can
+    skip loading the columns and relationships left out.
+    """
+
+    def __init__(self, model: type[BaseModel], always: Collection[str] = ("id",)):
+        self.model = model
+        self.always = frozenset(always)
+
+    def __call__(self, request: Request, fields: str | None = None) -> set[str] | None:
+        if fields is None:
+            return None
+
+        requested = {field.strip() for field in fields.split(",") if field.strip()}
+        invalid_fields = requested - self.model.model_fields.keys()
+        if invalid_fields:
+            raise InvalidFieldsError(sorted(invalid_fields))
+
+        kept = frozenset(requested | self.always)
+        request.state.sparse_fieldset = (self.model, kept)
+        return set(kept)
+
+
+@functools.cache
+def response_include(
+    model: type[BaseModel], sparse: SparseFieldset | None = None
+) -> IncludeSpec:
+    """
+    Include spec selecting the fields of `model` from a wider object.
+
+    Objects of the model of `sparse`, at any depth, keep only its fields.
+    """
+    return {
+        name: _annotation_include(field.annotation, sparse)
+        for name, field in model.model_fields.items()
+        if sparse is None or model is not sparse[0] or name in sparse[1]
+    }
+
+
+def _annotation_include(
+    annotation: Any, sparse: SparseFieldset | None
+) -> IncludeSpec | bool:
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        return response_include(annotation, sparse)
+
+    origin = get_origin(annotation)
+    args = get_args(annotation)
+    if origin in (list, tuple, set, frozenset) and args:
+        item_include = _annotation_include(args[0], sparse)
+        return True if item_include is True else {"__all__": item_include}
+    if origin in (Union, types.UnionType):
+        includes = [
+            _annotation_include(arg, sparse) for arg in args if arg is not type(None)
+        ]
+        # Optional[Model] is the only union of models responses use
+        return includes[0] if len(includes) == 1 else True
+    return True
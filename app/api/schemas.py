@@ -1,10 +1,25 @@
 import datetime
 import uuid
-from typing import TypeVar
+from typing import Annotated, Any, TypeVar
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field, PositiveInt, field_validator
 
-from app.domain.models import PaginationBase
+from app.domain.constants import PaginationConstants
+from app.domain.models import (
+    BatchResultBase,
+    BulkResultBase,
+    FieldFilter,
+    FilterOp,
+    PaginationBase,
+    PaginationParams,
+    PostInclude,
+    PostQuerySpec,
+    QuerySpec,
+    SortField,
+    SortOrder,
+    TagMatch,
+    UserInclude,
+)
 
 
 class APIResponse(BaseModel):
@@ -14,6 +29,104 @@ class APIResponse(BaseModel):
 Response_T = TypeVar("Response_T", bound=APIResponse)
 
 
+class PostResponse(APIResponse):
+    title: str
+    content: str
+    author_id: uuid.UUID
+    tags: list[str]
+
+
+class PostSearchResponse(PostResponse):
+    rank: float
+    snippet: str
+
+
+class PaginationQuery(PaginationParams):
+    limit: Annotated[PositiveInt, Field(le=PaginationConstants.MAX_LIMIT)] = 100
+
+
+class ListQuery(BaseModel):
+    """
+    Filters and order of listings, e.g. `?filter=level:gte:3&sort=-level,height`.
+
+    Filters are `field:op:value`, or `field:value` for equality. The sort
+    lists fields, descending when prefixed with `-`. Repositories reject the
+    fields they do not declare.
+    """
+
+    filter: list[str] = Field(default_factory=list)
+    sort: str | None = None
+
+    @field_validator("filter")
+    @classmethod
+    def check_filters(cls, filters: list[str]) -> list[str]:
+        for item in filters:
+            _parse_filter(item)
+        return filters
+
+    @field_validator("sort")
+    @classmethod
+    def check_sort(cls, sort: str | None) -> str | None:
+        if sort is not None:
+            _parse_sort(sort)
+        return sort
+
+    def _spec_values(self) -> dict[str, Any]:
+        return {
+            "filters": [_parse_filter(item) for item in self.filter],
+            "sort": _parse_sort(self.sort) if self.sort else [],
+        }
+
+
+class UserQuery(ListQuery):
+    include: UserInclude | None = None
+
+    @property
+    def spec(self) -> QuerySpec | None:
+        if not self.filter and not self.sort:
+            return None
+        return QuerySpec(**self._spec_values())
+
+
+class PostQuery(ListQuery):
+    """Query parameters of post listings, e.g. `?tag=sql&tag=python`."""
+
+    include: PostInclude | None = None
+    tag: list[str] = Field(default_factory=list)
+    tag_match: TagMatch = TagMatch.ANY
+
+    @property
+    def spec(self) -> PostQuerySpec | None:
+        if not self.filter and not self.sort and not self.tag:
+            return None
+        return PostQuerySpec(
+            **self._spec_values(), tags=self.tag, tag_match=self.tag_match
+        )
+
+
+def _parse_filter(item: str) -> FieldFilter:
+    field, has_value, rest = item.partition(":")
+    op, has_op, value = rest.partition(":")
+    if field and has_value and not has_op:
+        # `field:value`, an equality
+        return FieldFilter(field=field, value=rest)
+    if field and has_op and op in FilterOp:
+        return FieldFilter(field=field, op=FilterOp(op), value=value)
+    ops = ", ".join(FilterOp)
+    raise ValueError(f"Expected field:value or field:op:value with op in {ops}.")
+
+
+def _parse_sort(sort: str) -> list[SortField]:
+    fields = []
+    for name in sort.split(","):
+        field = name.strip().removeprefix("-")
+        if not field:
+            raise ValueError("Expected comma-separated fields, e.g. -level,height.")
+        order = SortOrder.DESC if name.strip().startswith("-") else SortOrder.ASC
+        fields.append(SortField(field=field, order=order))
+    return fields
+
+
 class UserResponse(APIResponse):
     username: str
     email: str
@@ -21,14 +134,33 @@ class UserResponse(APIResponse):
     height: float
     is_active: bool
     birth_date: datetime.date
-    posts: list["PostResponse"]
+    posts: list[PostResponse]
 
 
-class PostResponse(APIResponse):
-    title: str
-    content: str
-    author_id: uuid.UUID
-    tags: list[str]
+class PaginatedResponse(PaginationBase[Response_T]): ...
 
 
-class PaginatedResponse(PaginationBase[Response_T]): ...
+class BulkResponse(BulkResultBase[Response_T]): ...
+
+
+class BatchResponse(BatchResultBase[Response_T]): ...
+
+
+class CacheStatsResponse(BaseModel):
+    enabled: bool
+    hits: int = 0
+    misses: int = 0
+    negative_hits: int = 0
+    invalidations: int = 0
+
+
+class PoolStatsResponse(BaseModel):
+    size: int
+    checked_out: int
+    overflow: int
+    checkouts: int
+    timeouts: int
+    connects: int
+    invalidations: int
+    wait_time: float
+    max_wait_time: float
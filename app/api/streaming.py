@@ -0,0 +1,33 @@
+"""
+Streaming of domain objects as NDJSON, one JSON document per line.
+
+Batches are pulled from the repository only as the client reads the body,
+so a slow client slows the export down instead of filling memory.
+"""
+
+from collections.abc import AsyncIterator, Collection, Sequence
+
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
+
+from app.api.routing import response_include
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+
+def ndjson_response(
+    batches: AsyncIterator[Sequence[BaseModel]],
+    response_model: type[BaseModel],
+    fields: Collection[str] | None = None,
+) -> StreamingResponse:
+    """Lines of `response_model` objects, keeping only `fields` when given."""
+    sparse = None if fields is None else (response_model, frozenset(fields))
+    include = response_include(response_model, sparse)
+
+    async def lines() -> AsyncIterator[bytes]:
+        async for batch in batches:
+            yield b"".join(
+                item.model_dump_json(include=include).encode() + b"\n" for item in batch
+            )
+
+    return StreamingResponse(lines(), media_type=NDJSON_MEDIA_TYPE)
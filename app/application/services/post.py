@@ -1,24 +1,61 @@
+from collections.abc import Sequence
+from typing import Any
+
 from app.application.dtos import PostCreate, PostUpdate
 from app.domain.constants import PostConstants
 from app.domain.exceptions import TooManyTagsError
-from app.domain.models import PostDomain
-from app.domain.service import AbstractService
+from app.domain.models import (
+    BulkItemResult,
+    DomainBulkResult,
+    DomainPagination,
+    PaginationParams,
+    PostDomain,
+    PostSearchHit,
+)
+from app.domain.repository import AsyncPostRepository, PostRepository
+from app.domain.service import AbstractService, AsyncAbstractService
 
 
-class PostService(AbstractService[PostDomain, PostCreate, PostUpdate]):
-    def create(self, data: PostCreate, /) -> PostDomain:
-        cleaned_tags = self._clean_tags(data.tags)
+class PostServiceMixin:
+    """Post rules shared by the sync and async services."""
+
+    @classmethod
+    def _clean_create(cls, data: PostCreate, /) -> PostCreate:
+        cleaned_tags = cls._clean_tags(data.tags)
         if len(cleaned_tags) > PostConstants.MAX_TAGS:
             raise TooManyTagsError(PostConstants.MAX_TAGS)
 
-        cleaned_data = PostCreate(
+        return PostCreate(
             title=data.title.strip(),
             content=data.content,
             author_id=data.author_id,
             tags=cleaned_tags,
         )
 
-        return super().create(cleaned_data)
+    @classmethod
+    def _clean_create_many(
+        cls, data: Sequence[PostCreate], /
+    ) -> tuple[dict[int, PostCreate], list[BulkItemResult[PostDomain]]]:
+        cleaned = {}
+        errors: list[BulkItemResult[PostDomain]] = []
+        for index, item in enumerate(data):
+            try:
+                cleaned[index] = cls._clean_create(item)
+            except TooManyTagsError as err:
+                errors.append(BulkItemResult(index=index, error=str(err)))
+        return cleaned, errors
+
+    @staticmethod
+    def _merge_bulk_results(
+        indexes: list[int],
+        results: list[BulkItemResult[PostDomain]],
+        errors: list[BulkItemResult[PostDomain]],
+    ) -> DomainBulkResult[PostDomain]:
+        results = [
+            result.model_copy(update={"index": indexes[result.index]})
+            for result in results
+        ]
+        return DomainBulkResult.from_items(results + errors)
 
     @staticmethod
     def _clean_tags(tags: list[str]) -> list[str]:
@@ -27,3 +64,59 @@ class PostService(AbstractService[PostDomain, PostCreate, PostUpdate]):
             if cleaned_tag := tag.lower().strip():
                 cleaned.add(cleaned_tag)
         return sorted(cleaned)
+
+
+class PostService(
+    PostServiceMixin, AbstractService[PostDomain, PostCreate, PostUpdate]
+):
+    repository: PostRepository[PostCreate, PostUpdate]
+
+    def __init__(self, repository: PostRepository[PostCreate, PostUpdate]) -> None:
+        super().__init__(repository)
+
+    def search(
+        self,
+        query: str,
+        /,
+        pagination: PaginationParams | None = None,
+        **kwargs: Any,
+    ) -> DomainPagination[PostSearchHit]:
+        return self.repository.search(query, pagination=pagination, **kwargs)
+
+    def create(self, data: PostCreate, /) -> PostDomain:
+        return super().create(self._clean_create(data))
+
+    def create_many(
+        self, data: Sequence[PostCreate], /
+    ) -> DomainBulkResult[PostDomain]:
+        cleaned, errors = self._clean_create_many(data)
+        results = self.repository.create_many(list(cleaned.values()))
+        return self._merge_bulk_results(list(cleaned), results, errors)
+
+
+class AsyncPostService(
+    PostServiceMixin, AsyncAbstractService[PostDomain, PostCreate, PostUpdate]
+):
+    repository: AsyncPostRepository[PostCreate, PostUpdate]
+
+    def __init__(self, repository: AsyncPostRepository[PostCreate, PostUpdate]) -> None:
+        super().__init__(repository)
+
+    async def search(
+        self,
+        query: str,
+        /,
+        pagination: PaginationParams | None = None,
+        **kwargs: Any,
+    ) -> DomainPagination[PostSearchHit]:
+        return await self.repository.search(query, pagination=pagination, **kwargs)
+
+    async def create(self, data: PostCreate, /) -> PostDomain:
+        return await super().create(self._clean_create(data))
+
+    async def create_many(
+        self, data: Sequence[PostCreate], /
+    ) -> DomainBulkResult[PostDomain]:
+        cleaned, errors = self._clean_create_many(data)
+        results = await self.repository.create_many(list(cleaned.values()))
+        return self._merge_bulk_results(list(cleaned), results, errors)
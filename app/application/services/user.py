@@ -1,7 +1,11 @@
 from app.application.dtos import UserCreate, UserUpdate
 from app.domain.models import UserDomain
-from app.domain.service import AbstractService
+from app.domain.service import AbstractService, AsyncAbstractService
 
 
 class UserService(AbstractService[UserDomain, UserCreate, UserUpdate]):
     pass
+
+
+class AsyncUserService(AsyncAbstractService[UserDomain, UserCreate, UserUpdate]):
+    pass
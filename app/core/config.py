@@ -1,3 +1,4 @@
+from enum import StrEnum
 from functools import lru_cache
 
 from pydantic import PostgresDsn, computed_field
@@ -5,22 +6,75 @@ from pydantic_core import MultiHostUrl
 from pydantic_settings import BaseSettings
 
 
+class ReplicaSelection(StrEnum):
+    ROUND_ROBIN = "round_robin"
+    LEAST_CONNECTIONS = "least_connections"  # fewest checked-out connections
+
+
 class Settings(BaseSettings):
     POSTGRES_USER: str
     POSTGRES_PASSWORD: str
     POSTGRES_SERVER: str
     POSTGRES_PORT: int = 5432
     POSTGRES_DB: str
+    # Serve requests with an AsyncEngine instead of sync sessions in threads
+    DATABASE_ASYNC: bool = False
+    # Connection pool, SQLAlchemy defaults. Recycle is in seconds, -1 disables.
+    # LIFO reuses recent connections so idle ones can be closed server-side.
+    DATABASE_POOL_SIZE: int = 5
+    DATABASE_MAX_OVERFLOW: int = 10
+    DATABASE_POOL_TIMEOUT: float = 30.0
+    DATABASE_POOL_RECYCLE: int = -1
+    DATABASE_POOL_PRE_PING: bool = False
+    DATABASE_POOL_USE_LIFO: bool = False
+    # psycopg server-side prepared statements: executions of a statement before
+    # it is prepared (0 at once, None never, e.g. behind PgBouncer in
+    # transaction mode) and prepared statements kept per connection
+    DATABASE_PREPARE_THRESHOLD: int | None = 5
+    DATABASE_PREPARED_MAX: int = 100
+    # Read replicas, as host or host:port, with the credentials of the primary
+    POSTGRES_REPLICA_SERVERS: list[str] = []
+    REPLICA_SELECTION: ReplicaSelection = ReplicaSelection.ROUND_ROBIN
+    # Seconds during which a client that wrote keeps reading from the primary
+    READ_YOUR_WRITES_WINDOW: int = 5
+    # Build domain objects from database rows without validating them again
+    TRUSTED_MAPPING: bool = False
+    # Debug switch: validate every row even when TRUSTED_MAPPING is enabled
+    VALIDATE_MAPPING: bool = False
+    # In-process read-through cache of entities read by id
+    ENTITY_CACHE: bool = False
+    ENTITY_CACHE_SIZE: int = 10_000
+    ENTITY_CACHE_TTL: float = 60.0
+    # Lifetime of "not found" entries, 0 disables negative caching
+    ENTITY_CACHE_NEGATIVE_TTL: float = 5.0
+    # Log the statements, rows and database time of every request
+    QUERY_LOG: bool = False
+    # Statements per request before warning, routes may set their own budget
+    QUERY_BUDGET: int | None = None
+    # Fail requests over their budget instead of warning, e.g. in tests
+    QUERY_BUDGET_STRICT: bool = False
 
     @computed_field  # type: ignore[prop-decorator]
     @property
     def SQLALCHEMY_DATABASE_URI(self) -> PostgresDsn:
+        return self._database_uri(self.POSTGRES_SERVER, self.POSTGRES_PORT)
+
+    @computed_field  # type: ignore[prop-decorator]
+    @property
+    def SQLALCHEMY_REPLICA_URIS(self) -> list[PostgresDsn]:
+        uris = []
+        for server in self.POSTGRES_REPLICA_SERVERS:
+            host, _, port = server.partition(":")
+            uris.append(self._database_uri(host, int(port or self.POSTGRES_PORT)))
+        return uris
+
+    def _database_uri(self, host: str, port: int) -> PostgresDsn:
         return MultiHostUrl.build(
             scheme="postgresql+psycopg",
             username=self.POSTGRES_USER,
             password=self.POSTGRES_PASSWORD,
-            host=self.POSTGRES_SERVER,
-            port=self.POSTGRES_PORT,
+            host=host,
+            port=port,
             path=self.POSTGRES_DB,
         )
 
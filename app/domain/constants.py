@@ -7,3 +7,18 @@ class UserConstants:
 
 class PostConstants:
     MAX_TAGS = 5
+
+
+class PaginationConstants:
+    # Pages of listings, `has_more` row included, fit in one IN list of the
+    # relationships loaded with selectinload (500 ids), so that they run a
+    # fixed number of statements, within the query budget of their route
+    MAX_LIMIT = 200
+
+
+class BulkConstants:
+    MAX_ITEMS = 10_000
+
+
+class BatchConstants:
+    MAX_IDS = 1000
@@ -7,18 +7,53 @@ to these domain models before returning them to the application layer.
 """
 
 import datetime
+import hashlib
 import uuid
-from typing import Annotated, Generic, TypeVar
+from collections.abc import Iterable, Sequence
+from enum import StrEnum
+from typing import Annotated, Any, Generic, TypeVar
 
-from pydantic import BaseModel, ConfigDict, Field, NonNegativeInt, PositiveInt
+from pydantic import (
+    BaseModel,
+    ConfigDict,
+    Field,
+    NonNegativeInt,
+    PositiveInt,
+    field_validator,
+)
 
 from app.domain.constants import UserConstants
 
+# Entity id and row version
+VersionRow = tuple[uuid.UUID, int]
+
+
+def version_token(
+    rows: Sequence[VersionRow], related: Iterable[VersionRow], *extra: Any
+) -> str:
+    """
+    Opaque token changing whenever one of the rows, in order, or `extra` does.
+
+    `related` are the rows embedded in them, in any order.
+    """
+    state = repr((list(rows), sorted(related), extra)).encode()
+    return hashlib.blake2b(state, digest_size=16).hexdigest()
+
 
 class DomainModel(BaseModel):
     model_config = ConfigDict(from_attributes=True)
 
     id: uuid.UUID
+    # Row version, bumped by every update of the entity
+    version: int = 1
+
+    def embedded_versions(self) -> list[VersionRow]:
+        """Versions of the entities embedded in this one that its token covers."""
+        return []
+
+    def version_token(self) -> str:
+        """Token of the entity as read, e.g. for ETags."""
+        return version_token([(self.id, self.version)], self.embedded_versions())
 
 
 T = TypeVar("T")
@@ -38,6 +73,10 @@ class UserDomain(DomainModel):
     birth_date: datetime.date
     posts: list["PostDomain"] = Field(default_factory=list)
 
+    def embedded_versions(self) -> list[VersionRow]:
+        # Post tags never change once created, so post versions are enough
+        return [(post.id, post.version) for post in self.posts]
+
 
 class UserMinimalDomain(DomainModel):
     username: str
@@ -52,15 +91,180 @@ class PostDomain(DomainModel):
     tags: list[str] = Field(default_factory=list)
 
 
+class PostSearchHit(PostDomain):
+    # Relevance to the query, higher first, only comparable within a search
+    rank: float
+    # Excerpt of the content, HTML-escaped, matched terms wrapped in <mark> tags
+    snippet: str
+
+
+# Resolve the forward reference now: trusted mappings build users
+# without validating, which would otherwise leave them without a serializer
+UserDomain.model_rebuild()
+
+
+class UserInclude(StrEnum):
+    MINIMAL = "minimal"
+    WITH_POSTS = "with_posts"
+    WITH_POSTS_AND_TAGS = "with_posts_and_tags"
+
+
+class PostInclude(StrEnum):
+    MINIMAL = "minimal"
+    WITH_AUTHOR = "with_author"
+    WITH_TAGS = "with_tags"
+    WITH_AUTHOR_AND_TAGS = "with_author_and_tags"
+
+
+class FilterOp(StrEnum):
+    EQ = "eq"
+    LT = "lt"
+    LTE = "lte"
+    GT = "gt"
+    GTE = "gte"
+
+
+class SortOrder(StrEnum):
+    ASC = "asc"
+    DESC = "desc"
+
+
+class FieldFilter(BaseModel):
+    field: str
+    op: FilterOp = FilterOp.EQ
+    # Converted to the type of the field by the repository, e.g. from "true"
+    value: Any
+
+
+class SortField(BaseModel):
+    field: str
+    order: SortOrder = SortOrder.ASC
+
+
+class QuerySpec(BaseModel):
+    """
+    Conditions and ordering of a listing, all combined with AND.
+
+    Repositories accept only the fields and operators they declare, those
+    backed by an index. Rows of equal sort values are ordered by id, in the
+    direction of the last sort field.
+    """
+
+    filters: list[FieldFilter] = Field(default_factory=list)
+    sort: list[SortField] = Field(default_factory=list)
+
+
+class TagMatch(StrEnum):
+    ANY = "any"  # posts with at least one of the tags
+    ALL = "all"  # posts with every tag
+
+
+class PostQuerySpec(QuerySpec):
+    tags: list[str] = Field(default_factory=list)
+    tag_match: TagMatch = TagMatch.ANY
+
+    @field_validator("tags")
+    @classmethod
+    def clean_tags(cls, tags: list[str]) -> list[str]:
+        # Stored tags are lowercase and stripped
+        return sorted({cleaned for tag in tags if (cleaned := tag.lower().strip())})
+
+
+class CountMode(StrEnum):
+    EXACT = "exact"  # separate COUNT(*) query
+    WINDOW = "window"  # COUNT(*) OVER () in the page query
+    ESTIMATE = "estimate"  # planner statistics, exact when unavailable
+    CACHED = "cached"  # exact count kept for a while, reset on writes
+    NONE = "none"  # no total, only `has_more`
+
+
 class PaginationParams(BaseModel):
     page: PositiveInt = 1
     limit: PositiveInt = 100
+    # Overrides the count mode of the repository when set
+    count: CountMode | None = None
+    # Keyset pagination: `after` takes the `next_cursor` of the previous page.
+    # An empty value starts keyset pagination from the first row.
+    after: str | None = None
 
 
 class PaginationBase(BaseModel, Generic[T]):
-    total: NonNegativeInt
+    total: NonNegativeInt | None
     limit: NonNegativeInt
     items: list[T]
+    has_more: bool = False
+    next_cursor: str | None = None
+
+
+class DomainPagination(PaginationBase[Domain_T]):
+    def version_token(self) -> str:
+        """Token of the page as read: its rows, their versions and its counts."""
+        return version_token(
+            [(item.id, item.version) for item in self.items],
+            [row for item in self.items for row in item.embedded_versions()],
+            self.total,
+            self.has_more,
+        )
+
+
+class BulkItemResult(BaseModel, Generic[T]):
+    index: NonNegativeInt
+    item: T | None = None
+    error: str | None = None
+
+
+class BulkResultBase(BaseModel, Generic[T]):
+    created: NonNegativeInt
+    failed: NonNegativeInt
+    items: list[BulkItemResult[T]]
+
+
+class BatchItemResult(BaseModel, Generic[T]):
+    id: uuid.UUID
+    # False when no entity has the id, `item` is then None
+    found: bool
+    item: T | None = None
+
+
+class BatchResultBase(BaseModel, Generic[T]):
+    found: NonNegativeInt
+    missing: NonNegativeInt
+    items: list[BatchItemResult[T]]
+
+
+class DomainBatchResult(BatchResultBase[Domain_T]):
+    @classmethod
+    def from_items(
+        cls, entity_ids: Sequence[uuid.UUID], entities: Sequence[Domain_T | None]
+    ) -> "DomainBatchResult[Domain_T]":
+        """Result of looking up `entity_ids`, `entities` in the same order."""
+        missing = sum(1 for entity in entities if entity is None)
+        # Passed field by field, as for DomainBulkResult
+        return cls.model_validate(
+            {
+                "found": len(entities) - missing,
+                "missing": missing,
+                "items": [
+                    {"id": entity_id, "found": entity is not None, "item": entity}
+                    for entity_id, entity in zip(entity_ids, entities, strict=True)
+                ],
+            }
+        )
 
 
-class DomainPagination(PaginationBase[Domain_T]): ...
+class DomainBulkResult(BulkResultBase[Domain_T]):
+    @classmethod
+    def from_items(
+        cls, items: list[BulkItemResult[Domain_T]]
+    ) -> "DomainBulkResult[Domain_T]":
+        items = sorted(items, key=lambda result: result.index)
+        failed = sum(1 for result in items if result.error is not None)
+        # Items are passed field by field, like DomainPagination items, so
+        # domain objects are kept as they are instead of being revalidated
+        return cls.model_validate(
+            {
+                "created": len(items) - failed,
+                "failed": failed,
+                "items": [dict(result) for result in items],
+            }
+        )
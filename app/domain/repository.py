@@ -1,11 +1,15 @@
 import uuid
+from collections.abc import AsyncIterator, Iterator, Sequence
 from typing import Any, Protocol
 
 from app.domain.models import (
+    BulkItemResult,
     Create_T_contra,
     Domain_T,
     DomainPagination,
     PaginationParams,
+    PostDomain,
+    PostSearchHit,
     Update_T_contra,
 )
 
@@ -21,8 +25,94 @@ class AbstractRepository(Protocol[Domain_T, Create_T_contra, Update_T_contra]):
 
     def get_by_id(self, entity_id: uuid.UUID, /, **kwargs: Any) -> Domain_T: ...
 
+    def get_many(
+        self, entity_ids: Sequence[uuid.UUID], /, **kwargs: Any
+    ) -> list[Domain_T | None]: ...
+
+    def iter_all(
+        self, batch_size: int = 1000, **kwargs: Any
+    ) -> Iterator[list[Domain_T]]: ...
+
+    def get_version(self, entity_id: uuid.UUID, /, **kwargs: Any) -> str: ...
+
+    def get_page_version(
+        self,
+        pagination: PaginationParams | None = None,
+        **kwargs: Any,
+    ) -> str: ...
+
     def create(self, data: Create_T_contra, /) -> Domain_T: ...
 
+    def create_many(
+        self, data: Sequence[Create_T_contra], /
+    ) -> list[BulkItemResult[Domain_T]]: ...
+
     def update(self, entity_id: uuid.UUID, data: Update_T_contra, /) -> Domain_T: ...
 
     def delete(self, entity_id: uuid.UUID, /) -> None: ...
+
+
+class AsyncAbstractRepository(Protocol[Domain_T, Create_T_contra, Update_T_contra]):
+    schema: type[Domain_T]
+
+    async def get_all(
+        self,
+        pagination: PaginationParams | None = None,
+        **kwargs: Any,
+    ) -> DomainPagination[Domain_T]: ...
+
+    async def get_by_id(self, entity_id: uuid.UUID, /, **kwargs: Any) -> Domain_T: ...
+
+    async def get_many(
+        self, entity_ids: Sequence[uuid.UUID], /, **kwargs: Any
+    ) -> list[Domain_T | None]: ...
+
+    def iter_all(
+        self, batch_size: int = 1000, **kwargs: Any
+    ) -> AsyncIterator[list[Domain_T]]: ...
+
+    async def get_version(self, entity_id: uuid.UUID, /, **kwargs: Any) -> str: ...
+
+    async def get_page_version(
+        self,
+        pagination: PaginationParams | None = None,
+        **kwargs: Any,
+    ) -> str: ...
+
+    async def create(self, data: Create_T_contra, /) -> Domain_T: ...
+
+    async def create_many(
+        self, data: Sequence[Create_T_contra], /
+    ) -> list[BulkItemResult[Domain_T]]: ...
+
+    async def update(
+        self, entity_id: uuid.UUID, data: Update_T_contra, /
+    ) -> Domain_T: ...
+
+    async def delete(self, entity_id: uuid.UUID, /) -> None: ...
+
+
+class PostRepository(
+    AbstractRepository[PostDomain, Create_T_contra, Update_T_contra],
+    Protocol[Create_T_contra, Update_T_contra],
+):
+    def search(
+        self,
+        query: str,
+        /,
+        pagination: PaginationParams | None = None,
+        **kwargs: Any,
+    ) -> DomainPagination[PostSearchHit]: ...
+
+
+class AsyncPostRepository(
+    AsyncAbstractRepository[PostDomain, Create_T_contra, Update_T_contra],
+    Protocol[Create_T_contra, Update_T_contra],
+):
+    async def search(
+        self,
+        query: str,
+        /,
+        pagination: PaginationParams | None = None,
+        **kwargs: Any,
+    ) -> DomainPagination[PostSearchHit]: ...
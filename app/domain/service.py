@@ -1,14 +1,17 @@
 import uuid
+from collections.abc import AsyncIterator, Iterator, Sequence
 from typing import Any, Generic
 
 from app.domain.models import (
     Create_T_contra,
     Domain_T,
+    DomainBatchResult,
+    DomainBulkResult,
     DomainPagination,
     PaginationParams,
     Update_T_contra,
 )
-from app.domain.repository import AbstractRepository
+from app.domain.repository import AbstractRepository, AsyncAbstractRepository
 
 
 class AbstractService(Generic[Domain_T, Create_T_contra, Update_T_contra]):
@@ -27,11 +30,90 @@ class AbstractService(Generic[Domain_T, Create_T_contra, Update_T_contra]):
     def get_by_id(self, entity_id: uuid.UUID, /, **kwargs: Any) -> Domain_T:
         return self.repository.get_by_id(entity_id, **kwargs)
 
+    def get_many(
+        self, entity_ids: Sequence[uuid.UUID], /, **kwargs: Any
+    ) -> DomainBatchResult[Domain_T]:
+        entities = self.repository.get_many(entity_ids, **kwargs)
+        return DomainBatchResult.from_items(entity_ids, entities)
+
+    def iter_all(
+        self, batch_size: int = 1000, **kwargs: Any
+    ) -> Iterator[list[Domain_T]]:
+        return self.repository.iter_all(batch_size=batch_size, **kwargs)
+
+    def get_version(self, entity_id: uuid.UUID, /, **kwargs: Any) -> str:
+        return self.repository.get_version(entity_id, **kwargs)
+
+    def get_page_version(
+        self,
+        pagination: PaginationParams | None = None,
+        **kwargs: Any,
+    ) -> str:
+        return self.repository.get_page_version(pagination=pagination, **kwargs)
+
     def create(self, data: Create_T_contra, /) -> Domain_T:
         return self.repository.create(data)
 
+    def create_many(
+        self, data: Sequence[Create_T_contra], /
+    ) -> DomainBulkResult[Domain_T]:
+        return DomainBulkResult.from_items(self.repository.create_many(data))
+
     def update(self, entity_id: uuid.UUID, data: Update_T_contra, /) -> Domain_T:
         return self.repository.update(entity_id, data)
 
     def delete(self, entity_id: uuid.UUID, /) -> None:
         self.repository.delete(entity_id)
+
+
+class AsyncAbstractService(Generic[Domain_T, Create_T_contra, Update_T_contra]):
+    def __init__(
+        self,
+        repository: AsyncAbstractRepository[Domain_T, Create_T_contra, Update_T_contra],
+    ) -> None:
+        self.repository = repository
+
+    async def get_all(
+        self,
+        pagination: PaginationParams | None = None,
+        **kwargs: Any,
+    ) -> DomainPagination[Domain_T]:
+        return await self.repository.get_all(pagination=pagination, **kwargs)
+
+    async def get_by_id(self, entity_id: uuid.UUID, /, **kwargs: Any) -> Domain_T:
+        return await self.repository.get_by_id(entity_id, **kwargs)
+
+    async def get_many(
+        self, entity_ids: Sequence[uuid.UUID], /, **kwargs: Any
+    ) -> DomainBatchResult[Domain_T]:
+        entities = await self.repository.get_many(entity_ids, **kwargs)
+        return DomainBatchResult.from_items(entity_ids, entities)
+
+    def iter_all(
+        self, batch_size: int = 1000, **kwargs: Any
+    ) -> AsyncIterator[list[Domain_T]]:
+        return self.repository.iter_all(batch_size=batch_size, **kwargs)
+
+    async def get_version(self, entity_id: uuid.UUID, /, **kwargs: Any) -> str:
+        return await self.repository.get_version(entity_id, **kwargs)
+
+    async def get_page_version(
+        self,
+        pagination: PaginationParams | None = None,
+        **kwargs: Any,
+    ) -> str:
+        return await self.repository.get_page_version(pagination=pagination, **kwargs)
+
+    async def create(self, data: Create_T_contra, /) -> Domain_T:
+        return await self.repository.create(data)
+
+    async def create_many(
+        self, data: Sequence[Create_T_contra], /
+    ) -> DomainBulkResult[Domain_T]:
+        return DomainBulkResult.from_items(await self.repository.create_many(data))
+
+    async def update(self, entity_id: uuid.UUID, data: Update_T_contra, /) -> Domain_T:
+        return await self.repository.update(entity_id, data)
+
+    async def delete(self, entity_id: uuid.UUID, /) -> None:
+        await self.repository.delete(entity_id)
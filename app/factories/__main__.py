@@ -0,0 +1,56 @@
+"""
+Seed the database with fake data.
+
+    python -m app.factories seed --users 10000 --posts 1000000
+"""
+
+import argparse
+import sys
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from app.core.config import get_settings
+from app.factories.seed import Seeder
+from app.infrastructure.models import Base
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(prog="python -m app.factories")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    seed = commands.add_parser("seed", help="bulk insert fake users and posts")
+    seed.add_argument("--users", type=int, default=0)
+    seed.add_argument("--posts", type=int, default=0)
+    seed.add_argument("--chunk-size", type=int, default=10_000)
+    seed.add_argument("--author-pool-size", type=int, default=1000)
+    seed.add_argument("--tag-pool-size", type=int, default=500)
+    seed.add_argument(
+        "--database-url", help="defaults to the URI built from the settings"
+    )
+    args = parser.parse_args(argv)
+
+    database_url = args.database_url or str(get_settings().SQLALCHEMY_DATABASE_URI)
+    engine = create_engine(database_url)
+    Base.metadata.create_all(engine)
+
+    def progress(rows: int) -> None:
+        print(f"\r  {rows} rows", end="", file=sys.stderr, flush=True)
+
+    with Session(engine) as session:
+        seeder = Seeder(
+            session,
+            chunk_size=args.chunk_size,
+            author_pool_size=args.author_pool_size,
+            tag_pool_size=args.tag_pool_size,
+        )
+        if args.users:
+            report = seeder.seed_users(args.users, on_chunk=progress)
+            print(f"\r{report}", file=sys.stderr)
+        if args.posts:
+            report = seeder.seed_posts(args.posts, on_chunk=progress)
+            print(f"\r{report}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
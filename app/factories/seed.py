@@ -0,0 +1,183 @@
+"""
+High-volume seeding for load tests.
+
+Unlike the factories, which commit one entity at a time, the seeder
+generates rows in chunks and writes each chunk in a single transaction with
+Core multi-row inserts. Posts draw their author from a pool of user ids and
+their tags from a fixed pool of deduplicated tag names.
+"""
+
+import random
+import time
+import uuid
+from collections.abc import Callable, Iterator
+from dataclasses import dataclass
+from typing import Any
+
+from sqlalchemy import Table, insert, select
+from sqlalchemy.orm import Session
+
+from app.domain.constants import UserConstants
+from app.factories.base import faker
+from app.infrastructure.models import Base, Post, Tag, User
+
+
+@dataclass
+class SeedReport:
+    table: str
+    rows: int
+    elapsed: float
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows / self.elapsed if self.elapsed else float("inf")
+
+    def __str__(self) -> str:
+        return (
+            f"{self.table}: {self.rows} rows in {self.elapsed:.2f}s "
+            f"({self.rows_per_second:,.0f} rows/s)"
+        )
+
+
+class Seeder:
+    active_ratio = 0.9
+
+    def __init__(
+        self,
+        session: Session,
+        chunk_size: int = 10_000,
+        author_pool_size: int = 1000,
+        tag_pool_size: int = 500,
+        text_pool_size: int = 1000,
+    ) -> None:
+        self.session = session
+        self.chunk_size = chunk_size
+        self.author_pool_size = author_pool_size
+        self.tag_pool_size = tag_pool_size
+        self.text_pool_size = text_pool_size
+        self.user_ids: list[uuid.UUID] = []
+
+    def seed_users(
+        self, count: int, on_chunk: Callable[[int], None] | None = None
+    ) -> SeedReport:
+        table = self._table(User)
+        return self._seed(table, self._user_rows(count), on_chunk=on_chunk)
+
+    def seed_posts(
+        self, count: int, on_chunk: Callable[[int], None] | None = None
+    ) -> SeedReport:
+        author_ids = self._author_pool()
+        if not author_ids:
+            raise ValueError("Posts need at least one user to use as author.")
+
+        tag_ids = self._tag_pool()
+        post_table = self._table(Post)
+        post_tags_table = Base.metadata.tables["post_tags"]
+        titles = [faker.sentence(nb_words=6) for _ in range(self.text_pool_size)]
+        contents = [
+            faker.paragraph(nb_sentences=10) for _ in range(self.text_pool_size)
+        ]
+
+        start = time.perf_counter()
+        for done in range(0, count, self.chunk_size):
+            size = min(self.chunk_size, count - done)
+            posts: list[dict[str, Any]] = []
+            links: list[dict[str, Any]] = []
+            for _ in range(size):
+                post_id = uuid.uuid4()
+                posts.append(
+                    {
+                        "id": post_id,
+                        "title": random.choice(titles),
+                        "content": random.choice(contents),
+                        "author_id": random.choice(author_ids),
+                    }
+                )
+                links.extend(
+                    {"post_id": post_id, "tag_id": tag_id}
+                    for tag_id in random.sample(
+                        tag_ids, k=min(random.randint(1, 3), len(tag_ids))
+                    )
+                )
+
+            self.session.execute(insert(post_table), posts)
+            self.session.execute(insert(post_tags_table), links)
+            self.session.commit()
+            if on_chunk:
+                on_chunk(done + size)
+
+        return SeedReport(
+            table=post_table.name, rows=count, elapsed=time.perf_counter() - start
+        )
+
+    def _seed(
+        self,
+        table: Table,
+        rows: Iterator[list[dict[str, Any]]],
+        on_chunk: Callable[[int], None] | None = None,
+    ) -> SeedReport:
+        start = time.perf_counter()
+        total = 0
+        for chunk in rows:
+            self.session.execute(insert(table), chunk)
+            self.session.commit()
+            total += len(chunk)
+            if on_chunk:
+                on_chunk(total)
+
+        return SeedReport(
+            table=table.name, rows=total, elapsed=time.perf_counter() - start
+        )
+
+    def _user_rows(self, count: int) -> Iterator[list[dict[str, Any]]]:
+        for done in range(0, count, self.chunk_size):
+            chunk: list[dict[str, Any]] = []
+            for _ in range(min(self.chunk_size, count - done)):
+                user_id = uuid.uuid4()
+                username = faker.user_name()
+                chunk.append(
+                    {
+                        "id": user_id,
+                        "username": username,
+                        # The id suffix keeps emails unique across runs
+                        "email": f"{username}.{user_id.hex[:12]}@example.com",
+                        "level": random.randint(
+                            UserConstants.MIN_LEVEL, UserConstants.MAX_LEVEL
+                        ),
+                        "height": round(
+                            random.uniform(
+                                UserConstants.MIN_HEIGHT, UserConstants.MAX_HEIGHT
+                            ),
+                            2,
+                        ),
+                        "is_active": random.random() < self.active_ratio,
+                        "birth_date": faker.date_of_birth(),
+                    }
+                )
+            if len(self.user_ids) < self.author_pool_size:
+                self.user_ids.extend(row["id"] for row in chunk)
+            yield chunk
+
+    def _author_pool(self) -> list[uuid.UUID]:
+        """Authors seeded in this run, or existing users otherwise."""
+        if self.user_ids:
+            return self.user_ids[: self.author_pool_size]
+        stmt = select(User.id).limit(self.author_pool_size)
+        return list(self.session.scalars(stmt))
+
+    def _tag_pool(self) -> list[uuid.UUID]:
+        """Insert missing tag names from the pool and return all their ids."""
+        names = {faker.word() for _ in range(self.tag_pool_size)}
+        stmt = select(Tag.name).where(Tag.name.in_(names))
+        missing = names - set(self.session.scalars(stmt))
+        if missing:
+            rows = [{"id": uuid.uuid4(), "name": name} for name in missing]
+            self.session.execute(insert(self._table(Tag)), rows)
+            self.session.commit()
+
+        stmt_ids = select(Tag.id).where(Tag.name.in_(names))
+        return list(self.session.scalars(stmt_ids))
+
+    @staticmethod
+    def _table(model: type[Base]) -> Table:
+        return Base.metadata.tables[model.__tablename__]
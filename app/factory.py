@@ -1,16 +1,25 @@
-from fastapi import FastAPI
+from fastapi import Depends, FastAPI
 
 from app.api.exception_handlers import ExceptionHandlers
+from app.api.instrumentation import QueryBudget, QueryInstrumentationMiddleware
+from app.api.replicas import RecentWriteMiddleware
+from app.api.routes.metrics import router as metrics_router
 from app.api.routes.posts import router as posts_router
 from app.api.routes.users import router as users_router
+from app.infrastructure import instrumentation
 
 
 def create_app() -> FastAPI:
-    app = FastAPI()
+    app = FastAPI(dependencies=[Depends(QueryBudget())])
 
+    app.include_router(metrics_router)
     app.include_router(posts_router)
     app.include_router(users_router)
 
     ExceptionHandlers(app)
 
+    app.add_middleware(RecentWriteMiddleware)
+    instrumentation.listen()
+    app.add_middleware(QueryInstrumentationMiddleware)
+
     return app
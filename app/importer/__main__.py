@@ -0,0 +1,59 @@
+"""
+Import users and posts from CSV or NDJSON dumps.
+
+    python -m app.importer users users.csv
+    python -m app.importer posts posts.ndjson --errors rejected.ndjson
+
+CSV files have a header row with the field names; post tags are separated
+by "|". Rows may carry an `id`, which posts use to reference their author.
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from app.core.config import get_settings
+from app.importer.pipeline import Importer, ImportReport
+from app.infrastructure.models import Base
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(prog="python -m app.importer")
+    parser.add_argument("entity", choices=["users", "posts"])
+    parser.add_argument("path", type=Path, help="a .csv file or an NDJSON file")
+    parser.add_argument("--batch-size", type=int, default=10_000)
+    parser.add_argument(
+        "--errors",
+        type=Path,
+        help="where to write rejected rows, defaults to <path>.errors.ndjson",
+    )
+    parser.add_argument(
+        "--database-url", help="defaults to the URI built from the settings"
+    )
+    args = parser.parse_args(argv)
+
+    database_url = args.database_url or str(get_settings().SQLALCHEMY_DATABASE_URI)
+    engine = create_engine(database_url)
+    Base.metadata.create_all(engine)
+    errors_path = args.errors or args.path.with_name(f"{args.path.name}.errors.ndjson")
+
+    def progress(report: ImportReport) -> None:
+        print(f"\r  {report.read} rows", end="", file=sys.stderr, flush=True)
+
+    with Session(engine) as session, errors_path.open("w") as errors:
+        importer = Importer(session, batch_size=args.batch_size, errors=errors)
+        if args.entity == "users":
+            report = importer.import_users(args.path, on_batch=progress)
+        else:
+            report = importer.import_posts(args.path, on_batch=progress)
+
+    print(f"\r{report}", file=sys.stderr)
+    if report.rejected:
+        print(f"Rejected rows written to {errors_path}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
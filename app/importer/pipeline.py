@@ -0,0 +1,191 @@
+"""
+Bulk import of users and posts from CSV or NDJSON dumps.
+
+The input file is streamed in batches. Each batch is validated against the
+create DTOs, with the same tag normalization as `PostService`, then loaded
+through the staging tables. Rejected rows are written to an NDJSON error
+file with their line number and the reason.
+"""
+
+import csv
+import itertools
+import json
+import time
+import uuid
+from collections.abc import Callable, Iterator
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, TextIO, TypeVar
+
+from pydantic import Field, ValidationError, field_validator
+from sqlalchemy.orm import Session
+
+from app.application.dtos import PostCreate, UserCreate
+from app.application.services.post import PostService
+from app.domain.exceptions import DomainError
+from app.infrastructure.staging import StagingLoader
+
+# Raw row, a line of JSON or the values of a CSV record
+RawRow = str | dict[str, str]
+
+
+class UserImport(UserCreate):
+    # Kept from the dump when present, so that posts can reference users
+    id: uuid.UUID = Field(default_factory=uuid.uuid4)
+
+
+class PostImport(PostCreate):
+    id: uuid.UUID = Field(default_factory=uuid.uuid4)
+
+    @field_validator("tags", mode="before")
+    @classmethod
+    def split_tags(cls, value: Any) -> Any:
+        # CSV dumps list tags in one column, separated by "|"
+        return value.split("|") if isinstance(value, str) else value
+
+
+ImportModel_T = TypeVar("ImportModel_T", UserImport, PostImport)
+
+
+@dataclass
+class ImportReport:
+    table: str
+    read: int = 0
+    imported: int = 0
+    rejected: int = 0
+    elapsed: float = 0.0
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.read / self.elapsed if self.elapsed else float("inf")
+
+    def __str__(self) -> str:
+        return (
+            f"{self.table}: {self.imported} imported, {self.rejected} rejected "
+            f"in {self.elapsed:.2f}s ({self.rows_per_second:,.0f} rows/s)"
+        )
+
+
+def read_rows(path: Path) -> Iterator[tuple[int, RawRow]]:
+    """Line number and raw row of every record of a `.csv` or NDJSON file."""
+    with path.open(newline="") as file:
+        if path.suffix == ".csv":
+            reader = csv.DictReader(file)
+            for row in reader:
+                # Empty cells fall back to the defaults of the DTOs
+                yield (
+                    reader.line_num,
+                    {key: value for key, value in row.items() if value},
+                )
+            return
+
+        for line, text in enumerate(file, start=1):
+            if text.strip():
+                yield line, text
+
+
+class Importer:
+    def __init__(
+        self,
+        session: Session,
+        batch_size: int = 10_000,
+        errors: TextIO | None = None,
+    ) -> None:
+        self.session = session
+        self.batch_size = batch_size
+        self.errors = errors
+        self.loader = StagingLoader(session)
+
+    def import_users(
+        self, path: Path, on_batch: Callable[[ImportReport], None] | None = None
+    ) -> ImportReport:
+        def load(items: list[UserImport]) -> dict[uuid.UUID, str]:
+            return self.loader.load_users([item.model_dump() for item in items])
+
+        return self._import("user", path, self._parse_user, load, on_batch=on_batch)
+
+    def import_posts(
+        self, path: Path, on_batch: Callable[[ImportReport], None] | None = None
+    ) -> ImportReport:
+        def load(items: list[PostImport]) -> dict[uuid.UUID, str]:
+            rows = [item.model_dump(exclude={"tags"}) for item in items]
+            tags = [
+                {"post_id": item.id, "name": name}
+                for item in items
+                for name in item.tags
+            ]
+            return self.loader.load_posts(rows, tags)
+
+        return self._import("post", path, self._parse_post, load, on_batch=on_batch)
+
+    def _import(
+        self,
+        table: str,
+        path: Path,
+        parse: Callable[[RawRow], ImportModel_T],
+        load: Callable[[list[ImportModel_T]], dict[uuid.UUID, str]],
+        on_batch: Callable[[ImportReport], None] | None = None,
+    ) -> ImportReport:
+        report = ImportReport(table=table)
+        start = time.perf_counter()
+        for batch in itertools.batched(read_rows(path), self.batch_size):
+            items: dict[uuid.UUID, tuple[int, RawRow, ImportModel_T]] = {}
+            for line, raw in batch:
+                try:
+                    item = parse(raw)
+                except ValidationError as err:
+                    self._reject(line, raw, self._validation_message(err))
+                    continue
+                except DomainError as err:
+                    self._reject(line, raw, str(err))
+                    continue
+                if item.id in items:
+                    self._reject(line, raw, f"Duplicate id {item.id}.")
+                    continue
+                items[item.id] = (line, raw, item)
+
+            rejected = load([item for _, _, item in items.values()])
+            self.session.commit()
+            for entity_id, error in rejected.items():
+                line, raw, _ = items[entity_id]
+                self._reject(line, raw, error)
+
+            report.read += len(batch)
+            report.imported += len(items) - len(rejected)
+            report.rejected = report.read - report.imported
+            report.elapsed = time.perf_counter() - start
+            if on_batch:
+                on_batch(report)
+
+        return report
+
+    @classmethod
+    def _parse_user(cls, raw: RawRow) -> UserImport:
+        return cls._validate(UserImport, raw)
+
+    @classmethod
+    def _parse_post(cls, raw: RawRow) -> PostImport:
+        item = cls._validate(PostImport, raw)
+        # Same rules as posts created through the service
+        cleaned = PostService._clean_create(item)
+        return PostImport(id=item.id, **cleaned.model_dump())
+
+    @staticmethod
+    def _validate(schema: type[ImportModel_T], raw: RawRow) -> ImportModel_T:
+        if isinstance(raw, str):
+            return schema.model_validate_json(raw)
+        return schema.model_validate(raw)
+
+    @staticmethod
+    def _validation_message(err: ValidationError) -> str:
+        return "; ".join(
+            f"{'.'.join(map(str, error['loc'])) or 'row'}: {error['msg']}"
+            for error in err.errors(include_url=False)
+        )
+
+    def _reject(self, line: int, raw: RawRow, error: str) -> None:
+        if self.errors is None:
+            return
+        row: Any = raw.strip() if isinstance(raw, str) else raw
+        rejection = {"line": line, "error": error, "row": row}
+        self.errors.write(json.dumps(rejection) + "\n")
@@ -0,0 +1,168 @@
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from collections.abc import Hashable, Iterable, Mapping
+from dataclasses import dataclass, field
+from typing import Any, Generic, Protocol, TypeVar
+
+from app.domain.models import DomainModel
+from app.infrastructure.exceptions import EntityNotFoundError
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+K_contra = TypeVar("K_contra", bound=Hashable, contravariant=True)
+
+
+class CacheBackend(Protocol[K_contra]):
+    """
+    Storage of an `EntityCache`.
+
+    `LRUCache` keeps entries in process. A shared backend (e.g. Redis) must
+    serialize values itself and honour the per-entry `ttl`.
+    """
+
+    def get(self, key: K_contra) -> Any: ...
+
+    def set(self, key: K_contra, value: Any, ttl: float | None = None) -> None: ...
+
+    def delete(self, key: K_contra) -> None: ...
+
+    def clear(self) -> None: ...
+
+
+class LRUCache(Generic[K, V]):
+    """Thread-safe bounded LRU cache with an optional time-to-live."""
+
+    def __init__(self, maxsize: int = 1024, ttl: float | None = None) -> None:
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: OrderedDict[K, tuple[float, V]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, key: K) -> V | None:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._data[key]
+                return None
+
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key: K, value: V, ttl: float | None = None) -> None:
+        ttl = ttl or self.ttl
+        expires_at = time.monotonic() + ttl if ttl else float("inf")
+        with self._lock:
+            self._data[key] = (expires_at, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def delete(self, key: K) -> None:
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+
+# Cache key: entity type name and id
+EntityKey = tuple[str, uuid.UUID]
+
+
+class _Missing:
+    """Marks an entity known not to exist (negative caching)."""
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    negative_hits: int = 0
+    invalidations: int = 0
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def increment(self, counter: str) -> None:
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+
+class EntityCache:
+    """
+    Domain objects read by id, shared by the cached repositories.
+
+    An entry holds every variant of an entity that was read (one per set of
+    `get_by_id` options, e.g. `include` or `fields`), so a write drops them
+    all at once.
+    """
+
+    def __init__(
+        self,
+        backend: CacheBackend[EntityKey],
+        negative_ttl: float | None = 5.0,
+    ) -> None:
+        self.backend = backend
+        self.negative_ttl = negative_ttl
+        self.stats = CacheStats()
+
+    def get(
+        self, schema: type[DomainModel], entity_id: uuid.UUID, options: Hashable
+    ) -> DomainModel | None:
+        """Cached variant of an entity, raising if the entity is known missing."""
+        entry = self.backend.get(self._key(schema, entity_id))
+        if isinstance(entry, _Missing):
+            self.stats.increment("negative_hits")
+            raise EntityNotFoundError(self._entity_type(schema), str(entity_id))
+
+        if entry is not None and options in entry:
+            self.stats.increment("hits")
+            return entry[options]  # type: ignore[no-any-return]
+
+        self.stats.increment("misses")
+        return None
+
+    def set(
+        self,
+        schema: type[DomainModel],
+        entity_id: uuid.UUID,
+        options: Hashable,
+        entity: DomainModel,
+    ) -> None:
+        key = self._key(schema, entity_id)
+        entry = self.backend.get(key)
+        variants = dict(entry) if isinstance(entry, Mapping) else {}
+        variants[options] = entity
+        self.backend.set(key, variants)
+
+    def set_missing(self, schema: type[DomainModel], entity_id: uuid.UUID) -> None:
+        if self.negative_ttl:
+            self.backend.set(
+                self._key(schema, entity_id), _Missing(), ttl=self.negative_ttl
+            )
+
+    def invalidate(
+        self, entities: Iterable[tuple[type[DomainModel], uuid.UUID]]
+    ) -> None:
+        for schema, entity_id in entities:
+            self.stats.increment("invalidations")
+            self.backend.delete(self._key(schema, entity_id))
+
+    def clear(self) -> None:
+        self.backend.clear()
+
+    @classmethod
+    def _key(cls, schema: type[DomainModel], entity_id: uuid.UUID) -> EntityKey:
+        return cls._entity_type(schema), entity_id
+
+    @staticmethod
+    def _entity_type(schema: type[DomainModel]) -> str:
+        return schema.__name__.removesuffix("Domain")
@@ -0,0 +1,62 @@
+"""
+Opaque cursors used by keyset pagination.
+
+A cursor holds the sort key values of the last row of a page. Clients must
+treat it as an opaque token and only send it back through `after`.
+"""
+
+import base64
+import binascii
+import datetime
+import json
+import uuid
+from collections.abc import Sequence
+from typing import Any
+
+from sqlalchemy import ColumnElement
+from sqlalchemy.orm import InstrumentedAttribute
+
+from app.infrastructure.exceptions import InvalidCursorError
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    payload = json.dumps([_encode_value(value) for value in values])
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(
+    cursor: str,
+    columns: Sequence[InstrumentedAttribute[Any] | ColumnElement[Any]],
+) -> tuple[Any, ...]:
+    padding = "=" * (-len(cursor) % 4)
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor + padding))
+    except (binascii.Error, UnicodeDecodeError, ValueError) as err:
+        raise InvalidCursorError(cursor) from err
+
+    if not isinstance(values, list) or len(values) != len(columns):
+        raise InvalidCursorError(cursor)
+
+    try:
+        return tuple(
+            _decode_value(value, column.type.python_type)
+            for value, column in zip(values, columns, strict=True)
+        )
+    except (TypeError, ValueError) as err:
+        raise InvalidCursorError(cursor) from err
+
+
+def _encode_value(value: Any) -> Any:
+    if isinstance(value, uuid.UUID | datetime.date):
+        return str(value)
+    return value
+
+
+def _decode_value(value: Any, python_type: type[Any]) -> Any:
+    if value is None:
+        return None
+    if python_type is uuid.UUID:
+        return uuid.UUID(value)
+    if issubclass(python_type, datetime.date):
+        return python_type.fromisoformat(value)
+    return python_type(value)
@@ -15,8 +15,34 @@ class EntityAlreadyExistsError(RepositoryError):
         super().__init__(f"{entity_type} already exists.")
 
 
+class EntityConflictError(RepositoryError):
+    def __init__(self, entity_type: str, entity_id: str):
+        self.entity_type = entity_type
+        self.entity_id = entity_id
+        super().__init__(f"{entity_type} {entity_id} was changed concurrently.")
+
+
 class DatabaseError(RepositoryError):
     def __init__(self, operation: str, details: str):
         self.operation = operation
         self.details = details
         super().__init__(f"Database {operation} failed: {details}.")
+
+
+class InvalidCursorError(RepositoryError):
+    def __init__(self, cursor: str):
+        self.cursor = cursor
+        super().__init__(f"Invalid pagination cursor {cursor!r}.")
+
+
+class InvalidFieldsError(RepositoryError):
+    def __init__(self, fields: list[str]):
+        self.fields = fields
+        super().__init__(f"Invalid fields {', '.join(fields)}.")
+
+
+class InvalidQueryError(RepositoryError):
+    def __init__(self, field: str, operation: str):
+        self.field = field
+        self.operation = operation
+        super().__init__(f"Cannot {operation} {field}.")
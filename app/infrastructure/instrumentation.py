@@ -0,0 +1,71 @@
+"""
+SQL statement instrumentation.
+
+Cursor events of every engine add the statements run while `track_queries`
+is active, with their rows and time, to the `QueryStats` of the current
+context (e.g. of a request). Context variables follow the work into worker
+threads and `AsyncSession.run_sync`, so all statements of a request count.
+"""
+
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Any
+
+from sqlalchemy import Engine, event
+from sqlalchemy.engine.interfaces import DBAPICursor, ExecutionContext
+
+
+@dataclass
+class QueryStats:
+    statements: int = 0
+    # As reported by the driver, which may not know it for SELECT statements
+    rows: int = 0
+    # Seconds spent executing statements
+    db_time: float = 0.0
+
+
+_current_stats: ContextVar[QueryStats | None] = ContextVar("query_stats", default=None)
+
+
+def current_query_stats() -> QueryStats | None:
+    return _current_stats.get()
+
+
+@contextmanager
+def track_queries() -> Iterator[QueryStats]:
+    stats = QueryStats()
+    token = _current_stats.set(stats)
+    try:
+        yield stats
+    finally:
+        _current_stats.reset(token)
+
+
+def _before_cursor_execute(context: ExecutionContext | None, **kwargs: Any) -> None:
+    if context is not None and _current_stats.get() is not None:
+        context._query_start = time.perf_counter()  # type: ignore[attr-defined]
+
+
+def _after_cursor_execute(
+    cursor: DBAPICursor, context: ExecutionContext | None, **kwargs: Any
+) -> None:
+    stats = _current_stats.get()
+    if stats is None:
+        return
+
+    stats.statements += 1
+    stats.rows += max(cursor.rowcount, 0)
+    if (start := getattr(context, "_query_start", None)) is not None:
+        stats.db_time += time.perf_counter() - start
+
+
+def listen() -> None:
+    """Instrument every engine, once."""
+    if not event.contains(Engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(
+            Engine, "before_cursor_execute", _before_cursor_execute, named=True
+        )
+        event.listen(Engine, "after_cursor_execute", _after_cursor_execute, named=True)
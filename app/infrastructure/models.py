@@ -1,7 +1,8 @@
 import datetime
 import uuid
+from typing import Any
 
-from sqlalchemy import Column, ForeignKey, Table, Uuid
+from sqlalchemy import Column, Connection, ForeignKey, Index, Table, Uuid, event
 from sqlalchemy.orm import (
     DeclarativeBase,
     Mapped,
@@ -19,6 +20,13 @@ class Base(DeclarativeBase):
     id: Mapped[uuid.UUID] = mapped_column(
         Uuid(as_uuid=True), primary_key=True, default=uuid.uuid4
     )
+    # Row version, bumped by every ORM update, which also checks it so that
+    # concurrent writes to the same row fail instead of overwriting each other
+    version: Mapped[int] = mapped_column(default=1)
+
+    @declared_attr.directive
+    def __mapper_args__(cls) -> dict[str, Any]:
+        return {"version_id_col": cls.version}
 
 
 post_tags = Table(
@@ -26,6 +34,8 @@ post_tags = Table(
     Base.metadata,
     Column("post_id", ForeignKey("post.id"), primary_key=True),
     Column("tag_id", ForeignKey("tag.id"), primary_key=True),
+    # The primary key leads with the post: tag filters look up posts by tag
+    Index("ix_post_tags_tag_id_post_id", "tag_id", "post_id"),
 )
 
 
@@ -39,6 +49,15 @@ class User(Base):
 
     posts: Mapped[list["Post"]] = relationship(back_populates="author")
 
+    # One index per filterable and sortable field of the user repository. The
+    # id, last, keeps listings ordered by the field, then the id, index-only.
+    __table_args__ = (
+        Index("ix_user_level_id", "level", "id"),
+        Index("ix_user_height_id", "height", "id"),
+        Index("ix_user_birth_date_id", "birth_date", "id"),
+        Index("ix_user_is_active_id", "is_active", "id"),
+    )
+
 
 class Post(Base):
     title: Mapped[str]
@@ -48,6 +67,51 @@ class Post(Base):
     author: Mapped["User"] = relationship(back_populates="posts")
     tags: Mapped[list["Tag"]] = relationship(secondary=post_tags)
 
+    # Posts of an author, for filters and the versions of their author
+    __table_args__ = (Index("ix_post_author_id_id", "author_id", "id"),)
+
 
 class Tag(Base):
     name: Mapped[str] = mapped_column(unique=True)
+
+
+# Full-text index over the title and content of posts, see `app.infrastructure.search`.
+# PostgreSQL keeps a generated tsvector column, not mapped, under a GIN index.
+# SQLite keeps an FTS5 table over the post rows, synced by triggers.
+POST_SEARCH_DDL = {
+    "postgresql": [
+        "ALTER TABLE post ADD COLUMN search_vector tsvector GENERATED ALWAYS AS ("
+        "setweight(to_tsvector('english', title), 'A') || "
+        "setweight(to_tsvector('english', content), 'B')) STORED",
+        "CREATE INDEX ix_post_search_vector ON post USING GIN (search_vector)",
+    ],
+    "sqlite": [
+        "CREATE VIRTUAL TABLE post_search USING fts5("
+        "title, content, content='post', content_rowid='rowid', "
+        "tokenize='porter unicode61')",
+        "CREATE TRIGGER post_search_insert AFTER INSERT ON post BEGIN "
+        "INSERT INTO post_search (rowid, title, content) "
+        "VALUES (new.rowid, new.title, new.content); END",
+        "CREATE TRIGGER post_search_delete AFTER DELETE ON post BEGIN "
+        "INSERT INTO post_search (post_search, rowid, title, content) "
+        "VALUES ('delete', old.rowid, old.title, old.content); END",
+        "CREATE TRIGGER post_search_update AFTER UPDATE OF title, content ON post "
+        "BEGIN "
+        "INSERT INTO post_search (post_search, rowid, title, content) "
+        "VALUES ('delete', old.rowid, old.title, old.content); "
+        "INSERT INTO post_search (rowid, title, content) "
+        "VALUES (new.rowid, new.title, new.content); END",
+    ],
+}
+
+
+@event.listens_for(Post.__table__, "after_create")
+def _create_search_index(target: Table, connection: Connection, **kwargs: Any) -> None:
+    for statement in POST_SEARCH_DDL.get(connection.dialect.name, []):
+        connection.exec_driver_sql(statement)
+
+
+@event.listens_for(Post.__table__, "after_drop")
+def _drop_search_index(target: Table, connection: Connection, **kwargs: Any) -> None:
+    if connection.dialect.name == "sqlite":
+        connection.exec_driver_sql("DROP TABLE IF EXISTS post_search")
@@ -0,0 +1,104 @@
+"""
+Query plans of the statements run on an engine.
+
+`capture_statements` records the statements run while it is active, with the
+parameters sent to the driver. `explain` asks the database how it plans one
+of them, with `EXPLAIN (FORMAT JSON)` on PostgreSQL and `EXPLAIN QUERY PLAN`
+on SQLite, and reports the tables it reads in full and, on PostgreSQL only,
+its estimated cost.
+"""
+
+import json
+import re
+from collections.abc import Collection, Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any
+
+from sqlalchemy import Connection, Engine, event
+
+# "SCAN post", "SCAN TABLE post" before SQLite 3.36, without an index in
+# the rest of the line, e.g. "USING COVERING INDEX"
+_SQLITE_SCAN = re.compile(r"^SCAN (?:TABLE )?(\w+)(.*)$")
+
+
+@dataclass(frozen=True)
+class CapturedStatement:
+    sql: str
+    # As sent to the driver, after SQLAlchemy processed them
+    parameters: Any
+
+
+@dataclass
+class QueryPlan:
+    statement: CapturedStatement
+    # Tables read row by row, without an index
+    full_scans: list[str] = field(default_factory=list)
+    # Planner estimate of the whole statement, in PostgreSQL cost units
+    cost: float | None = None
+
+
+@contextmanager
+def capture_statements(engine: Engine) -> Iterator[list[CapturedStatement]]:
+    """Statements run on `engine` in the block, except executemany batches."""
+    statements: list[CapturedStatement] = []
+
+    def before_cursor_execute(
+        statement: str, parameters: Any, executemany: bool, **kwargs: Any
+    ) -> None:
+        if not executemany:
+            statements.append(CapturedStatement(statement, parameters))
+
+    event.listen(engine, "before_cursor_execute", before_cursor_execute, named=True)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", before_cursor_execute)
+
+
+def explain(
+    connection: Connection, statement: CapturedStatement, tables: Collection[str]
+) -> QueryPlan:
+    """
+    Plan of `statement`, without running it.
+
+    Only scans of `tables` count, not those of subqueries or virtual tables,
+    e.g. the full-text index of SQLite.
+    """
+    if connection.dialect.name == "postgresql":
+        return _explain_postgresql(connection, statement, tables)
+    return _explain_sqlite(connection, statement, tables)
+
+
+def _explain_postgresql(
+    connection: Connection, statement: CapturedStatement, tables: Collection[str]
+) -> QueryPlan:
+    result = connection.exec_driver_sql(
+        f"EXPLAIN (FORMAT JSON) {statement.sql}", statement.parameters
+    ).scalar_one()
+    # psycopg decodes json columns, other drivers may not
+    root = (json.loads(result) if isinstance(result, str) else result)[0]["Plan"]
+
+    full_scans = []
+    nodes = [root]
+    while nodes:
+        node = nodes.pop()
+        if node["Node Type"] == "Seq Scan" and node["Relation Name"] in tables:
+            full_scans.append(node["Relation Name"])
+        nodes.extend(node.get("Plans", []))
+    return QueryPlan(statement, full_scans=full_scans, cost=root["Total Cost"])
+
+
+def _explain_sqlite(
+    connection: Connection, statement: CapturedStatement, tables: Collection[str]
+) -> QueryPlan:
+    rows = connection.exec_driver_sql(
+        f"EXPLAIN QUERY PLAN {statement.sql}", statement.parameters
+    ).all()
+
+    full_scans = []
+    for row in rows:
+        match = _SQLITE_SCAN.match(row.detail)
+        if match and match[1] in tables and "INDEX" not in match[2]:
+            full_scans.append(match[1])
+    return QueryPlan(statement, full_scans=full_scans)
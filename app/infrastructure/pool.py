@@ -0,0 +1,126 @@
+"""
+Connection pool configuration and instrumentation.
+
+The instrumented pools time how long callers wait for a connection and count
+the waits that end in a timeout. Pool events keep track of checkouts,
+checked-out connections, new connections and invalidations, so exhaustion
+shows up in the stats before requests start failing.
+"""
+
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any
+
+from sqlalchemy import event, exc
+from sqlalchemy.pool import (
+    AsyncAdaptedQueuePool,
+    ConnectionPoolEntry,
+    PoolProxiedConnection,
+    QueuePool,
+)
+
+
+@dataclass(frozen=True)
+class PoolOptions:
+    """Engine pool arguments, SQLAlchemy defaults unless configured."""
+
+    size: int = 5
+    max_overflow: int = 10
+    timeout: float = 30.0
+    recycle: int = -1
+    pre_ping: bool = False
+    use_lifo: bool = False
+
+    def engine_options(self) -> dict[str, Any]:
+        return {
+            "pool_size": self.size,
+            "max_overflow": self.max_overflow,
+            "pool_timeout": self.timeout,
+            "pool_recycle": self.recycle,
+            "pool_pre_ping": self.pre_ping,
+            "pool_use_lifo": self.use_lifo,
+        }
+
+
+@dataclass
+class PoolStats:
+    checkouts: int = 0
+    checked_out: int = 0
+    timeouts: int = 0
+    connects: int = 0
+    invalidations: int = 0
+    # Seconds spent waiting for a connection, over all checkouts
+    wait_time: float = 0.0
+    max_wait_time: float = 0.0
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def add(self, counter: str, value: int = 1) -> None:
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + value)
+
+    def record_wait(self, elapsed: float) -> None:
+        with self._lock:
+            self.wait_time += elapsed
+            self.max_wait_time = max(self.max_wait_time, elapsed)
+
+
+class InstrumentedQueuePool(QueuePool):
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.stats = PoolStats()
+
+    def recreate(self) -> QueuePool:
+        # `Engine.dispose` replaces the pool; listeners are carried over too
+        pool = super().recreate()
+        if isinstance(pool, InstrumentedQueuePool):
+            pool.stats = self.stats
+        return pool
+
+    def _do_get(self) -> ConnectionPoolEntry:
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            self.stats.add("timeouts")
+            raise
+        finally:
+            self.stats.record_wait(time.perf_counter() - start)
+
+
+class InstrumentedAsyncAdaptedQueuePool(InstrumentedQueuePool, AsyncAdaptedQueuePool):
+    pass
+
+
+def instrument(pool: InstrumentedQueuePool) -> None:
+    """Count checkouts, connections and invalidations of a pool in its stats."""
+    stats = pool.stats
+
+    @event.listens_for(pool, "checkout")
+    def on_checkout(
+        dbapi_connection: Any,
+        connection_record: ConnectionPoolEntry,
+        connection_proxy: PoolProxiedConnection,
+    ) -> None:
+        stats.add("checkouts")
+        stats.add("checked_out")
+
+    @event.listens_for(pool, "checkin")
+    def on_checkin(
+        dbapi_connection: Any, connection_record: ConnectionPoolEntry
+    ) -> None:
+        stats.add("checked_out", -1)
+
+    @event.listens_for(pool, "connect")
+    def on_connect(
+        dbapi_connection: Any, connection_record: ConnectionPoolEntry
+    ) -> None:
+        stats.add("connects")
+
+    @event.listens_for(pool, "invalidate")
+    def on_invalidate(
+        dbapi_connection: Any,
+        connection_record: ConnectionPoolEntry,
+        exception: BaseException | None,
+    ) -> None:
+        stats.add("invalidations")
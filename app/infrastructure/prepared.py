@@ -0,0 +1,52 @@
+"""
+Server-side prepared statements.
+
+psycopg prepares a statement on the server once a connection has run it
+`threshold` times, then sends only its parameters, so the server skips
+parsing and planning. Together with the statements the repositories build
+once, hot queries run the same prepared statement on every request.
+
+Transaction-mode poolers (e.g. PgBouncer before 1.21) do not keep prepared
+statements across transactions: disable them there. Drivers other than
+psycopg ignore these options.
+"""
+
+from dataclasses import dataclass
+from typing import Any
+
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+from sqlalchemy.pool import ConnectionPoolEntry, Pool
+
+
+@dataclass(frozen=True)
+class PreparedStatementOptions:
+    """psycopg defaults unless configured."""
+
+    # Executions of a statement before it is prepared: 0 prepares at once,
+    # None never prepares
+    threshold: int | None = 5
+    # Prepared statements kept per connection, least recently used first out
+    max_prepared: int = 100
+
+    def connect_args(self, database_uri: str) -> dict[str, Any]:
+        if not self._applies(database_uri):
+            return {}
+        return {"prepare_threshold": self.threshold}
+
+    def configure(self, pool: Pool, database_uri: str) -> None:
+        """Apply the options that psycopg only takes on open connections."""
+        if not self._applies(database_uri):
+            return
+
+        @event.listens_for(pool, "connect")
+        def on_connect(
+            dbapi_connection: Any, connection_record: ConnectionPoolEntry
+        ) -> None:
+            # Async engines wrap the psycopg connection in an adapter
+            connection = getattr(dbapi_connection, "driver_connection", None)
+            (connection or dbapi_connection).prepared_max = self.max_prepared
+
+    @staticmethod
+    def _applies(database_uri: str) -> bool:
+        return make_url(database_uri).get_driver_name() == "psycopg"
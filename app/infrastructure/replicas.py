@@ -0,0 +1,72 @@
+"""
+Read replicas.
+
+`RoutingSession` sends the reads of a session to one replica and everything
+else to the primary. Once the session writes, its later reads go to the
+primary as well, so it always reads its own writes.
+"""
+
+import itertools
+import threading
+from collections.abc import Sequence
+from typing import Any
+
+from sqlalchemy import Connection, Delete, Engine, Insert, Update
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import QueuePool
+from sqlalchemy.sql import ClauseElement
+
+from app.core.config import ReplicaSelection
+
+
+class ReplicaSet:
+    def __init__(
+        self,
+        engines: Sequence[Engine],
+        selection: ReplicaSelection = ReplicaSelection.ROUND_ROBIN,
+    ) -> None:
+        if not engines:
+            raise ValueError("A replica set needs at least one engine.")
+        self.engines = list(engines)
+        self.selection = selection
+        self._cycle = itertools.cycle(self.engines)
+        self._lock = threading.Lock()
+
+    def choose(self) -> Engine:
+        if self.selection == ReplicaSelection.LEAST_CONNECTIONS:
+            return min(self.engines, key=self._checked_out)
+        with self._lock:
+            return next(self._cycle)
+
+    @staticmethod
+    def _checked_out(engine: Engine) -> int:
+        pool = engine.pool
+        return pool.checkedout() if isinstance(pool, QueuePool) else 0
+
+
+class RoutingSession(Session):
+    def __init__(
+        self, *args: Any, replicas: ReplicaSet | None = None, **kwargs: Any
+    ) -> None:
+        super().__init__(*args, **kwargs)
+        self.replicas = replicas
+        self.wrote = False
+        # Chosen on the first read, then kept for consistent reads
+        self._replica: Engine | None = None
+
+    def get_bind(
+        self,
+        mapper: Any = None,
+        clause: ClauseElement | None = None,
+        **kwargs: Any,
+    ) -> Engine | Connection:
+        if self._flushing or isinstance(clause, Insert | Update | Delete):
+            self.wrote = True
+
+        # Statement-less lookups (e.g. of the dialect) get the primary
+        if self.replicas is None or self.wrote or clause is None:
+            return super().get_bind(mapper, clause=clause, **kwargs)
+
+        if self._replica is None:
+            self._replica = self.replicas.choose()
+        return self._replica
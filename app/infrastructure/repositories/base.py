@@ -1,26 +1,224 @@
+import operator
 import uuid
-from typing import Any, Generic, TypeVar
+from collections.abc import (
+    AsyncIterator,
+    Callable,
+    Collection,
+    Iterator,
+    Mapping,
+    Sequence,
+)
+from functools import cache, partial
+from itertools import batched
+from typing import Any, ClassVar, Generic, TypeVar, cast
 
-from sqlalchemy import Select, func, select
+from anyio import to_thread
+from pydantic import BaseModel, TypeAdapter, ValidationError, create_model
+from pydantic.fields import FieldInfo
+from pydantic_core import CoreSchema, SchemaValidator, core_schema
+from sqlalchemy import (
+    BindParameter,
+    ColumnElement,
+    Insert,
+    Integer,
+    Select,
+    Table,
+    and_,
+    any_,
+    bindparam,
+    func,
+    insert,
+    inspect,
+    or_,
+    select,
+    text,
+    tuple_,
+)
+from sqlalchemy.dialects import postgresql, sqlite
 from sqlalchemy.exc import IntegrityError
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import (
+    InstrumentedAttribute,
+    Load,
+    RelationshipProperty,
+    Session,
+    load_only,
+)
+from sqlalchemy.orm.exc import StaleDataError
+from sqlalchemy.sql.base import Executable, ExecutableOption
 
 from app.domain.models import (
+    BulkItemResult,
+    CountMode,
     Create_T_contra,
     Domain_T,
+    DomainModel,
     DomainPagination,
+    FieldFilter,
+    FilterOp,
     PaginationParams,
+    QuerySpec,
+    SortOrder,
     Update_T_contra,
+    VersionRow,
+    version_token,
 )
-from app.domain.repository import AbstractRepository
+from app.domain.repository import AbstractRepository, AsyncAbstractRepository
+from app.infrastructure.cache import LRUCache
+from app.infrastructure.cursor import decode_cursor, encode_cursor
 from app.infrastructure.exceptions import (
     DatabaseError,
     EntityAlreadyExistsError,
+    EntityConflictError,
     EntityNotFoundError,
+    InvalidQueryError,
 )
 from app.infrastructure.models import Base
 
 Model_T = TypeVar("Model_T", bound=Base)
+DomainModel_T = TypeVar("DomainModel_T", bound=DomainModel)
+R = TypeVar("R")
+Statement_T = TypeVar("Statement_T", bound=Executable)
+Statement_Row_T = TypeVar("Statement_Row_T", bound=tuple[Any, ...])
+
+
+# Column of an ordering and whether it is descending
+SortColumn = tuple[InstrumentedAttribute[Any], bool]
+
+_OPERATORS: dict[FilterOp, Callable[[Any, Any], ColumnElement[bool]]] = {
+    FilterOp.EQ: operator.eq,
+    FilterOp.LT: operator.lt,
+    FilterOp.LTE: operator.le,
+    FilterOp.GT: operator.gt,
+    FilterOp.GTE: operator.ge,
+}
+
+
+@cache
+def _column_keys(model: type[Base]) -> list[str]:
+    """Column attributes, all mapped to domain fields."""
+    return [prop.key for prop in inspect(model).column_attrs]
+
+
+@cache
+def _projected_keys(model: type[Base], fields: frozenset[str]) -> list[str]:
+    """Column attributes loaded for a sparse fieldset, in column order."""
+    mapper = inspect(model)
+    keys = fields | {"id", "version"}
+    for relationship in mapper.relationships:
+        if relationship.key in fields:
+            # Loaders of the relationship read these columns of the row
+            keys |= {
+                mapper.get_property_by_column(column).key
+                for column in relationship.local_columns
+            }
+    return [key for key in _column_keys(model) if key in keys]
+
+
+@cache
+def _projection(
+    schema: type[DomainModel_T], fields: frozenset[str]
+) -> type[DomainModel_T]:
+    """
+    Subclass of `schema` for objects with only `fields` loaded.
+
+    The required fields left out default to None instead, so objects of a
+    sparse fieldset still build. Others keep their defaults.
+    """
+    omitted: dict[str, Any] = {
+        name: (cast(Any, field.annotation) | None, None)
+        for name, field in schema.model_fields.items()
+        if field.is_required() and name not in fields | {"id", "version"}
+    }
+    if not omitted:
+        return schema
+    return create_model(
+        schema.__name__, __base__=schema, __module__=schema.__module__, **omitted
+    )
+
+
+@cache
+def _column_getter(model: type[Base]) -> Callable[[Mapping[str, Any]], tuple[Any, ...]]:
+    """Values of the column attributes in the state of a row, in key order."""
+    keys = _column_keys(model)
+    getter = operator.itemgetter(*keys)
+    if len(keys) == 1:
+        return lambda state: (getter(state),)
+    return getter
+
+
+@cache
+def _type_adapter(python_type: type[Any]) -> TypeAdapter[Any]:
+    return TypeAdapter(python_type)
+
+
+@cache
+def _trusted_validator(schema: type[BaseModel]) -> SchemaValidator:
+    """
+    Validator of `schema` that takes every value as is, compiled once.
+
+    It only fills defaults: no coercion, constraint or validator runs, and the
+    object is built in pydantic-core, as by `schema(**values)`.
+    """
+    fields = {
+        name: core_schema.model_field(_trusted_field(field))
+        for name, field in schema.model_fields.items()
+    }
+    return SchemaValidator(
+        core_schema.model_schema(schema, core_schema.model_fields_schema(fields))
+    )
+
+
+def _trusted_field(field: FieldInfo) -> CoreSchema:
+    value = core_schema.any_schema()
+    if field.is_required():
+        return value
+    if field.default_factory is not None:
+        return core_schema.with_default_schema(
+            value, default_factory=field.default_factory
+        )
+    return core_schema.with_default_schema(value, default=field.default)
+
+
+def _filter_param(index: int, condition: FieldFilter) -> str:
+    return f"filter_{index}_{condition.field}_{condition.op}"
+
+
+def _after(
+    sort_columns: Sequence[SortColumn], values: Sequence[BindParameter[Any]]
+) -> ColumnElement[bool]:
+    """Rows following the cursor `values` in the order of `sort_columns`."""
+    columns = [column for column, _ in sort_columns]
+    directions = {descending for _, descending in sort_columns}
+    if directions == {False}:
+        # Row value comparisons can read a single index range
+        return tuple_(*columns) > tuple_(*values)
+    if directions == {True}:
+        return tuple_(*columns) < tuple_(*values)
+
+    # Mixed directions: after on the first column that differs
+    clauses = []
+    for i, (column, descending) in enumerate(sort_columns):
+        ties = [tie == value for tie, value in zip(columns[:i], values, strict=False)]
+        step = column < values[i] if descending else column > values[i]
+        clauses.append(and_(*ties, step))
+    return or_(*clauses)
+
+
+def _options_key(kwargs: Mapping[str, Any]) -> tuple[Any, ...]:
+    """
+    Hashable form of the loading options of a call, e.g. `include`.
+
+    Keys statements and cached entities. Options left to None load the same
+    as absent ones, so they share a key.
+    """
+    return tuple(
+        sorted(
+            (key, frozenset(value) if isinstance(value, set | list) else value)
+            for key, value in kwargs.items()
+            if value is not None
+        )
+    )
 
 
 class SQLAlchemyRepositoryBase(
@@ -33,33 +231,180 @@ class SQLAlchemyRepositoryBase(
     ],
 ):
     model: type[Model_T]
+    # Named sets of loader options, selected per call with `include`
+    loading_profiles: ClassVar[Mapping[str, Sequence[ExecutableOption]]] = {}
+    default_include: ClassVar[str | None] = None
+    # Fields clients may filter on, with their operators, and sort by. Only
+    # fields with an index belong here, so that no request scans the table.
+    filterable_fields: ClassVar[Mapping[str, Collection[FilterOp]]] = {}
+    sortable_fields: ClassVar[Collection[str]] = ()
+    count_mode: CountMode = CountMode.EXACT
+    bulk_chunk_size: ClassVar[int] = 1000
+    # Shared by every repository instance, keyed by database URL and table
+    count_cache: LRUCache[tuple[str, str], int] = LRUCache(maxsize=256, ttl=30.0)
+    # Statements of the hot queries, built once per repository class and
+    # loading options. Values are bound at execution, so SQLAlchemy also
+    # reuses the compiled form without computing a new cache key.
+    statement_cache: LRUCache[tuple[Any, ...], Executable] = LRUCache(maxsize=1024)
 
-    def __init__(self, session: Session):
+    def __init__(self, session: Session, trusted_mapping: bool = False):
         self.session = session
+        # Rows come from our own database and were validated on the way in,
+        # so domain objects can be built without checking them again
+        self.trusted_mapping = trusted_mapping
 
     def get_all(
-        self, pagination: PaginationParams | None = None, **kwargs: Any
+        self,
+        pagination: PaginationParams | None = None,
+        spec: QuerySpec | None = None,
+        **kwargs: Any,
     ) -> DomainPagination[Domain_T]:
-        count_stmt = select(func.count()).select_from(self.model)
-        total = self.session.scalar(count_stmt) or 0
+        count_mode = self._count_mode(pagination)
+        keyset = pagination is not None and pagination.after is not None
+        window = count_mode == CountMode.WINDOW and not keyset
+        filter_params = self._filter_params(spec)
 
-        stmt = select(self.model)
-        stmt = self._apply_pagination(stmt=stmt, pagination=pagination)
-        stmt = self._apply_loading_options(stmt=stmt, **kwargs)
+        def build() -> Select[Any]:
+            stmt = self._apply_loading_options(stmt=select(self.model), **kwargs)
+            stmt = self._apply_filters(stmt, spec)
+            stmt = self._paginate(stmt=stmt, pagination=pagination, spec=spec)
+            if window:
+                return stmt.add_columns(func.count().over())
+            if keyset:
+                # Sort values of the rows, for the cursor of the next page
+                sort_columns = self._sort_columns(spec)
+                return stmt.add_columns(*(column for column, _ in sort_columns))
+            return stmt
+
+        key = (
+            "get_all",
+            window,
+            self._page_shape(pagination),
+            *self._spec_key(spec, filter_params),
+            *_options_key(kwargs),
+        )
+        stmt = self._cached_statement(key, build)
+        params = self._page_params(pagination, spec) | filter_params
+        rows = self.session.execute(stmt, params).all()
+
+        has_more = pagination is not None and len(rows) > pagination.limit
+        if pagination is not None:
+            rows = rows[: pagination.limit]
+        items = [self._to_domain(row[0], kwargs.get("fields")) for row in rows]
 
-        results = self.session.scalars(stmt)
-        items = [self._to_domain(result) for result in results]
+        total = rows[0][1] if window and rows else None
+        if total is None and count_mode != CountMode.NONE:
+            total = self._count(count_mode, spec)
 
-        return DomainPagination(total=total, limit=len(items), items=items)
+        next_cursor = None
+        if keyset and has_more:
+            next_cursor = encode_cursor(list(rows[-1][1:]))
+
+        return DomainPagination(
+            total=total,
+            limit=len(items),
+            items=items,
+            has_more=has_more,
+            next_cursor=next_cursor,
+        )
 
     def get_by_id(self, entity_id: uuid.UUID, /, **kwargs: Any) -> Domain_T:
-        stmt = select(self.model).where(self.model.id == entity_id)
-        stmt = self._apply_loading_options(stmt=stmt, **kwargs)
-        if entity := self.session.scalar(stmt):
-            return self._to_domain(entity)
+        stmt = self._cached_statement(
+            ("get_by_id", *_options_key(kwargs)),
+            lambda: self._apply_loading_options(
+                stmt=select(self.model).where(self.model.id == bindparam("entity_id")),
+                **kwargs,
+            ),
+        )
+        if entity := self.session.scalar(stmt, {"entity_id": entity_id}):
+            return self._to_domain(entity, kwargs.get("fields"))
 
         raise EntityNotFoundError(self.model.__name__, str(entity_id))
 
+    def get_many(
+        self, entity_ids: Sequence[uuid.UUID], /, **kwargs: Any
+    ) -> list[Domain_T | None]:
+        """
+        Entities of `entity_ids`, in the same order, None for the missing ones.
+
+        Relationships load eagerly as for `get_by_id`, in one statement per
+        `bulk_chunk_size` distinct ids plus one per selectin-loaded relation.
+        """
+        entities = self._get_by_ids(set(entity_ids), **kwargs)
+        return [entities.get(entity_id) for entity_id in entity_ids]
+
+    def iter_all(
+        self, batch_size: int = 1000, **kwargs: Any
+    ) -> Iterator[list[Domain_T]]:
+        """
+        Every entity, in batches read through a server-side cursor.
+
+        Unlike paging through `get_all`, nothing is counted or skipped, and
+        only one batch is held in memory at a time.
+        """
+        stmt = select(self.model).order_by(*self._keyset_columns())
+        stmt = self._apply_loading_options(stmt=stmt, **kwargs)
+        result = self.session.scalars(stmt.execution_options(yield_per=batch_size))
+        for partition in result.partitions():
+            yield [
+                self._to_domain(entity, kwargs.get("fields")) for entity in partition
+            ]
+
+    def get_version(self, entity_id: uuid.UUID, /, **kwargs: Any) -> str:
+        """
+        Token of the entity `get_by_id` would return with the same options.
+
+        Reads only the versions of the entity and of the rows it embeds.
+        """
+        stmt = self._cached_statement(
+            ("get_version",),
+            lambda: select(self.model.version).where(
+                self.model.id == bindparam("entity_id")
+            ),
+        )
+        version = self.session.scalar(stmt, {"entity_id": entity_id})
+        if version is None:
+            raise EntityNotFoundError(self.model.__name__, str(entity_id))
+        related = self._related_versions([entity_id], **kwargs)
+        return version_token([(entity_id, version)], related)
+
+    def get_page_version(
+        self,
+        pagination: PaginationParams | None = None,
+        spec: QuerySpec | None = None,
+        **kwargs: Any,
+    ) -> str:
+        """
+        Token of the page `get_all` would return with the same options.
+
+        Reads only the ids and versions of the page rows, the rows embedded in
+        them and the total, without loading or mapping the entities.
+        """
+        count_mode = self._count_mode(pagination)
+        filter_params = self._filter_params(spec)
+        stmt = self._cached_statement(
+            (
+                "get_page_version",
+                self._page_shape(pagination),
+                *self._spec_key(spec, filter_params),
+            ),
+            lambda: self._paginate(
+                stmt=self._apply_filters(select(self.model), spec),
+                pagination=pagination,
+                spec=spec,
+            ).with_only_columns(self.model.id, self.model.version),
+        )
+        params = self._page_params(pagination, spec) | filter_params
+        rows = self.session.execute(stmt, params).tuples().all()
+        has_more = pagination is not None and len(rows) > pagination.limit
+        if pagination is not None:
+            rows = rows[: pagination.limit]
+        total = None
+        if count_mode != CountMode.NONE:
+            total = self._count(count_mode, spec)
+        related = self._related_versions([entity_id for entity_id, _ in rows], **kwargs)
+        return version_token(rows, related, total, has_more)
+
     def create(self, data: Create_T_contra, /) -> Domain_T:
         db_model = self.model(**data.model_dump())
         self.session.add(db_model)
@@ -70,7 +415,29 @@ class SQLAlchemyRepositoryBase(
                 raise EntityAlreadyExistsError(self.model.__name__) from err
             raise DatabaseError("insert", str(err)) from err
 
-        return self._to_domain(db_model)
+        self._invalidate_count()
+        return self.get_by_id(db_model.id)
+
+    def create_many(
+        self, data: Sequence[Create_T_contra], /
+    ) -> list[BulkItemResult[Domain_T]]:
+        entity_ids = [uuid.uuid4() for _ in data]
+        inserted_ids = self._insert_many(dict(zip(entity_ids, data, strict=True)))
+        try:
+            self.session.commit()
+        except IntegrityError as err:
+            self.session.rollback()
+            raise DatabaseError("insert", str(err)) from err
+
+        self._invalidate_count()
+        entities = self._get_by_ids(inserted_ids)
+        conflict = str(EntityAlreadyExistsError(self.model.__name__))
+        return [
+            BulkItemResult(index=index, item=entities[entity_id])
+            if entity_id in entities
+            else BulkItemResult(index=index, error=conflict)
+            for index, entity_id in enumerate(entity_ids)
+        ]
 
     def update(self, entity_id: uuid.UUID, data: Update_T_contra, /) -> Domain_T:
         entity = self.session.get(self.model, entity_id)
@@ -81,8 +448,8 @@ class SQLAlchemyRepositoryBase(
         for key, value in entity_data.items():
             setattr(entity, key, value)
 
-        self.session.commit()
-        return self._to_domain(entity)
+        self._commit_versioned(entity_id)
+        return self.get_by_id(entity_id)
 
     def delete(self, entity_id: uuid.UUID, /) -> None:
         entity = self.session.get(self.model, entity_id)
@@ -90,23 +457,471 @@ class SQLAlchemyRepositoryBase(
             raise EntityNotFoundError(self.model.__name__, str(entity_id))
 
         self.session.delete(entity)
-        self.session.commit()
+        self._commit_versioned(entity_id)
+        self._invalidate_count()
+
+    def _commit_versioned(self, entity_id: uuid.UUID) -> None:
+        """Commit a write to a loaded row, which fails if its version moved since."""
+        try:
+            self.session.commit()
+        except StaleDataError as err:
+            self.session.rollback()
+            raise EntityConflictError(self.model.__name__, str(entity_id)) from err
+
+    def _insert_many(self, data: Mapping[uuid.UUID, Create_T_contra]) -> set[uuid.UUID]:
+        """Insert rows in chunks, skipping those that violate a unique constraint."""
+        rows = [
+            self._to_row(item) | {"id": entity_id} for entity_id, item in data.items()
+        ]
+        stmt = self._insert_ignoring_conflicts().returning(self.model.id)
+        inserted_ids: set[uuid.UUID] = set()
+        for chunk in batched(rows, self.bulk_chunk_size):
+            inserted_ids.update(self.session.scalars(stmt, chunk))
+        return inserted_ids
+
+    def _insert_ignoring_conflicts(
+        self, table: type[Base] | Table | None = None
+    ) -> Insert:
+        table = self.model if table is None else table
+        match self.session.get_bind().dialect.name:
+            case "postgresql":
+                return postgresql.insert(table).on_conflict_do_nothing()
+            case "sqlite":
+                return sqlite.insert(table).on_conflict_do_nothing()
+            case _:
+                return insert(table)
+
+    def _get_by_ids(
+        self, entity_ids: set[uuid.UUID], /, **kwargs: Any
+    ) -> dict[uuid.UUID, Domain_T]:
+        dialect = self.session.get_bind().dialect.name
+        stmt = self._cached_statement(
+            ("get_by_ids", dialect, *_options_key(kwargs)),
+            lambda: self._apply_loading_options(
+                stmt=select(self.model).where(self._id_in(dialect)), **kwargs
+            ),
+        )
+        entities = {}
+        for chunk in batched(entity_ids, self.bulk_chunk_size):
+            for entity in self.session.scalars(stmt, {"entity_ids": list(chunk)}):
+                entities[entity.id] = self._to_domain(entity, kwargs.get("fields"))
+        return entities
+
+    def _id_in(self, dialect: str) -> ColumnElement[bool]:
+        """Condition on ids in the `entity_ids` parameter, a list."""
+        if dialect == "postgresql":
+            # One array parameter: the same SQL, and prepared statement, for
+            # any number of ids
+            ids_type = postgresql.ARRAY(self.model.id.type)
+            return self.model.id == any_(bindparam("entity_ids", type_=ids_type))
+        return self.model.id.in_(bindparam("entity_ids", expanding=True))
+
+    def _related_versions(
+        self, entity_ids: Sequence[uuid.UUID], **kwargs: Any
+    ) -> list[VersionRow]:
+        """
+        Versions of the rows the entities embed when loaded with `kwargs`.
+
+        Same as their `embedded_versions` once loaded.
+        """
+        return []
+
+    def _to_row(self, data: Create_T_contra, /) -> dict[str, Any]:
+        return data.model_dump()
+
+    def _count_mode(self, pagination: PaginationParams | None) -> CountMode:
+        if pagination is not None and pagination.count is not None:
+            return pagination.count
+        return self.count_mode
+
+    def _count(self, count_mode: CountMode, spec: QuerySpec | None = None) -> int:
+        # Estimates and cached counts are of the whole table
+        if self._filter_params(spec):
+            return self._exact_count(spec)
+
+        if count_mode == CountMode.ESTIMATE:
+            estimate = self._estimate_count()
+            if estimate is not None:
+                return estimate
+
+        if count_mode != CountMode.CACHED:
+            return self._exact_count()
+
+        key = self._count_cache_key()
+        total = self.count_cache.get(key)
+        if total is None:
+            total = self._exact_count()
+            self.count_cache.set(key, total)
+        return total
+
+    def _exact_count(self, spec: QuerySpec | None = None) -> int:
+        params = self._filter_params(spec)
+        count_stmt = self._cached_statement(
+            ("count", tuple(sorted(params))),
+            lambda: self._apply_filters(
+                select(func.count()).select_from(self.model), spec
+            ),
+        )
+        return self.session.scalar(count_stmt, params) or 0
 
-    def _to_domain(self, model: Model_T, /) -> Domain_T:
+    def _estimate_count(self) -> int | None:
+        if self.session.get_bind().dialect.name != "postgresql":
+            return None
+
+        # reltuples is -1 until the table has been vacuumed or analyzed
+        estimate_stmt = text(
+            "SELECT reltuples::bigint FROM pg_class "
+            "WHERE oid = CAST(:table AS regclass)"
+        )
+        estimate = self.session.scalar(
+            estimate_stmt, {"table": self.model.__tablename__}
+        )
+        return estimate if estimate is not None and estimate >= 0 else None
+
+    def _count_cache_key(self) -> tuple[str, str]:
+        return self._database_url(), self.model.__tablename__
+
+    def _database_url(self) -> str:
+        # Not the engine itself, which the class-level caches would keep alive
+        return self.session.get_bind().engine.url.render_as_string()
+
+    def _invalidate_count(self) -> None:
+        self.count_cache.delete(self._count_cache_key())
+
+    def _filter_params(self, spec: QuerySpec | None) -> dict[str, Any]:
+        """
+        Values bound by the clauses of `_apply_filters`, checked and converted.
+
+        Their names also key the cached statements, so specs binding the
+        same parameters must build the same clauses.
+        """
+        if spec is None:
+            return {}
+
+        params = {}
+        for i, condition in enumerate(spec.filters):
+            if condition.op not in self.filterable_fields.get(condition.field, ()):
+                raise InvalidQueryError(
+                    condition.field, f"filter with {condition.op} on"
+                )
+            column = getattr(self.model, condition.field)
+            adapter = _type_adapter(column.type.python_type)
+            try:
+                value = adapter.validate_python(condition.value)
+            except ValidationError as err:
+                raise InvalidQueryError(
+                    condition.field, f"compare {condition.value!r} with"
+                ) from err
+            params[_filter_param(i, condition)] = value
+        return params
+
+    def _apply_filters(
+        self, stmt: Select[Statement_Row_T], spec: QuerySpec | None
+    ) -> Select[Statement_Row_T]:
+        """`stmt` restricted to the entities matching `spec`."""
+        if spec is None:
+            return stmt
+
+        for i, condition in enumerate(spec.filters):
+            column = getattr(self.model, condition.field)
+            param: BindParameter[Any] = bindparam(
+                _filter_param(i, condition), type_=column.type
+            )
+            stmt = stmt.where(_OPERATORS[condition.op](column, param))
+        return stmt
+
+    @staticmethod
+    def _spec_key(
+        spec: QuerySpec | None, filter_params: Mapping[str, Any]
+    ) -> tuple[Any, ...]:
+        """Shape of the statements of `spec`, its filter parameters and order."""
+        sort = tuple((field.field, field.order) for field in spec.sort) if spec else ()
+        return tuple(sorted(filter_params)), sort
+
+    def _sort_columns(self, spec: QuerySpec | None) -> list[SortColumn]:
+        """Order requested by `spec`, then the keyset columns to make it total."""
+        columns: list[SortColumn] = []
+        for field in spec.sort if spec else []:
+            if field.field not in self.sortable_fields:
+                raise InvalidQueryError(field.field, "sort by")
+            descending = field.order == SortOrder.DESC
+            columns.append((getattr(self.model, field.field), descending))
+
+        # Keyset columns follow the last direction, so that an index on the
+        # fields then the id serves the whole order in a single scan
+        descending = columns[-1][1] if columns else False
+        keys = {column.key for column, _ in columns}
+        columns += [
+            (column, descending)
+            for column in self._keyset_columns()
+            if column.key not in keys
+        ]
+        return columns
+
+    def _keyset_columns(self) -> tuple[InstrumentedAttribute[Any], ...]:
+        """Unique, stable sort key used by keyset pagination."""
+        return (self.model.id,)
+
+    def _to_domain(
+        self, model: Model_T, /, fields: Collection[str] | None = None
+    ) -> Domain_T:
+        if self.trusted_mapping or fields is not None:
+            schema = self._projected_schema(self.schema, fields)
+            return self._build(schema, **self._column_values(model, fields))
         return self.schema.model_validate(model)
 
+    def _column_values(
+        self, model: Base, fields: Collection[str] | None = None
+    ) -> dict[str, Any]:
+        """Column attributes of a row, only those loaded for `fields` if given."""
+        if fields is not None:
+            keys = _projected_keys(type(model), frozenset(fields))
+            return {key: getattr(model, key) for key in keys}
+
+        keys = _column_keys(type(model))
+        if not self.trusted_mapping:
+            return {key: getattr(model, key) for key in keys}
+
+        # Loaded values live in the instance dict: reading it skips the
+        # instrumented attributes, which only matter for values not loaded
+        try:
+            return dict(
+                zip(keys, _column_getter(type(model))(model.__dict__), strict=True)
+            )
+        except KeyError:
+            return {key: getattr(model, key) for key in keys}
+
+    @staticmethod
+    def _projected_schema(
+        schema: type[DomainModel_T], fields: Collection[str] | None
+    ) -> type[DomainModel_T]:
+        """Schema of the objects loaded for `fields`, all fields if None."""
+        if fields is None:
+            return schema
+        return _projection(schema, frozenset(fields))
+
+    def _build(self, schema: type[DomainModel_T], /, **values: Any) -> DomainModel_T:
+        """Build a domain object, skipping validation for trusted mappings."""
+        if self.trusted_mapping:
+            entity: DomainModel_T = _trusted_validator(schema).validate_python(values)
+            return entity
+        return schema(**values)
+
     def _apply_loading_options(
-        self, stmt: Select[tuple[Model_T]]
+        self,
+        stmt: Select[tuple[Model_T]],
+        include: str | None = None,
+        fields: Collection[str] | None = None,
     ) -> Select[tuple[Model_T]]:
-        return stmt
+        return stmt.options(*self._loading_options(include, fields))
+
+    def _loading_options(
+        self, include: str | None = None, fields: Collection[str] | None = None
+    ) -> list[ExecutableOption]:
+        include = include or self.default_include
+        options = list(self.loading_profiles[include]) if include else []
+        if fields is not None:
+            # Sparse fieldset: relationships left out are not loaded, as with
+            # a narrower include, and neither are columns
+            options = [
+                option
+                for option in options
+                if self._loaded_relationship(option) in fields
+            ]
+            keys = _projected_keys(self.model, frozenset(fields))
+            options.append(load_only(*(getattr(self.model, key) for key in keys)))
+        return options
+
+    def _loaded_relationships(
+        self, include: str | None = None, fields: Collection[str] | None = None
+    ) -> set[str | None]:
+        """Relationships loaded with the options `include` and `fields`."""
+        options = self._loading_options(include, fields)
+        return {self._loaded_relationship(option) for option in options}
+
+    @staticmethod
+    def _loaded_relationship(option: ExecutableOption) -> str | None:
+        """First relationship along the path of a loader option."""
+        if isinstance(option, Load) and len(option.path) > 1:
+            attribute = option.path[1]
+            if isinstance(attribute, RelationshipProperty):
+                return attribute.key
+        return None
 
     @staticmethod
-    def _apply_pagination(
+    def _is_loaded(model: Base, key: str) -> bool:
+        """Whether an attribute was loaded, so reading it does not emit a query."""
+        # Loaded attributes live in the instance dict; checking it directly is
+        # much cheaper than building `inspect(model).unloaded` for every row
+        return key in model.__dict__
+
+    def _cached_statement(
+        self, key: tuple[Any, ...], build: Callable[[], Statement_T]
+    ) -> Statement_T:
+        """Statement of `key` for this repository class, built on first use."""
+        cache_key = (type(self), *key)
+        stmt = self.statement_cache.get(cache_key)
+        if stmt is None:
+            stmt = build()
+            self.statement_cache.set(cache_key, stmt)
+        return stmt  # type: ignore[return-value]
+
+    def _paginate(
+        self,
         stmt: Select[tuple[Model_T]],
         pagination: PaginationParams | None,
+        spec: QuerySpec | None = None,
     ) -> Select[tuple[Model_T]]:
+        """
+        Page of `stmt`, with the values of `_page_params` left as parameters.
+
+        Statements of pages with the same `_page_shape` and spec are the same.
+        """
+        sort_columns = self._sort_columns(spec)
+        order = [column.desc() if desc else column for column, desc in sort_columns]
+        if spec is not None and spec.sort:
+            stmt = stmt.order_by(*order)
         if pagination is None:
             return stmt
 
-        offset = (pagination.page - 1) * pagination.limit
-        return stmt.offset(offset).limit(pagination.limit)
+        # Fetch one extra row to know whether another page follows
+        limit = bindparam("limit", type_=Integer())
+        if pagination.after is None:
+            return stmt.offset(bindparam("offset")).limit(limit)
+
+        if pagination.after:
+            after: list[BindParameter[Any]] = [
+                bindparam(f"after_{i}", type_=column.type)
+                for i, (column, _) in enumerate(sort_columns)
+            ]
+            stmt = stmt.where(_after(sort_columns, after))
+        return stmt.order_by(None).order_by(*order).limit(limit)
+
+    @staticmethod
+    def _page_shape(pagination: PaginationParams | None) -> str:
+        if pagination is None:
+            return "all"
+        if pagination.after is None:
+            return "offset"
+        return "keyset" if pagination.after else "keyset_start"
+
+    def _page_params(
+        self, pagination: PaginationParams | None, spec: QuerySpec | None = None
+    ) -> dict[str, Any]:
+        if pagination is None:
+            return {}
+
+        params: dict[str, Any] = {"limit": pagination.limit + 1}
+        if pagination.after is None:
+            params["offset"] = (pagination.page - 1) * pagination.limit
+        elif pagination.after:
+            columns = [column for column, _ in self._sort_columns(spec)]
+            values = decode_cursor(pagination.after, columns)
+            params.update({f"after_{i}": value for i, value in enumerate(values)})
+        return params
+
+
+class AsyncSQLAlchemyRepositoryBase(
+    AsyncAbstractRepository[Domain_T, Create_T_contra, Update_T_contra],
+    Generic[
+        Model_T,
+        Domain_T,
+        Create_T_contra,
+        Update_T_contra,
+    ],
+):
+    """
+    Async counterpart of a SQLAlchemy repository.
+
+    Statements and mapping come from the sync `repository` class, so both stacks
+    share a single implementation. With an `AsyncSession`, each call runs on the
+    event loop through the async driver; with a sync `Session`, it runs in a
+    worker thread.
+    """
+
+    repository: type[
+        SQLAlchemyRepositoryBase[Model_T, Domain_T, Create_T_contra, Update_T_contra]
+    ]
+
+    def __init__(self, session: Session | AsyncSession, trusted_mapping: bool = False):
+        self.session = session
+        self.trusted_mapping = trusted_mapping
+
+    async def get_all(
+        self, pagination: PaginationParams | None = None, **kwargs: Any
+    ) -> DomainPagination[Domain_T]:
+        return await self._run(
+            lambda repository: repository.get_all(pagination=pagination, **kwargs)
+        )
+
+    async def get_by_id(self, entity_id: uuid.UUID, /, **kwargs: Any) -> Domain_T:
+        return await self._run(
+            lambda repository: repository.get_by_id(entity_id, **kwargs)
+        )
+
+    async def get_many(
+        self, entity_ids: Sequence[uuid.UUID], /, **kwargs: Any
+    ) -> list[Domain_T | None]:
+        return await self._run(
+            lambda repository: repository.get_many(entity_ids, **kwargs)
+        )
+
+    async def iter_all(
+        self, batch_size: int = 1000, **kwargs: Any
+    ) -> AsyncIterator[list[Domain_T]]:
+        # The cursor stays open between batches, each fetched in its own call
+        batches = await self._run(
+            lambda repository: repository.iter_all(batch_size=batch_size, **kwargs)
+        )
+        while (batch := await self._run(lambda _: next(batches, None))) is not None:
+            yield batch
+
+    async def get_version(self, entity_id: uuid.UUID, /, **kwargs: Any) -> str:
+        return await self._run(
+            lambda repository: repository.get_version(entity_id, **kwargs)
+        )
+
+    async def get_page_version(
+        self, pagination: PaginationParams | None = None, **kwargs: Any
+    ) -> str:
+        return await self._run(
+            lambda repository: repository.get_page_version(
+                pagination=pagination, **kwargs
+            )
+        )
+
+    async def create(self, data: Create_T_contra, /) -> Domain_T:
+        return await self._run(lambda repository: repository.create(data))
+
+    async def create_many(
+        self, data: Sequence[Create_T_contra], /
+    ) -> list[BulkItemResult[Domain_T]]:
+        return await self._run(lambda repository: repository.create_many(data))
+
+    async def update(self, entity_id: uuid.UUID, data: Update_T_contra, /) -> Domain_T:
+        return await self._run(lambda repository: repository.update(entity_id, data))
+
+    async def delete(self, entity_id: uuid.UUID, /) -> None:
+        await self._run(lambda repository: repository.delete(entity_id))
+
+    async def _run(
+        self,
+        call: Callable[
+            [
+                SQLAlchemyRepositoryBase[
+                    Model_T, Domain_T, Create_T_contra, Update_T_contra
+                ]
+            ],
+            R,
+        ],
+    ) -> R:
+        if isinstance(self.session, AsyncSession):
+            return await self.session.run_sync(
+                lambda session: call(self._repository(session))
+            )
+        return await to_thread.run_sync(partial(call, self._repository(self.session)))
+
+    def _repository(
+        self, session: Session
+    ) -> SQLAlchemyRepositoryBase[Model_T, Domain_T, Create_T_contra, Update_T_contra]:
+        return self.repository(session, trusted_mapping=self.trusted_mapping)
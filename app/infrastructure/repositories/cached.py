@@ -0,0 +1,323 @@
+import uuid
+from collections.abc import (
+    AsyncIterator,
+    Callable,
+    Hashable,
+    Iterable,
+    Iterator,
+    Sequence,
+)
+from typing import Any, Generic
+
+from app.application.dtos import PostCreate, PostUpdate
+from app.domain.models import (
+    BulkItemResult,
+    Create_T_contra,
+    Domain_T,
+    DomainModel,
+    DomainPagination,
+    PaginationParams,
+    PostDomain,
+    PostSearchHit,
+    Update_T_contra,
+)
+from app.domain.repository import (
+    AbstractRepository,
+    AsyncAbstractRepository,
+    AsyncPostRepository,
+    PostRepository,
+)
+from app.infrastructure.cache import EntityCache
+from app.infrastructure.exceptions import EntityNotFoundError
+from app.infrastructure.repositories.base import _options_key
+
+# Entities whose cached copies embed data of a given entity
+Dependents = Callable[[Any], Iterable[tuple[type[DomainModel], uuid.UUID]]]
+
+
+def _no_dependents(entity: Any) -> Iterable[tuple[type[DomainModel], uuid.UUID]]:
+    return ()
+
+
+class CachedRepositoryBase(Generic[Domain_T]):
+    def __init__(
+        self,
+        cache: EntityCache,
+        dependents: Dependents = _no_dependents,
+        fill: bool = True,
+    ) -> None:
+        self.cache = cache
+        self.dependents = dependents
+        self.fill = fill
+
+    def _store(
+        self,
+        schema: type[Domain_T],
+        entity_id: uuid.UUID,
+        options: Hashable,
+        entity: Domain_T | None,
+    ) -> None:
+        if not self.fill:
+            return
+        if entity is None:
+            self.cache.set_missing(schema, entity_id)
+        else:
+            self.cache.set(schema, entity_id, options, entity)
+
+    def _invalidate(self, entity: Domain_T) -> None:
+        self.cache.invalidate([(type(entity), entity.id), *self.dependents(entity)])
+
+    def _cached_many(
+        self, schema: type[Domain_T], entity_ids: Sequence[uuid.UUID], options: Hashable
+    ) -> tuple[dict[uuid.UUID, Domain_T | None], list[uuid.UUID]]:
+        """Cached entities of `entity_ids`, None when known missing, and the misses."""
+        entities: dict[uuid.UUID, Domain_T | None] = {}
+        misses = []
+        for entity_id in dict.fromkeys(entity_ids):
+            try:
+                entity = self.cache.get(schema, entity_id, options)
+            except EntityNotFoundError:
+                entities[entity_id] = None
+                continue
+            if entity is None:
+                misses.append(entity_id)
+            else:
+                entities[entity_id] = entity  # type: ignore[assignment]
+        return entities, misses
+
+    def _store_many(
+        self,
+        schema: type[Domain_T],
+        entity_ids: Sequence[uuid.UUID],
+        entities: Sequence[Domain_T | None],
+        options: Hashable,
+    ) -> dict[uuid.UUID, Domain_T | None]:
+        """Cache entities read for `entity_ids`, None when missing."""
+        for entity_id, entity in zip(entity_ids, entities, strict=True):
+            self._store(schema, entity_id, options, entity)
+        return dict(zip(entity_ids, entities, strict=True))
+
+
+class CachedRepository(
+    CachedRepositoryBase[Domain_T],
+    AbstractRepository[Domain_T, Create_T_contra, Update_T_contra],
+):
+    """
+    Read-through cache of `get_by_id` in front of a repository.
+
+    Writes drop the entity and its dependents, e.g. the user embedding a
+    post. Listings are not cached. Versions are those of the cached entities,
+    read from the repository on a miss.
+
+    Without `fill`, entities are only read from the cache, e.g. for sessions
+    reading from a replica: what they read may predate a write that already
+    dropped it from the cache.
+    """
+
+    def __init__(
+        self,
+        repository: AbstractRepository[Domain_T, Create_T_contra, Update_T_contra],
+        cache: EntityCache,
+        dependents: Dependents = _no_dependents,
+        fill: bool = True,
+    ) -> None:
+        super().__init__(cache=cache, dependents=dependents, fill=fill)
+        self.repository = repository
+        self.schema = repository.schema
+
+    def get_all(
+        self, pagination: PaginationParams | None = None, **kwargs: Any
+    ) -> DomainPagination[Domain_T]:
+        return self.repository.get_all(pagination=pagination, **kwargs)
+
+    def get_by_id(self, entity_id: uuid.UUID, /, **kwargs: Any) -> Domain_T:
+        options = _options_key(kwargs)
+        if entity := self.cache.get(self.schema, entity_id, options):
+            return entity  # type: ignore[return-value]
+
+        try:
+            entity = self.repository.get_by_id(entity_id, **kwargs)
+        except EntityNotFoundError:
+            self._store(self.schema, entity_id, options, None)
+            raise
+        self._store(self.schema, entity_id, options, entity)
+        return entity
+
+    def get_many(
+        self, entity_ids: Sequence[uuid.UUID], /, **kwargs: Any
+    ) -> list[Domain_T | None]:
+        """Cached entities, the others read in one call to the repository."""
+        options = _options_key(kwargs)
+        entities, misses = self._cached_many(self.schema, entity_ids, options)
+        if misses:
+            read = self.repository.get_many(misses, **kwargs)
+            entities |= self._store_many(self.schema, misses, read, options)
+        return [entities[entity_id] for entity_id in entity_ids]
+
+    def iter_all(
+        self, batch_size: int = 1000, **kwargs: Any
+    ) -> Iterator[list[Domain_T]]:
+        return self.repository.iter_all(batch_size=batch_size, **kwargs)
+
+    def get_version(self, entity_id: uuid.UUID, /, **kwargs: Any) -> str:
+        if entity := self.cache.get(self.schema, entity_id, _options_key(kwargs)):
+            return entity.version_token()
+        return self.repository.get_version(entity_id, **kwargs)
+
+    def get_page_version(
+        self, pagination: PaginationParams | None = None, **kwargs: Any
+    ) -> str:
+        return self.repository.get_page_version(pagination=pagination, **kwargs)
+
+    def create(self, data: Create_T_contra, /) -> Domain_T:
+        entity = self.repository.create(data)
+        self._invalidate(entity)
+        return entity
+
+    def create_many(
+        self, data: Sequence[Create_T_contra], /
+    ) -> list[BulkItemResult[Domain_T]]:
+        results = self.repository.create_many(data)
+        for result in results:
+            if result.item is not None:
+                self._invalidate(result.item)
+        return results
+
+    def update(self, entity_id: uuid.UUID, data: Update_T_contra, /) -> Domain_T:
+        entity = self.repository.update(entity_id, data)
+        self._invalidate(entity)
+        return entity
+
+    def delete(self, entity_id: uuid.UUID, /) -> None:
+        # Read first to know the dependents of the deleted entity
+        entity = self.repository.get_by_id(entity_id)
+        self.repository.delete(entity_id)
+        self._invalidate(entity)
+
+
+class AsyncCachedRepository(
+    CachedRepositoryBase[Domain_T],
+    AsyncAbstractRepository[Domain_T, Create_T_contra, Update_T_contra],
+):
+    """Async counterpart of `CachedRepository`."""
+
+    def __init__(
+        self,
+        repository: AsyncAbstractRepository[Domain_T, Create_T_contra, Update_T_contra],
+        cache: EntityCache,
+        dependents: Dependents = _no_dependents,
+        fill: bool = True,
+    ) -> None:
+        super().__init__(cache=cache, dependents=dependents, fill=fill)
+        self.repository = repository
+        self.schema = repository.schema
+
+    async def get_all(
+        self, pagination: PaginationParams | None = None, **kwargs: Any
+    ) -> DomainPagination[Domain_T]:
+        return await self.repository.get_all(pagination=pagination, **kwargs)
+
+    async def get_by_id(self, entity_id: uuid.UUID, /, **kwargs: Any) -> Domain_T:
+        options = _options_key(kwargs)
+        if entity := self.cache.get(self.schema, entity_id, options):
+            return entity  # type: ignore[return-value]
+
+        try:
+            entity = await self.repository.get_by_id(entity_id, **kwargs)
+        except EntityNotFoundError:
+            self._store(self.schema, entity_id, options, None)
+            raise
+        self._store(self.schema, entity_id, options, entity)
+        return entity
+
+    async def get_many(
+        self, entity_ids: Sequence[uuid.UUID], /, **kwargs: Any
+    ) -> list[Domain_T | None]:
+        options = _options_key(kwargs)
+        entities, misses = self._cached_many(self.schema, entity_ids, options)
+        if misses:
+            read = await self.repository.get_many(misses, **kwargs)
+            entities |= self._store_many(self.schema, misses, read, options)
+        return [entities[entity_id] for entity_id in entity_ids]
+
+    def iter_all(
+        self, batch_size: int = 1000, **kwargs: Any
+    ) -> AsyncIterator[list[Domain_T]]:
+        return self.repository.iter_all(batch_size=batch_size, **kwargs)
+
+    async def get_version(self, entity_id: uuid.UUID, /, **kwargs: Any) -> str:
+        if entity := self.cache.get(self.schema, entity_id, _options_key(kwargs)):
+            return entity.version_token()
+        return await self.repository.get_version(entity_id, **kwargs)
+
+    async def get_page_version(
+        self, pagination: PaginationParams | None = None, **kwargs: Any
+    ) -> str:
+        return await self.repository.get_page_version(pagination=pagination, **kwargs)
+
+    async def create(self, data: Create_T_contra, /) -> Domain_T:
+        entity = await self.repository.create(data)
+        self._invalidate(entity)
+        return entity
+
+    async def create_many(
+        self, data: Sequence[Create_T_contra], /
+    ) -> list[BulkItemResult[Domain_T]]:
+        results = await self.repository.create_many(data)
+        for result in results:
+            if result.item is not None:
+                self._invalidate(result.item)
+        return results
+
+    async def update(self, entity_id: uuid.UUID, data: Update_T_contra, /) -> Domain_T:
+        entity = await self.repository.update(entity_id, data)
+        self._invalidate(entity)
+        return entity
+
+    async def delete(self, entity_id: uuid.UUID, /) -> None:
+        # Read first to know the dependents of the deleted entity
+        entity = await self.repository.get_by_id(entity_id)
+        await self.repository.delete(entity_id)
+        self._invalidate(entity)
+
+
+class CachedPostRepository(CachedRepository[PostDomain, PostCreate, PostUpdate]):
+    """`CachedRepository` of posts, searches are not cached."""
+
+    repository: PostRepository[PostCreate, PostUpdate]
+
+    def __init__(
+        self,
+        repository: PostRepository[PostCreate, PostUpdate],
+        cache: EntityCache,
+        dependents: Dependents = _no_dependents,
+        fill: bool = True,
+    ) -> None:
+        super().__init__(repository, cache=cache, dependents=dependents, fill=fill)
+
+    def search(
+        self, query: str, /, pagination: PaginationParams | None = None, **kwargs: Any
+    ) -> DomainPagination[PostSearchHit]:
+        return self.repository.search(query, pagination=pagination, **kwargs)
+
+
+class AsyncCachedPostRepository(
+    AsyncCachedRepository[PostDomain, PostCreate, PostUpdate]
+):
+    """Async counterpart of `CachedPostRepository`."""
+
+    repository: AsyncPostRepository[PostCreate, PostUpdate]
+
+    def __init__(
+        self,
+        repository: AsyncPostRepository[PostCreate, PostUpdate],
+        cache: EntityCache,
+        dependents: Dependents = _no_dependents,
+        fill: bool = True,
+    ) -> None:
+        super().__init__(repository, cache=cache, dependents=dependents, fill=fill)
+
+    async def search(
+        self, query: str, /, pagination: PaginationParams | None = None, **kwargs: Any
+    ) -> DomainPagination[PostSearchHit]:
+        return await self.repository.search(query, pagination=pagination, **kwargs)
@@ -1,11 +1,47 @@
-from sqlalchemy import Select
-from sqlalchemy.orm import noload
+import uuid
+from collections.abc import Collection, Iterable, Iterator, Mapping, Sequence
+from contextlib import contextmanager
+from itertools import batched
+from typing import Any, cast
+
+from sqlalchemy import (
+    Integer,
+    Select,
+    and_,
+    bindparam,
+    func,
+    or_,
+    select,
+)
+from sqlalchemy.orm import Session, joinedload, selectinload
 
 from app.application.dtos import PostCreate, PostUpdate
-from app.domain.models import PostDomain, UserMinimalDomain
+from app.domain.models import (
+    BulkItemResult,
+    DomainModel,
+    DomainPagination,
+    FilterOp,
+    PaginationParams,
+    PostDomain,
+    PostInclude,
+    PostQuerySpec,
+    PostSearchHit,
+    QuerySpec,
+    TagMatch,
+    UserDomain,
+    UserMinimalDomain,
+)
+from app.infrastructure import search
+from app.infrastructure.cache import LRUCache
+from app.infrastructure.cursor import decode_cursor, encode_cursor
 from app.infrastructure.exceptions import EntityNotFoundError
-from app.infrastructure.models import Post, Tag, User
-from app.infrastructure.repositories.base import SQLAlchemyRepositoryBase
+from app.infrastructure.models import Post, Tag, User, post_tags
+from app.infrastructure.repositories.base import (
+    AsyncSQLAlchemyRepositoryBase,
+    SQLAlchemyRepositoryBase,
+    Statement_Row_T,
+    _options_key,
+)
 
 
 class PostSQLAlchemyRepository(
@@ -18,6 +54,103 @@ class PostSQLAlchemyRepository(
 ):
     model = Post
     schema = PostDomain
+    loading_profiles = {
+        PostInclude.MINIMAL: (),
+        PostInclude.WITH_AUTHOR: (joinedload(Post.author),),
+        PostInclude.WITH_TAGS: (selectinload(Post.tags),),
+        PostInclude.WITH_AUTHOR_AND_TAGS: (
+            joinedload(Post.author),
+            selectinload(Post.tags),
+        ),
+    }
+    default_include = PostInclude.WITH_AUTHOR_AND_TAGS
+    filterable_fields = {"author_id": (FilterOp.EQ,)}
+    # Tag ids never change once committed, so popular tags are resolved
+    # without a round trip. Shared by every instance, keyed by database URL:
+    # in-memory SQLite databases share theirs, so whoever opens a new one
+    # clears the cache.
+    tag_cache: LRUCache[tuple[str, str], uuid.UUID] = LRUCache(maxsize=10_000)
+
+    def __init__(self, session: Session, trusted_mapping: bool = False):
+        super().__init__(session=session, trusted_mapping=trusted_mapping)
+        # Tags resolved in the current transaction, cached once committed
+        self._resolved_tags: dict[str, uuid.UUID] = {}
+
+    def search(
+        self,
+        query: str,
+        /,
+        pagination: PaginationParams | None = None,
+        **kwargs: Any,
+    ) -> DomainPagination[PostSearchHit]:
+        """
+        Posts matching a full-text query, the most relevant first.
+
+        Pages follow `next_cursor` only, ordered by rank then id, and have no
+        total. `fields` and `include` select the relationships of the posts.
+        """
+        pagination = pagination or PaginationParams()
+        dialect = self.session.get_bind().dialect.name
+        terms = search.search_terms(query, dialect)
+        if terms is None:
+            return DomainPagination(total=None, limit=0, items=[])
+
+        hits = search.hits(dialect)
+
+        def build() -> Select[Any]:
+            stmt = self._apply_loading_options(stmt=select(self.model), **kwargs)
+            stmt = stmt.join(hits, self.model.id == hits.c.id)
+            if pagination.after:
+                after_rank = bindparam("after_rank", type_=hits.c.rank.type)
+                after_id = bindparam("after_id", type_=hits.c.id.type)
+                stmt = stmt.where(
+                    or_(
+                        hits.c.rank < after_rank,
+                        and_(hits.c.rank == after_rank, hits.c.id > after_id),
+                    )
+                )
+            return (
+                stmt.add_columns(hits.c.rank, hits.c.snippet)
+                .order_by(hits.c.rank.desc(), hits.c.id)
+                .limit(bindparam("limit", type_=Integer()))
+            )
+
+        key = (
+            "search",
+            dialect,
+            bool(pagination.after),
+            *_options_key(kwargs),
+        )
+        params: dict[str, Any] = {"query": terms, "limit": pagination.limit + 1}
+        if pagination.after:
+            after_rank, after_id = decode_cursor(
+                pagination.after, (hits.c.rank, hits.c.id)
+            )
+            params.update(after_rank=after_rank, after_id=after_id)
+        rows = self.session.execute(self._cached_statement(key, build), params).all()
+
+        has_more = len(rows) > pagination.limit
+        rows = rows[: pagination.limit]
+        fields = kwargs.get("fields")
+        schema = self._projected_schema(PostSearchHit, fields)
+        items = [
+            self._build(
+                schema, **self._domain_values(post, fields), rank=rank, snippet=snippet
+            )
+            for post, rank, snippet in rows
+        ]
+        next_cursor = None
+        if has_more:
+            _, rank, _ = rows[-1]
+            next_cursor = encode_cursor([rank, items[-1].id])
+
+        return DomainPagination(
+            total=None,
+            limit=len(items),
+            items=items,
+            has_more=has_more,
+            next_cursor=next_cursor,
+        )
 
     def create(self, data: PostCreate, /) -> PostDomain:
         if not self.session.get(User, data.author_id):
@@ -27,31 +160,198 @@ class PostSQLAlchemyRepository(
             title=data.title,
             content=data.content,
             author_id=data.author_id,
-            tags=[Tag(name=tag) for tag in data.tags],
         )
 
-        self.session.add(post)
-        self.session.commit()
+        with self._caching_resolved_tags():
+            self.session.add(post)
+            self.session.flush()
+            self._insert_post_tags({post.id: data.tags})
+            self.session.commit()
+        self._invalidate_count()
 
-        return self._to_domain(post)
+        return self.get_by_id(post.id)
 
-    def _to_domain(self, model: Post, /, *, include_author: bool = True) -> PostDomain:
-        return self.schema(
-            id=model.id,
-            title=model.title,
-            content=model.content,
-            author_id=model.author_id,
-            author=UserMinimalDomain.model_validate(model.author)
-            if include_author and model.author
-            else None,
-            tags=[tag.name for tag in model.tags],
+    def create_many(
+        self, data: Sequence[PostCreate], /
+    ) -> list[BulkItemResult[PostDomain]]:
+        requested_author_ids = {item.author_id for item in data}
+        author_ids = set(
+            self.session.scalars(
+                select(User.id).where(User.id.in_(requested_author_ids))
+            )
         )
 
+        indexes = [i for i, item in enumerate(data) if item.author_id in author_ids]
+        with self._caching_resolved_tags():
+            created = super().create_many([data[i] for i in indexes])
+        results = [
+            result.model_copy(update={"index": indexes[result.index]})
+            for result in created
+        ]
+        errors = [
+            BulkItemResult[PostDomain](
+                index=index,
+                error=str(EntityNotFoundError("User", str(item.author_id))),
+            )
+            for index, item in enumerate(data)
+            if item.author_id not in author_ids
+        ]
+        return sorted(results + errors, key=lambda result: result.index)
+
+    def _insert_many(self, data: Mapping[uuid.UUID, PostCreate]) -> set[uuid.UUID]:
+        inserted_ids = super()._insert_many(data)
+        self._insert_post_tags(
+            {post_id: data[post_id].tags for post_id in inserted_ids}
+        )
+        return inserted_ids
+
+    def _insert_post_tags(self, tags: Mapping[uuid.UUID, Iterable[str]]) -> None:
+        tag_ids = self._get_or_create_tags(
+            {tag for names in tags.values() for tag in names}
+        )
+        rows = [
+            {"post_id": post_id, "tag_id": tag_ids[tag]}
+            for post_id, names in tags.items()
+            for tag in names
+        ]
+        stmt = self._insert_ignoring_conflicts(post_tags)
+        for chunk in batched(rows, self.bulk_chunk_size):
+            self.session.execute(stmt, chunk)
+
+    def _get_or_create_tags(self, names: set[str]) -> dict[str, uuid.UUID]:
+        """Resolve tag names to ids, inserting the ones that do not exist yet."""
+        database = self._database_url()
+        tag_ids = {}
+        for name in names:
+            if (tag_id := self.tag_cache.get((database, name))) is not None:
+                tag_ids[name] = tag_id
+
+        # Sorted so concurrent writers lock the unique index in the same order
+        missing = sorted(names - tag_ids.keys())
+        stmt = self._insert_ignoring_conflicts(Tag).returning(Tag.name, Tag.id)
+        rows = [{"id": uuid.uuid4(), "name": name} for name in missing]
+        for rows_chunk in batched(rows, self.bulk_chunk_size):
+            tag_ids.update(self.session.execute(stmt, rows_chunk).tuples().all())
+
+        # Names skipped by ON CONFLICT DO NOTHING already exist
+        existing = [name for name in missing if name not in tag_ids]
+        for names_chunk in batched(existing, self.bulk_chunk_size):
+            lookup = select(Tag.name, Tag.id).where(Tag.name.in_(names_chunk))
+            tag_ids.update(self.session.execute(lookup).tuples().all())
+
+        self._resolved_tags.update(tag_ids)
+        return tag_ids
+
+    @contextmanager
+    def _caching_resolved_tags(self) -> Iterator[None]:
+        """
+        Cache the tags resolved in the block once it commits.
+
+        They are forgotten when it fails instead: a rolled back tag was never
+        created, and caching its id would link later posts to nothing.
+        """
+        try:
+            yield
+        except BaseException:
+            self._resolved_tags.clear()
+            raise
+
+        database = self._database_url()
+        for name, tag_id in self._resolved_tags.items():
+            self.tag_cache.set((database, name), tag_id)
+        self._resolved_tags.clear()
+
+    def _filter_params(self, spec: QuerySpec | None) -> dict[str, Any]:
+        params = super()._filter_params(spec)
+        if not isinstance(spec, PostQuerySpec) or not spec.tags:
+            return params
+        params["tags"] = spec.tags
+        if spec.tag_match == TagMatch.ALL:
+            params["tag_count"] = len(spec.tags)
+        return params
+
+    def _apply_filters(
+        self, stmt: Select[Statement_Row_T], spec: QuerySpec | None
+    ) -> Select[Statement_Row_T]:
+        stmt = super()._apply_filters(stmt, spec)
+        if not isinstance(spec, PostQuerySpec) or not spec.tags:
+            return stmt
+
+        # Semi-join on the posts of the tags, read from the (tag_id, post_id)
+        # index: the cost follows the number of tagged posts, not of all posts
+        tagged = (
+            select(post_tags.c.post_id)
+            .join(Tag, Tag.id == post_tags.c.tag_id)
+            .where(Tag.name.in_(bindparam("tags", expanding=True)))
+        )
+        if spec.tag_match == TagMatch.ALL:
+            tagged = tagged.group_by(post_tags.c.post_id).having(
+                func.count() == bindparam("tag_count")
+            )
+        return stmt.where(self.model.id.in_(tagged))
+
+    def _to_row(self, data: PostCreate, /) -> dict[str, Any]:
+        return data.model_dump(exclude={"tags"})
+
+    def _to_domain(
+        self, model: Post, /, fields: Collection[str] | None = None
+    ) -> PostDomain:
+        schema = self._projected_schema(self.schema, fields)
+        return self._build(schema, **self._domain_values(model, fields))
+
+    def _domain_values(
+        self, model: Post, fields: Collection[str] | None = None
+    ) -> dict[str, Any]:
+        values = self._column_values(model, fields)
+        if self._is_loaded(model, "author"):
+            author = model.author
+            # The other columns of the author are left out of the domain object
+            values["author"] = (
+                self._build(UserMinimalDomain, **self._column_values(author))
+                if author
+                else None
+            )
+        if self._is_loaded(model, "tags"):
+            values["tags"] = [tag.name for tag in model.tags]
+        return values
+
     def _apply_loading_options(
         self,
         stmt: Select[tuple[Post]],
+        include: str | None = None,
+        fields: Collection[str] | None = None,
         include_author: bool = True,
     ) -> Select[tuple[Post]]:
-        if not include_author:
-            stmt = stmt.options(noload(self.model.author))
-        return stmt
+        if not include_author and include is None:
+            include = PostInclude.WITH_TAGS
+        return super()._apply_loading_options(stmt=stmt, include=include, fields=fields)
+
+
+class AsyncPostSQLAlchemyRepository(
+    AsyncSQLAlchemyRepositoryBase[
+        Post,
+        PostDomain,
+        PostCreate,
+        PostUpdate,
+    ]
+):
+    repository = PostSQLAlchemyRepository
+    schema = PostDomain
+
+    async def search(
+        self,
+        query: str,
+        /,
+        pagination: PaginationParams | None = None,
+        **kwargs: Any,
+    ) -> DomainPagination[PostSearchHit]:
+        return await self._run(
+            lambda repository: cast(PostSQLAlchemyRepository, repository).search(
+                query, pagination=pagination, **kwargs
+            )
+        )
+
+
+def post_dependents(post: PostDomain) -> list[tuple[type[DomainModel], uuid.UUID]]:
+    """Cached entities embedding a post."""
+    return [(UserDomain, post.author_id)]
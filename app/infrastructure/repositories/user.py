@@ -1,7 +1,25 @@
+import uuid
+from collections.abc import Collection, Sequence
+from itertools import batched
+from typing import Any
+
+from sqlalchemy import bindparam, select
+from sqlalchemy.orm import selectinload
+
 from app.application.dtos import UserCreate, UserUpdate
-from app.domain.models import PostDomain, UserDomain
-from app.infrastructure.models import User
-from app.infrastructure.repositories.base import SQLAlchemyRepositoryBase
+from app.domain.models import (
+    DomainModel,
+    FilterOp,
+    PostDomain,
+    UserDomain,
+    UserInclude,
+    VersionRow,
+)
+from app.infrastructure.models import Post, User
+from app.infrastructure.repositories.base import (
+    AsyncSQLAlchemyRepositoryBase,
+    SQLAlchemyRepositoryBase,
+)
 
 
 class UserSQLAlchemyRepository(
@@ -14,24 +32,70 @@ class UserSQLAlchemyRepository(
 ):
     model = User
     schema = UserDomain
+    loading_profiles = {
+        UserInclude.MINIMAL: (),
+        UserInclude.WITH_POSTS: (selectinload(User.posts),),
+        UserInclude.WITH_POSTS_AND_TAGS: (
+            selectinload(User.posts).selectinload(Post.tags),
+        ),
+    }
+    default_include = UserInclude.WITH_POSTS_AND_TAGS
+    filterable_fields = {
+        "level": tuple(FilterOp),
+        "height": tuple(FilterOp),
+        "birth_date": tuple(FilterOp),
+        "is_active": (FilterOp.EQ,),
+    }
+    sortable_fields = ("level", "height", "birth_date")
 
-    def _to_domain(self, model: User) -> UserDomain:
-        return self.schema(
-            id=model.id,
-            username=model.username,
-            email=model.email,
-            level=model.level,
-            height=model.height,
-            is_active=model.is_active,
-            birth_date=model.birth_date,
-            posts=[
-                PostDomain(
-                    id=post.id,
-                    title=post.title,
-                    content=post.content,
-                    author_id=post.author_id,
-                    tags=[tag.name for tag in post.tags],
+    def _to_domain(
+        self, model: User, /, fields: Collection[str] | None = None
+    ) -> UserDomain:
+        values = self._column_values(model, fields)
+        if self._is_loaded(model, "posts"):
+            values["posts"] = [
+                self._build(
+                    PostDomain,
+                    **self._column_values(post),
+                    tags=[tag.name for tag in post.tags]
+                    if self._is_loaded(post, "tags")
+                    else [],
                 )
                 for post in model.posts
-            ],
+            ]
+        return self._build(self._projected_schema(self.schema, fields), **values)
+
+    def _related_versions(
+        self, entity_ids: Sequence[uuid.UUID], **kwargs: Any
+    ) -> list[VersionRow]:
+        if "posts" not in self._loaded_relationships(
+            kwargs.get("include"), kwargs.get("fields")
+        ):
+            return []
+        stmt = self._cached_statement(
+            ("related_versions",),
+            lambda: select(Post.id, Post.version).where(
+                Post.author_id.in_(bindparam("author_ids", expanding=True))
+            ),
         )
+        versions: list[VersionRow] = []
+        for chunk in batched(entity_ids, self.bulk_chunk_size):
+            versions.extend(self.session.execute(stmt, {"author_ids": chunk}).tuples())
+        return versions
+
+
+class AsyncUserSQLAlchemyRepository(
+    AsyncSQLAlchemyRepositoryBase[
+        User,
+        UserDomain,
+        UserCreate,
+        UserUpdate,
+    ]
+):
+    repository = UserSQLAlchemyRepository
+    schema = UserDomain
+
+
+def user_dependents(user: UserDomain) -> list[tuple[type[DomainModel], uuid.UUID]]:
+    """Cached entities embedding a user."""
+    return [(PostDomain, post.id) for post in user.posts]
@@ -0,0 +1,118 @@
+"""
+Full-text search over posts, on the index created with the `post` table.
+
+Both dialects expose the matching posts as a subquery of their id, their
+rank, higher first, and a snippet of their content with the matched terms
+wrapped in <mark> tags. The content is HTML-escaped before the tags are added,
+so snippets are safe to render as HTML. Ranks only compare within a search.
+"""
+
+import re
+from functools import cache
+from typing import Any
+
+from sqlalchemy import (
+    ColumnClause,
+    ColumnElement,
+    Float,
+    String,
+    Subquery,
+    bindparam,
+    column,
+    func,
+    literal,
+    literal_column,
+    select,
+    table,
+)
+from sqlalchemy.dialects.postgresql import REGCONFIG, TSVECTOR
+
+from app.infrastructure.models import Post
+
+TEXT_SEARCH_CONFIG = "english"
+# Same weights as the default of `ts_rank_cd` for titles (A) and contents (B)
+SQLITE_COLUMN_WEIGHTS = (1.0, 0.4)
+SNIPPET_WORDS = 24
+HEADLINE_OPTIONS = (
+    f"StartSel=<mark>, StopSel=</mark>, MaxWords={SNIPPET_WORDS}, MinWords=12"
+)
+
+# As `html.escape(text, quote=False)`, ampersands first
+_HTML_ESCAPES = (("&", "&amp;"), ("<", "&lt;"), (">", "&gt;"))
+# FTS5 highlights the indexed content, which is not escaped: its snippets
+# mark terms with control characters, replaced by tags once escaped
+_SQLITE_MARKS = ("\x02", "\x03")
+
+_WORD = re.compile(r"\w+")
+
+
+def search_terms(query: str, dialect: str) -> str | None:
+    """Query bound to the `query` parameter of `hits`, None when it has no terms."""
+    if dialect == "postgresql":
+        # `websearch_to_tsquery` accepts any input, with quotes, `or` and `-`
+        return query if query.strip() else None
+
+    # FTS5 has its own syntax: every word is quoted, so all are required
+    words = _WORD.findall(query)
+    return " ".join(f'"{word}"' for word in words) if words else None
+
+
+@cache
+def hits(dialect: str) -> Subquery:
+    """Posts matching the `query` parameter, with their rank and snippet."""
+    if dialect == "postgresql":
+        return _postgresql_hits()
+    return _sqlite_hits()
+
+
+def _postgresql_hits() -> Subquery:
+    vector: ColumnClause[Any] = literal_column("post.search_vector", TSVECTOR)
+    config = literal(TEXT_SEARCH_CONFIG, REGCONFIG)
+    tsquery = func.websearch_to_tsquery(config, bindparam("query"))
+    # With ORDER BY and LIMIT, the planner computes the costly headlines of
+    # the returned rows only
+    return (
+        select(
+            Post.id,
+            func.ts_rank_cd(vector, tsquery, type_=Float).label("rank"),
+            func.ts_headline(
+                config,
+                _escape_html(Post.content.expression),
+                tsquery,
+                HEADLINE_OPTIONS,
+                type_=String,
+            ).label("snippet"),
+        )
+        .where(vector.bool_op("@@")(tsquery))
+        .subquery("hits")
+    )
+
+
+def _sqlite_hits() -> Subquery:
+    index = table("post_search", column("rowid"))
+    index_name: ColumnClause[Any] = literal_column("post_search")
+    # bm25 is lower for better matches
+    bm25 = func.bm25(index_name, *SQLITE_COLUMN_WEIGHTS, type_=Float)
+    content_column = 1
+    start, stop = _SQLITE_MARKS
+    snippet = func.snippet(
+        index_name, content_column, start, stop, "…", SNIPPET_WORDS, type_=String
+    )
+    highlighted = func.replace(
+        func.replace(_escape_html(snippet), start, "<mark>", type_=String),
+        stop,
+        "</mark>",
+        type_=String,
+    )
+    return (
+        select(Post.id, (-bm25).label("rank"), highlighted.label("snippet"))
+        .join(index, index.c.rowid == literal_column("post.rowid"))
+        .where(index_name.op("MATCH")(bindparam("query")))
+        .subquery("hits")
+    )
+
+
+def _escape_html(text: ColumnElement[str]) -> ColumnElement[str]:
+    for character, entity in _HTML_ESCAPES:
+        text = func.replace(text, character, entity, type_=String)
+    return text
@@ -0,0 +1,167 @@
+"""
+Set-based loading of validated rows through staging tables.
+
+Each batch is written to temporary staging tables, with COPY on PostgreSQL
+and multi-row inserts elsewhere, then merged into the real tables with
+`INSERT ... SELECT`. Rows the merge skips, duplicates or posts of unknown
+authors, are reported back with the reason.
+"""
+
+import uuid
+from collections.abc import Sequence
+from typing import Any
+
+from sqlalchemy import (
+    Column,
+    Insert,
+    MetaData,
+    Table,
+    delete,
+    exists,
+    insert,
+    select,
+    true,
+)
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from app.infrastructure.exceptions import EntityAlreadyExistsError, EntityNotFoundError
+from app.infrastructure.models import Base, Post, Tag, User, post_tags
+
+staging_metadata = MetaData()
+
+
+def _staging_table(name: str, source: Table, *columns: str) -> Table:
+    return Table(
+        name,
+        staging_metadata,
+        *(Column(column, source.c[column].type) for column in columns),
+        prefixes=["TEMPORARY"],
+    )
+
+
+_users = Base.metadata.tables[User.__tablename__]
+_posts = Base.metadata.tables[Post.__tablename__]
+_tags = Base.metadata.tables[Tag.__tablename__]
+
+user_staging = _staging_table(
+    "import_user",
+    _users,
+    "id",
+    "username",
+    "email",
+    "level",
+    "height",
+    "is_active",
+    "birth_date",
+)
+post_staging = _staging_table(
+    "import_post", _posts, "id", "title", "content", "author_id"
+)
+tag_staging = _staging_table("import_tag", _tags, "id", "name")
+post_tag_staging = Table(
+    "import_post_tag",
+    staging_metadata,
+    Column("post_id", _posts.c.id.type),
+    Column("name", _tags.c.name.type),
+    prefixes=["TEMPORARY"],
+)
+
+
+class StagingLoader:
+    def __init__(self, session: Session) -> None:
+        self.session = session
+
+    def load_users(self, rows: Sequence[dict[str, Any]]) -> dict[uuid.UUID, str]:
+        """Insert users, returning the ids of the skipped rows with the reason."""
+        self._stage(user_staging, rows)
+        inserted = self._merge(_users, user_staging)
+        conflict = str(EntityAlreadyExistsError("User"))
+        return {row["id"]: conflict for row in rows if row["id"] not in inserted}
+
+    def load_posts(
+        self, rows: Sequence[dict[str, Any]], tags: Sequence[dict[str, Any]]
+    ) -> dict[uuid.UUID, str]:
+        """
+        Insert posts and their tags, returning the skipped rows with the reason.
+
+        `tags` holds one `post_id`, `name` pair per tag of a post. Only the tags
+        of inserted posts are merged, so skipped rows leave no tag behind and
+        do not tag the existing post they conflict with.
+        """
+        self._stage(post_staging, rows)
+        author_exists = exists().where(_users.c.id == post_staging.c.author_id)
+        inserted = self._merge(_posts, post_staging, author_exists)
+
+        tags = [tag for tag in tags if tag["post_id"] in inserted]
+        names = {tag["name"] for tag in tags}
+        self._stage(post_tag_staging, tags)
+        self._stage(tag_staging, [{"id": uuid.uuid4(), "name": name} for name in names])
+        self._merge(_tags, tag_staging)
+        links = (
+            select(post_tag_staging.c.post_id, _tags.c.id)
+            .join(_tags, _tags.c.name == post_tag_staging.c.name)
+            .where(true())
+        )
+        self.session.execute(
+            self._insert_ignoring_conflicts(post_tags).from_select(
+                ["post_id", "tag_id"], links
+            )
+        )
+
+        missing_authors = set(
+            self.session.scalars(select(post_staging.c.id).where(~author_exists))
+        )
+        conflict = str(EntityAlreadyExistsError("Post"))
+        return {
+            row["id"]: str(EntityNotFoundError("User", str(row["author_id"])))
+            if row["id"] in missing_authors
+            else conflict
+            for row in rows
+            if row["id"] not in inserted
+        }
+
+    def _stage(self, table: Table, rows: Sequence[dict[str, Any]]) -> None:
+        connection = self.session.connection()
+        # Temporary tables live as long as the database connection
+        table.create(connection, checkfirst=True)
+        connection.execute(delete(table))
+        if not rows:
+            return
+
+        if connection.dialect.name == "postgresql":
+            self._copy(table, rows)
+        else:
+            connection.execute(insert(table), rows)
+
+    def _copy(self, table: Table, rows: Sequence[dict[str, Any]]) -> None:
+        columns = [column.name for column in table.columns]
+        driver_connection = self.session.connection().connection.driver_connection
+        copy_sql = f"COPY {table.name} ({', '.join(columns)}) FROM STDIN"
+        with (
+            driver_connection.cursor() as cursor,  # type: ignore[union-attr]
+            cursor.copy(copy_sql) as copy,
+        ):
+            for row in rows:
+                copy.write_row([row[column] for column in columns])
+
+    def _merge(self, target: Table, staging: Table, *where: Any) -> set[uuid.UUID]:
+        """Copy the staged rows into `target`, returning the inserted ids."""
+        columns = [column.name for column in staging.columns]
+        # SQLite needs a WHERE clause to parse INSERT ... SELECT ... ON CONFLICT
+        rows = select(*staging.columns).where(true(), *where)
+        stmt = (
+            self._insert_ignoring_conflicts(target)
+            .from_select(columns, rows)
+            .returning(target.c.id)
+        )
+        return set(self.session.scalars(stmt))
+
+    def _insert_ignoring_conflicts(self, table: Table) -> Insert:
+        match self.session.get_bind().dialect.name:
+            case "postgresql":
+                return postgresql.insert(table).on_conflict_do_nothing()
+            case "sqlite":
+                return sqlite.insert(table).on_conflict_do_nothing()
+            case _:
+                return insert(table)
@@ -0,0 +1,298 @@
+"""
+HTTP load test with per-route latency histograms.
+
+    python -m app.factories seed --users 10000 --posts 100000 \
+        --database-url sqlite:///load.db
+    python -m benchmarks.load --database-url sqlite:///load.db \
+        --concurrency 20 --duration 30 --mix get_user=10,list_posts=2,create_post=1
+
+Workers send requests back to back, picking each one from the weighted mix,
+for the whole duration. By default they drive the app of `app.main`
+in-process, on the database of the settings or `--database-url`. With
+`--url`, they load a running server instead, e.g. a local uvicorn. The report
+gives the throughput and the latency percentiles of every route.
+"""
+
+import argparse
+import math
+import random
+import time
+import uuid
+from collections import Counter
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from typing import Any
+
+import anyio
+import httpx
+
+from app.api.dependencies import get_database_uri, get_replica_uris
+from app.core.config import Settings, get_settings
+from app.factories.base import faker
+from app.main import app
+
+# Smallest latency the histograms tell apart, in seconds
+RESOLUTION = 1e-6
+PERCENTILES = (50, 95, 99, 99.9)
+# Entities whose ids requests pick from
+ID_POOL_SIZE = 100
+
+
+class LatencyHistogram:
+    """
+    Latencies in buckets growing by `precision`, like HDR histograms.
+
+    Percentiles are exact within that precision, in constant memory however
+    long the run.
+    """
+
+    def __init__(self, precision: float = 0.01) -> None:
+        self._log_base = math.log1p(precision)
+        self.buckets: Counter[int] = Counter()
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def record(self, latency: float) -> None:
+        bucket = int(math.log(max(latency, RESOLUTION) / RESOLUTION) / self._log_base)
+        self.buckets[bucket] += 1
+        self.count += 1
+        self.total += latency
+        self.max = max(self.max, latency)
+
+    def merge(self, other: "LatencyHistogram") -> None:
+        self.buckets.update(other.buckets)
+        self.count += other.count
+        self.total += other.total
+        self.max = max(self.max, other.max)
+
+    def percentile(self, percent: float) -> float:
+        rank = math.ceil(percent / 100 * self.count)
+        seen = 0
+        for bucket in sorted(self.buckets):
+            seen += self.buckets[bucket]
+            if seen >= rank:
+                return min(
+                    RESOLUTION * math.exp((bucket + 1) * self._log_base), self.max
+                )
+        return self.max
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+
+@dataclass
+class RouteStats:
+    latencies: LatencyHistogram = field(default_factory=LatencyHistogram)
+    errors: Counter[str] = field(default_factory=Counter)
+
+
+@dataclass
+class Ids:
+    users: list[uuid.UUID]
+    posts: list[uuid.UUID]
+
+
+@dataclass
+class Scenario:
+    route: str
+    request: Callable[[httpx.AsyncClient, Ids], Any]
+
+
+def user_payload() -> dict[str, Any]:
+    user_id = uuid.uuid4()
+    return {
+        "username": faker.user_name(),
+        "email": f"load.{user_id.hex}@example.com",
+        "height": 175.0,
+        "birth_date": "1990-01-01",
+    }
+
+
+def post_payload(ids: Ids) -> dict[str, Any]:
+    return {
+        "title": faker.sentence(nb_words=6),
+        "content": faker.paragraph(nb_sentences=5),
+        "author_id": str(random.choice(ids.users)),
+        "tags": [faker.word() for _ in range(random.randint(1, 3))],
+    }
+
+
+SCENARIOS = {
+    "list_users": Scenario(
+        "GET /users/", lambda client, _: client.get("/users/", params={"limit": 20})
+    ),
+    "get_user": Scenario(
+        "GET /users/{user_id}",
+        lambda client, ids: client.get(f"/users/{random.choice(ids.users)}"),
+    ),
+    "create_user": Scenario(
+        "POST /users/", lambda client, _: client.post("/users/", json=user_payload())
+    ),
+    "list_posts": Scenario(
+        "GET /posts/", lambda client, _: client.get("/posts/", params={"limit": 20})
+    ),
+    "get_post": Scenario(
+        "GET /posts/{post_id}",
+        lambda client, ids: client.get(f"/posts/{random.choice(ids.posts)}"),
+    ),
+    "search_posts": Scenario(
+        "GET /posts/search",
+        lambda client, _: client.get(
+            "/posts/search", params={"q": faker.word(), "limit": 20}
+        ),
+    ),
+    "create_post": Scenario(
+        "POST /posts/",
+        lambda client, ids: client.post("/posts/", json=post_payload(ids)),
+    ),
+}
+DEFAULT_MIX = "list_users=1,get_user=4,list_posts=2,get_post=4,create_post=1"
+
+
+def parse_mix(mix: str) -> dict[str, int]:
+    weights = {}
+    for item in mix.split(","):
+        name, _, weight = item.partition("=")
+        if name.strip() not in SCENARIOS:
+            raise argparse.ArgumentTypeError(
+                f"Unknown scenario {name!r}, expected one of {', '.join(SCENARIOS)}."
+            )
+        weights[name.strip()] = int(weight or 1)
+    return weights
+
+
+async def fetch_ids(client: httpx.AsyncClient) -> Ids:
+    async def ids(path: str) -> list[uuid.UUID]:
+        params: dict[str, str | int] = {
+            "limit": ID_POOL_SIZE,
+            "fields": "id",
+            "count": "none",
+        }
+        response = await client.get(path, params=params)
+        response.raise_for_status()
+        return [uuid.UUID(item["id"]) for item in response.json()["items"]]
+
+    result = Ids(users=await ids("/users/"), posts=await ids("/posts/"))
+    if not result.users or not result.posts:
+        raise SystemExit("Seed users and posts first: python -m app.factories seed")
+    return result
+
+
+async def worker(
+    client: httpx.AsyncClient,
+    ids: Ids,
+    weights: dict[str, int],
+    deadline: float,
+    stats: dict[str, RouteStats],
+) -> None:
+    names = list(weights)
+    while time.perf_counter() < deadline:
+        scenario = SCENARIOS[random.choices(names, list(weights.values()))[0]]
+        route = stats.setdefault(scenario.route, RouteStats())
+        start = time.perf_counter()
+        try:
+            response = await scenario.request(client, ids)
+        except httpx.HTTPError as err:
+            route.errors[type(err).__name__] += 1
+            continue
+        route.latencies.record(time.perf_counter() - start)
+        if response.is_error:
+            route.errors[str(response.status_code)] += 1
+
+
+async def run(
+    client: httpx.AsyncClient,
+    weights: dict[str, int],
+    concurrency: int,
+    duration: float,
+) -> tuple[dict[str, RouteStats], float]:
+    ids = await fetch_ids(client)
+    stats: dict[str, RouteStats] = {}
+    start = time.perf_counter()
+    async with anyio.create_task_group() as task_group:
+        for _ in range(concurrency):
+            task_group.start_soon(worker, client, ids, weights, start + duration, stats)
+    return stats, time.perf_counter() - start
+
+
+def report(stats: dict[str, RouteStats], elapsed: float) -> None:
+    def ms(seconds: float) -> str:
+        return f"{seconds * 1000:>9.1f}"
+
+    columns = ["requests", "errors", "req/s", "mean"]
+    columns += [f"p{percent:g}" for percent in PERCENTILES] + ["max"]
+    print(f"{'route':<24}" + "".join(f"{column:>10}" for column in columns))
+
+    total = LatencyHistogram()
+    for route, route_stats in sorted(stats.items()):
+        latencies = route_stats.latencies
+        total.merge(latencies)
+        errors = ", ".join(
+            f"{count} x {error}" for error, count in route_stats.errors.items()
+        )
+        print(
+            f"{route:<24}{latencies.count:>10}{route_stats.errors.total():>10}"
+            f"{latencies.count / elapsed:>10.1f} {ms(latencies.mean)}"
+            + "".join(
+                f" {ms(latencies.percentile(percent))}" for percent in PERCENTILES
+            )
+            + f" {ms(latencies.max)}"
+            + (f"  ({errors})" if errors else "")
+        )
+
+    print(
+        f"{total.count} requests in {elapsed:.1f}s, {total.count / elapsed:.1f} req/s, "
+        + ", ".join(
+            f"p{percent:g} {total.percentile(percent) * 1000:.1f} ms"
+            for percent in PERCENTILES
+        )
+    )
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.load")
+    parser.add_argument("--duration", type=float, default=10.0, help="in seconds")
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument(
+        "--mix",
+        type=parse_mix,
+        default=parse_mix(DEFAULT_MIX),
+        help=f"weighted scenarios among {', '.join(SCENARIOS)}",
+    )
+    target = parser.add_mutually_exclusive_group()
+    target.add_argument("--url", help="server to load instead of the in-process app")
+    target.add_argument(
+        "--database-url", help="in-process database, defaults to the settings"
+    )
+    args = parser.parse_args(argv)
+
+    if args.url:
+        client = httpx.AsyncClient(base_url=args.url, timeout=None)
+    else:
+        if args.database_url:
+            settings = Settings(  # type: ignore[call-arg]
+                _env_file=".env",
+                POSTGRES_USER="",
+                POSTGRES_PASSWORD="",
+                POSTGRES_SERVER="",
+                POSTGRES_DB="",
+            )
+            app.dependency_overrides[get_settings] = lambda: settings
+            app.dependency_overrides[get_database_uri] = lambda: args.database_url
+            app.dependency_overrides[get_replica_uris] = lambda: ()
+        transport = httpx.ASGITransport(app=app)
+        client = httpx.AsyncClient(
+            transport=transport, base_url="http://load", timeout=None
+        )
+
+    async def load() -> tuple[dict[str, RouteStats], float]:
+        async with client:
+            return await run(client, args.mix, args.concurrency, args.duration)
+
+    report(*anyio.run(load))
+
+
+if __name__ == "__main__":
+    main()
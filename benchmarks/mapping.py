@@ -0,0 +1,92 @@
+"""
+Compare validated and trusted domain mapping on large pages.
+
+    python -m benchmarks.mapping --rows 10000
+
+Mapping is timed on its own, over rows already loaded by the ORM, then as
+part of a full `get_all` call.
+"""
+
+import argparse
+import gc
+import statistics
+import time
+from collections.abc import Callable
+
+from sqlalchemy import Engine, StaticPool, create_engine, select
+from sqlalchemy.orm import Session
+
+from app.domain.models import CountMode, PaginationParams
+from app.factories.seed import Seeder
+from app.infrastructure.models import Base
+from app.infrastructure.repositories.post import PostSQLAlchemyRepository
+from app.infrastructure.repositories.user import UserSQLAlchemyRepository
+
+
+def measure(call: Callable[[], object], repeat: int) -> float:
+    # As timeit does: collections over the loaded rows would dominate timings
+    samples = []
+    gc.collect()
+    gc.disable()
+    try:
+        for _ in range(repeat):
+            start = time.perf_counter()
+            call()
+            samples.append(time.perf_counter() - start)
+    finally:
+        gc.enable()
+    return statistics.median(samples)
+
+
+def report(label: str, validated: float, trusted: float) -> None:
+    print(
+        f"{label}: validated {validated * 1000:.1f} ms, "
+        f"trusted {trusted * 1000:.1f} ms ({validated / trusted:.2f}x)"
+    )
+
+
+def compare(
+    engine: Engine,
+    repository_class: type[UserSQLAlchemyRepository | PostSQLAlchemyRepository],
+    rows: int,
+    repeat: int,
+) -> None:
+    pagination = PaginationParams(limit=rows, count=CountMode.NONE)
+    with Session(engine) as session:
+        validated = repository_class(session=session)
+        trusted = repository_class(session=session, trusted_mapping=True)
+        stmt = validated._apply_loading_options(select(validated.model))
+        models = session.scalars(stmt.limit(rows)).all()
+
+        name = repository_class.model.__name__
+        report(
+            f"{name} mapping ({len(models)} rows)",
+            measure(lambda: [validated._to_domain(m) for m in models], repeat),
+            measure(lambda: [trusted._to_domain(m) for m in models], repeat),
+        )
+        report(
+            f"{name} get_all ({len(models)} rows)",
+            measure(lambda: validated.get_all(pagination=pagination), repeat),
+            measure(lambda: trusted.get_all(pagination=pagination), repeat),
+        )
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.mapping")
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    engine = create_engine("sqlite://", poolclass=StaticPool)
+    Base.metadata.create_all(engine)
+    with Session(engine) as session:
+        seeder = Seeder(session, author_pool_size=args.rows)
+        seeder.seed_users(args.rows)
+        seeder.seed_posts(args.rows)
+
+    for repository_class in (UserSQLAlchemyRepository, PostSQLAlchemyRepository):
+        compare(engine, repository_class, rows=args.rows, repeat=args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""
+Compare FastAPI's response_model serialization with DomainRoute.
+
+    python -m benchmarks.serialization --users 2000 --posts 10000
+
+Both paths serialize the same `GET /users/` page with embedded posts:
+FastAPI validates it into `PaginatedResponse[UserResponse]` then renders the
+copy, DomainRoute dumps the domain objects directly.
+"""
+
+import argparse
+import statistics
+import time
+from collections.abc import Callable
+
+import anyio
+from fastapi.responses import JSONResponse
+from fastapi.routing import APIRoute, serialize_response
+from fastapi.testclient import TestClient
+from sqlalchemy import StaticPool, create_engine
+from sqlalchemy.orm import Session
+
+from app.api.dependencies import get_session
+from app.api.routing import response_include
+from app.api.schemas import PaginatedResponse, UserResponse
+from app.core.config import Settings, get_settings
+from app.domain.models import CountMode, PaginationParams
+from app.factories.seed import Seeder
+from app.infrastructure.models import Base
+from app.infrastructure.repositories.user import UserSQLAlchemyRepository
+from app.main import app
+
+
+def measure(call: Callable[[], object], repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        call()
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples)
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.serialization")
+    parser.add_argument("--users", type=int, default=2000)
+    parser.add_argument("--posts", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    engine = create_engine(
+        "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
+    Base.metadata.create_all(engine)
+    with Session(engine) as session:
+        seeder = Seeder(session, author_pool_size=args.users)
+        seeder.seed_users(args.users)
+        seeder.seed_posts(args.posts)
+
+    with Session(engine) as session:
+        page = UserSQLAlchemyRepository(session=session).get_all(
+            pagination=PaginationParams(limit=args.users, count=CountMode.NONE)
+        )
+
+    route = next(
+        route
+        for route in app.routes
+        if isinstance(route, APIRoute) and route.name == "get_users"
+    )
+
+    def validate_and_render() -> bytes:
+        content = anyio.run(
+            lambda: serialize_response(
+                field=route.response_field, response_content=page, is_coroutine=True
+            )
+        )
+        return JSONResponse(content).body
+
+    include = response_include(PaginatedResponse[UserResponse])
+    response_model = measure(validate_and_render, args.repeat)
+    domain_route = measure(lambda: page.model_dump_json(include=include), args.repeat)
+    print(
+        f"Serialize {args.users} users with {args.posts} posts: "
+        f"response_model {response_model * 1000:.1f} ms, "
+        f"DomainRoute {domain_route * 1000:.1f} ms "
+        f"({response_model / domain_route:.2f}x)"
+    )
+
+    session = Session(engine)
+    settings = Settings(
+        POSTGRES_USER="", POSTGRES_PASSWORD="", POSTGRES_SERVER="", POSTGRES_DB=""
+    )
+    app.dependency_overrides[get_session] = lambda: session
+    app.dependency_overrides[get_settings] = lambda: settings
+    with TestClient(app) as client:
+        request = measure(
+            lambda: client.get(
+                "/users/", params={"limit": args.users, "count": "none"}
+            ),
+            args.repeat,
+        )
+    print(f"GET /users/?limit={args.users}: {request * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
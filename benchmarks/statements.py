@@ -0,0 +1,129 @@
+"""
+Measure what cached statements and prepared statements save per query.
+
+    python -m benchmarks.statements --rows 10000
+    python -m benchmarks.statements --database-url postgresql+psycopg://...
+
+Python side: the hot repository queries run with their statements cached,
+then rebuilt on every call as before. Server side, on PostgreSQL with
+psycopg only: the cached statements run on connections that prepare them at
+once, then on connections that never prepare them.
+"""
+
+import argparse
+import statistics
+import time
+import uuid
+from collections.abc import Callable
+from typing import Any
+
+from sqlalchemy import Engine, create_engine, select
+from sqlalchemy.orm import Session
+
+from app.domain.models import CountMode, PaginationParams
+from app.factories.seed import Seeder
+from app.infrastructure.models import Base, User
+from app.infrastructure.prepared import PreparedStatementOptions
+from app.infrastructure.repositories.base import Statement_T
+from app.infrastructure.repositories.user import UserSQLAlchemyRepository
+
+
+class RebuildingUserRepository(UserSQLAlchemyRepository):
+    """Builds its statements on every call, like before they were cached."""
+
+    def _cached_statement(
+        self, key: tuple[Any, ...], build: Callable[[], Statement_T]
+    ) -> Statement_T:
+        return build()
+
+
+def measure(call: Callable[[], object], repeat: int, number: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            call()
+        samples.append((time.perf_counter() - start) / number)
+    return statistics.median(samples)
+
+
+def queries(
+    repository: UserSQLAlchemyRepository, user_id: uuid.UUID
+) -> dict[str, Callable[[], object]]:
+    pagination = PaginationParams(limit=20, count=CountMode.EXACT)
+    return {
+        "get_by_id": lambda: repository.get_by_id(user_id),
+        "get_all": lambda: repository.get_all(pagination=pagination),
+        "get_version": lambda: repository.get_version(user_id),
+    }
+
+
+def report(label: str, baseline: float, optimized: float) -> None:
+    print(
+        f"{label}: {baseline * 1e6:,.0f} µs -> {optimized * 1e6:,.0f} µs "
+        f"({(baseline - optimized) * 1e6:,.0f} µs saved per call)"
+    )
+
+
+def compare_python_side(engine: Engine, repeat: int, number: int) -> None:
+    with Session(engine) as session:
+        user_id = session.scalars(select(User.id).limit(1)).one()
+        cached = queries(UserSQLAlchemyRepository(session), user_id)
+        rebuilt = queries(RebuildingUserRepository(session), user_id)
+        for name in cached:
+            report(
+                f"{name}, cached statement",
+                measure(rebuilt[name], repeat, number),
+                measure(cached[name], repeat, number),
+            )
+
+
+def compare_server_side(database_url: str, repeat: int, number: int) -> None:
+    timings = []
+    for threshold in (None, 0):
+        options = PreparedStatementOptions(threshold=threshold)
+        engine = create_engine(
+            database_url, connect_args=options.connect_args(database_url)
+        )
+        with Session(engine) as session:
+            user_id = session.scalars(select(User.id).limit(1)).one()
+            calls = queries(UserSQLAlchemyRepository(session), user_id)
+            timings.append(
+                {name: measure(call, repeat, number) for name, call in calls.items()}
+            )
+        engine.dispose()
+
+    unprepared, prepared = timings
+    for name in unprepared:
+        report(f"{name}, prepared statement", unprepared[name], prepared[name])
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.statements")
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--number", type=int, default=200)
+    parser.add_argument(
+        "--database-url",
+        default="sqlite://",
+        help="seeded with --rows users and posts when empty",
+    )
+    args = parser.parse_args(argv)
+
+    engine = create_engine(args.database_url)
+    Base.metadata.create_all(engine)
+    with Session(engine) as session:
+        if session.scalar(select(User.id).limit(1)) is None:
+            seeder = Seeder(session, author_pool_size=args.rows)
+            seeder.seed_users(args.rows)
+            seeder.seed_posts(args.rows)
+
+    compare_python_side(engine, args.repeat, args.number)
+    if engine.dialect.driver == "psycopg":
+        compare_server_side(args.database_url, args.repeat, args.number)
+    else:
+        print("Prepared statements need PostgreSQL with psycopg, skipped.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,242 @@
+"""
+Repository and service micro-benchmarks, with JSON baselines.
+
+    python -m benchmarks.suite run --sizes 100 1000 10000 --output base.json
+    python -m benchmarks.suite compare base.json current.json --threshold 0.25
+
+Every size gets a fresh in-memory SQLite database seeded through
+`app.factories`, then times the repository CRUD calls, post search,
+`PostService.create`, `_clean_tags` and the `_to_domain` mapping of both
+repositories. `compare` exits with status 1 when a benchmark got slower than
+its baseline by more than the threshold. Timings depend on the machine:
+compare runs made on the same one.
+"""
+
+import argparse
+import gc
+import itertools
+import json
+import platform
+import random
+import statistics
+import sys
+import time
+import uuid
+from collections.abc import Callable, Iterator
+from dataclasses import dataclass
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import Any
+from unittest import mock
+
+import sqlalchemy
+from sqlalchemy import Engine, StaticPool, create_engine, select
+from sqlalchemy.orm import Session
+
+from app.application.dtos import PostCreate, UserCreate, UserUpdate
+from app.application.services.post import PostService
+from app.domain.models import PaginationParams
+from app.factories.base import faker
+from app.factories.post import PostDataFactory
+from app.factories.seed import Seeder
+from app.factories.user import UserDataFactory, UserSQLAlchemyFactory
+from app.infrastructure.models import Base, Post, User
+from app.infrastructure.repositories.post import PostSQLAlchemyRepository
+from app.infrastructure.repositories.user import UserSQLAlchemyRepository
+
+# Rows per page for `get_all` and per `_to_domain` batch
+PAGE_SIZE = 100
+
+
+@dataclass
+class Benchmark:
+    name: str
+    # Called with the value returned by `setup`, which is not timed
+    call: Callable[[Any], object]
+    setup: Callable[[], Any] = lambda: None
+    # Calls per sample, averaged to smooth out single slow calls
+    number: int = 10
+
+    def measure(self, repeat: int) -> dict[str, float]:
+        samples = []
+        for _ in range(repeat):
+            args = [self.setup() for _ in range(self.number)]
+            # Like timeit, keep collections of unrelated garbage out of samples
+            gc.collect()
+            gc.disable()
+            try:
+                start = time.perf_counter()
+                for arg in args:
+                    self.call(arg)
+                samples.append((time.perf_counter() - start) / self.number)
+            finally:
+                gc.enable()
+        return {"median": statistics.median(samples), "min": min(samples)}
+
+
+def seed(size: int) -> Engine:
+    # Same rows on every run, ids included, so pages hold the same data
+    random.seed(size)
+    faker.seed_instance(size)
+
+    def seeded_uuid4() -> uuid.UUID:
+        return uuid.UUID(int=random.getrandbits(128), version=4)
+
+    engine = create_engine("sqlite://", poolclass=StaticPool)
+    Base.metadata.create_all(engine)
+    # The tag ids and totals of the previous size, cached under the same URL, are gone
+    PostSQLAlchemyRepository.tag_cache.clear()
+    PostSQLAlchemyRepository.count_cache.clear()
+    with Session(engine) as session, mock.patch("uuid.uuid4", seeded_uuid4):
+        seeder = Seeder(session, author_pool_size=size)
+        seeder.seed_users(size)
+        seeder.seed_posts(size)
+    return engine
+
+
+def benchmarks(session: Session) -> Iterator[Benchmark]:
+    users = UserSQLAlchemyRepository(session=session)
+    posts = PostSQLAlchemyRepository(session=session)
+    post_service = PostService(repository=posts)
+    user_data = UserDataFactory()
+    post_data = PostDataFactory(user_data_factory=user_data)
+    user_factory = UserSQLAlchemyFactory(session=session, data_factory=user_data)
+
+    user_ids = itertools.cycle(session.scalars(select(User.id).limit(PAGE_SIZE)))
+    page_post_ids = session.scalars(select(Post.id).limit(PAGE_SIZE)).all()
+    post_ids = itertools.cycle(page_post_ids)
+    author_id = next(user_ids)
+    pagination = PaginationParams(limit=PAGE_SIZE)
+    # A word of the seeded titles, matching some of the posts
+    search_query = session.scalars(select(Post.title).limit(1)).one().split()[0]
+
+    def new_user() -> UserCreate:
+        return UserCreate.model_validate(user_data.create_one(), from_attributes=True)
+
+    def new_post() -> PostCreate:
+        post = post_data.create_one()
+        # Raw tags, as clients send them, for the service to clean
+        tags = [f" {tag.upper()} " for tag in post.tags] + [""]
+        return PostCreate(
+            title=post.title, content=post.content, author_id=author_id, tags=tags
+        )
+
+    def fresh_id(ids: Iterator[Any]) -> Any:
+        # Reads load from the database, not from the identity map
+        session.expunge_all()
+        return next(ids)
+
+    yield Benchmark("user.get_all", lambda _: users.get_all(pagination=pagination))
+    yield Benchmark("user.get_by_id", users.get_by_id, setup=lambda: fresh_id(user_ids))
+    yield Benchmark("user.create", users.create, setup=new_user)
+    yield Benchmark(
+        "user.update",
+        lambda user_id: users.update(user_id, UserUpdate(height=180.0)),
+        setup=lambda: fresh_id(user_ids),
+    )
+    yield Benchmark(
+        "user.delete", users.delete, setup=lambda: user_factory.create_one().id
+    )
+    yield Benchmark("post.get_all", lambda _: posts.get_all(pagination=pagination))
+    yield Benchmark("post.get_by_id", posts.get_by_id, setup=lambda: fresh_id(post_ids))
+    yield Benchmark(
+        "post.get_many",
+        posts.get_many,
+        setup=lambda: fresh_id(itertools.repeat(page_post_ids)),
+    )
+    yield Benchmark(
+        "post.search",
+        lambda _: posts.search(search_query, pagination=PaginationParams(limit=20)),
+    )
+    yield Benchmark("post_service.create", post_service.create, setup=new_post)
+    yield Benchmark(
+        "post_service.clean_tags",
+        PostService._clean_tags,
+        setup=lambda: [" Python ", "python", "SQL", "", "  fastapi"],
+        number=10_000,
+    )
+
+    yield mapping(session, users)
+    yield mapping(session, posts)
+
+
+def mapping(
+    session: Session,
+    repository: UserSQLAlchemyRepository | PostSQLAlchemyRepository,
+) -> Benchmark:
+    stmt = repository._apply_loading_options(select(repository.model))
+    models = session.scalars(stmt.limit(PAGE_SIZE)).unique().all()
+    return Benchmark(
+        f"{repository.model.__name__.lower()}.to_domain",
+        lambda _: [repository._to_domain(model) for model in models],
+    )
+
+
+def run(sizes: list[int], repeat: int, output: Path) -> None:
+    results: dict[str, dict[str, float]] = {}
+    for size in sizes:
+        engine = seed(size)
+        with Session(engine) as session:
+            for benchmark in benchmarks(session):
+                name = f"{benchmark.name}[{size}]"
+                results[name] = benchmark.measure(repeat)
+                print(f"{name}: {results[name]['min'] * 1e6:,.1f} µs")
+        engine.dispose()
+
+    baseline = {
+        "created": datetime.now(UTC).isoformat(),
+        "python": platform.python_version(),
+        "sqlalchemy": sqlalchemy.__version__,
+        "repeat": repeat,
+        "results": results,
+    }
+    output.write_text(json.dumps(baseline, indent=2) + "\n")
+    print(f"Saved {len(results)} results to {output}")
+
+
+def compare(baseline_path: Path, current_path: Path, threshold: float) -> bool:
+    """Print the change of every benchmark, returning whether any regressed."""
+    baseline = json.loads(baseline_path.read_text())["results"]
+    current = json.loads(current_path.read_text())["results"]
+
+    regressed = False
+    for name in sorted(baseline.keys() | current.keys()):
+        if name not in current or name not in baseline:
+            print(f"{name}: only in {'baseline' if name in baseline else 'current'}")
+            continue
+
+        # The fastest sample is the least disturbed by the rest of the machine
+        ratio = current[name]["min"] / baseline[name]["min"]
+        status = ""
+        if ratio > 1 + threshold:
+            regressed = True
+            status = " REGRESSION"
+        print(f"{name}: {ratio:.2f}x{status}")
+    return regressed
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.suite")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="Run and save a baseline.")
+    run_parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000])
+    run_parser.add_argument("--repeat", type=int, default=10)
+    run_parser.add_argument("--output", type=Path, required=True)
+
+    compare_parser = commands.add_parser("compare", help="Compare two baselines.")
+    compare_parser.add_argument("baseline", type=Path)
+    compare_parser.add_argument("current", type=Path)
+    compare_parser.add_argument(
+        "--threshold", type=float, default=0.25, help="Tolerated slowdown ratio."
+    )
+
+    args = parser.parse_args(argv)
+    if args.command == "run":
+        run(args.sizes, repeat=args.repeat, output=args.output)
+    elif compare(args.baseline, args.current, threshold=args.threshold):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
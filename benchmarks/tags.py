@@ -0,0 +1,113 @@
+"""
+Latency of tag-filtered post listings as the number of posts grows.
+
+    python -m benchmarks.tags --sizes 1000 10000 100000
+
+Every size gets a fresh in-memory SQLite database seeded through
+`app.factories`, where the same number of posts carry two rare tags. The
+first page of the filtered listing, counted, is timed with the
+(tag_id, post_id) index of `post_tags`, then without it. With the index, the
+latency follows the number of tagged posts and stays flat across sizes.
+"""
+
+import argparse
+import random
+import statistics
+import time
+import uuid
+from collections.abc import Callable
+
+from sqlalchemy import Engine, Index, StaticPool, create_engine, insert, select
+from sqlalchemy.orm import Session
+
+from app.domain.models import CountMode, PaginationParams, PostQuerySpec, TagMatch
+from app.factories.seed import Seeder
+from app.infrastructure.models import Base, Post, Tag, post_tags
+from app.infrastructure.repositories.post import PostSQLAlchemyRepository
+
+TAGGED_POSTS = 100
+# Tags of the tagged posts: the first on all of them, the second on half
+TAGS = ("benchmark-any", "benchmark-half")
+
+
+def seed(size: int) -> Engine:
+    random.seed(size)
+    engine = create_engine("sqlite://", poolclass=StaticPool)
+    Base.metadata.create_all(engine)
+    with Session(engine) as session:
+        seeder = Seeder(session, author_pool_size=min(size, 1000))
+        seeder.seed_users(min(size, 1000))
+        seeder.seed_posts(size)
+
+        post_ids = session.scalars(select(Post.id)).all()
+        tagged = random.sample(post_ids, min(TAGGED_POSTS, len(post_ids)))
+        tag_ids = [uuid.uuid4() for _ in TAGS]
+        session.execute(
+            insert(Tag),
+            [
+                {"id": tag_id, "name": name}
+                for tag_id, name in zip(tag_ids, TAGS, strict=True)
+            ],
+        )
+        session.execute(
+            insert(post_tags),
+            [{"post_id": post_id, "tag_id": tag_ids[0]} for post_id in tagged]
+            + [{"post_id": post_id, "tag_id": tag_ids[1]} for post_id in tagged[::2]],
+        )
+        session.commit()
+    return engine
+
+
+def measure(call: Callable[[], object], repeat: int, number: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            call()
+        samples.append((time.perf_counter() - start) / number)
+    return statistics.median(samples)
+
+
+def listings(session: Session) -> dict[str, Callable[[], object]]:
+    repository = PostSQLAlchemyRepository(session)
+    pagination = PaginationParams(limit=20, after="", count=CountMode.EXACT)
+    any_spec = PostQuerySpec(tags=[TAGS[0]])
+    all_spec = PostQuerySpec(tags=list(TAGS), tag_match=TagMatch.ALL)
+    return {
+        "any": lambda: repository.get_all(pagination=pagination, spec=any_spec),
+        "all": lambda: repository.get_all(pagination=pagination, spec=all_spec),
+    }
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.tags")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10_000])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--number", type=int, default=20)
+    args = parser.parse_args(argv)
+
+    index = next(
+        index
+        for index in post_tags.indexes
+        if index.name == "ix_post_tags_tag_id_post_id"
+    )
+    print(f"{'posts':>10}{'index':>8}{'any':>12}{'all':>12}")
+    for size in args.sizes:
+        engine = seed(size)
+        for indexed in (True, False):
+            if not indexed:
+                Index.drop(index, engine)
+            with Session(engine) as session:
+                timings = {
+                    name: measure(call, args.repeat, args.number)
+                    for name, call in listings(session).items()
+                }
+            print(
+                f"{size:>10}{'yes' if indexed else 'no':>8}"
+                + "".join(f"{timings[name] * 1e6:>9,.0f} µs" for name in timings)
+            )
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+import json
+import uuid
+
+import pytest
+from fastapi import status
+from httpx import AsyncClient
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_user_lifecycle(async_client: AsyncClient) -> None:
+    user_data = {
+        "username": "johndoe",
+        "email": "john@example.com",
+        "level": 1,
+        "height": 180.0,
+        "birth_date": "1990-01-01",
+    }
+
+    update_data = {"height": 190.0}
+
+    create_response = await async_client.post("/users/", json=user_data)
+    user_id = create_response.json()["id"]
+    update_response = await async_client.put(f"/users/{user_id}", json=update_data)
+    list_response = await async_client.get("/users/")
+    delete_response = await async_client.delete(f"/users/{user_id}")
+    get_response = await async_client.get(f"/users/{user_id}")
+
+    assert create_response.status_code == status.HTTP_201_CREATED
+    assert update_response.status_code == status.HTTP_200_OK
+    assert update_response.json()["height"] == update_data["height"]
+    assert list_response.status_code == status.HTTP_200_OK
+    assert [user["id"] for user in list_response.json()["items"]] == [user_id]
+    assert delete_response.status_code == status.HTTP_204_NO_CONTENT
+    assert get_response.status_code == status.HTTP_404_NOT_FOUND
+
+
+async def test_create_post_with_author_and_tags(async_client: AsyncClient) -> None:
+    user_response = await async_client.post(
+        "/users/",
+        json={
+            "username": "johndoe",
+            "email": "john@example.com",
+            "level": 1,
+            "height": 180.0,
+            "birth_date": "1990-01-01",
+        },
+    )
+    author_id = user_response.json()["id"]
+    post_data = {
+        "title": "  Test Post ",
+        "content": "This is a test post content",
+        "author_id": author_id,
+        "tags": ["Python", "python ", "FastAPI"],
+    }
+
+    create_response = await async_client.post("/posts/", json=post_data)
+    user = (await async_client.get(f"/users/{author_id}")).json()
+
+    assert create_response.status_code == status.HTTP_201_CREATED
+    post = create_response.json()
+    assert post["title"] == "Test Post"
+    assert set(post["tags"]) == {"python", "fastapi"}
+    assert [user_post["id"] for user_post in user["posts"]] == [post["id"]]
+    assert set(user["posts"][0]["tags"]) == {"python", "fastapi"}
+
+
+async def test_get_post_not_found(async_client: AsyncClient) -> None:
+    response = await async_client.get(f"/posts/{uuid.uuid4()}")
+
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+
+
+async def test_export_users(async_client: AsyncClient) -> None:
+    count = 3
+    for i in range(count):
+        await async_client.post(
+            "/users/",
+            json={
+                "username": f"user{i}",
+                "email": f"user{i}@example.com",
+                "level": 1,
+                "height": 180.0,
+                "birth_date": "1990-01-01",
+            },
+        )
+
+    response = await async_client.get("/users/export")
+
+    assert response.status_code == status.HTTP_200_OK
+    users = [json.loads(line) for line in response.text.splitlines()]
+    assert sorted(user["username"] for user in users) == [
+        f"user{i}" for i in range(count)
+    ]
+
+
+async def test_server_timing(async_client: AsyncClient) -> None:
+    user_data = {
+        "username": "johndoe",
+        "email": "john@example.com",
+        "level": 1,
+        "height": 180.0,
+        "birth_date": "1990-01-01",
+    }
+    user = (await async_client.post("/users/", json=user_data)).json()
+
+    response = await async_client.get(f"/users/{user['id']}")
+
+    assert response.status_code == status.HTTP_200_OK
+    # Statements run through AsyncSession.run_sync are counted too
+    assert '"0 statements' not in response.headers["server-timing"]
+    assert "statements, " in response.headers["server-timing"]
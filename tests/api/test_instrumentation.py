@@ -0,0 +1,102 @@
+import logging
+import re
+
+import pytest
+from fastapi import status
+from fastapi.testclient import TestClient
+
+from app.api.instrumentation import QueryBudgetExceededError
+from app.core.config import Settings
+from app.factories.post import PostSQLAlchemyFactory
+from app.factories.user import UserSQLAlchemyFactory
+
+USER_DATA = {
+    "username": "johndoe",
+    "email": "john@example.com",
+    "level": 1,
+    "height": 180.0,
+    "birth_date": "1990-01-01",
+}
+
+
+def statements(response_timing: str) -> int:
+    match = re.search(r'db;dur=[\d.]+;desc="(\d+) statements', response_timing)
+    assert match
+    return int(match.group(1))
+
+
+def test_server_timing(
+    user_sqlalchemy_factory: UserSQLAlchemyFactory, client: TestClient
+) -> None:
+    user = user_sqlalchemy_factory.create_one()
+
+    response = client.get(f"/users/{user.id}")
+
+    assert response.status_code == status.HTTP_200_OK
+    timing = response.headers["server-timing"]
+    assert statements(timing) > 0
+    assert ", total;dur=" in timing
+
+
+def test_query_budget_is_per_route(
+    post_sqlalchemy_factory: PostSQLAlchemyFactory, client: TestClient
+) -> None:
+    # Route budgets do not grow with the number of rows
+    post_sqlalchemy_factory.create_many(20)
+
+    response = client.get("/posts/")
+
+    assert response.status_code == status.HTTP_200_OK
+
+
+def test_route_budget_overrides_default(
+    user_sqlalchemy_factory: UserSQLAlchemyFactory,
+    client: TestClient,
+    settings: Settings,
+) -> None:
+    settings.QUERY_BUDGET = 1
+    user = user_sqlalchemy_factory.create_one()
+
+    response = client.get(f"/users/{user.id}")
+
+    assert response.status_code == status.HTTP_200_OK
+
+
+def test_query_budget_strict(client: TestClient, settings: Settings) -> None:
+    settings.QUERY_BUDGET = 1
+
+    with pytest.raises(QueryBudgetExceededError):
+        client.post("/users/", json=USER_DATA)
+
+
+def test_query_budget_warning(
+    client: TestClient, settings: Settings, caplog: pytest.LogCaptureFixture
+) -> None:
+    settings.QUERY_BUDGET = 1
+    settings.QUERY_BUDGET_STRICT = False
+
+    response = client.post("/users/", json=USER_DATA)
+
+    assert response.status_code == status.HTTP_201_CREATED
+    assert "POST /users/ ran" in caplog.text
+    assert "over its budget of 1" in caplog.text
+
+
+def test_query_log(
+    user_sqlalchemy_factory: UserSQLAlchemyFactory,
+    client: TestClient,
+    settings: Settings,
+    caplog: pytest.LogCaptureFixture,
+) -> None:
+    settings.QUERY_LOG = True
+    user = user_sqlalchemy_factory.create_one()
+
+    with caplog.at_level(logging.INFO, logger="app.api.instrumentation"):
+        response = client.get(f"/users/{user.id}")
+
+    assert response.status_code == status.HTTP_200_OK
+    (record,) = caplog.records
+    assert record.route == "GET /users/{user_id}"  # type: ignore[attr-defined]
+    assert record.statements == statements(  # type: ignore[attr-defined]
+        response.headers["server-timing"]
+    )
@@ -0,0 +1,51 @@
+from fastapi import status
+from fastapi.testclient import TestClient
+
+from app.api.dependencies import get_entity_cache
+from app.core.config import Settings
+from app.factories.user import UserSQLAlchemyFactory
+from app.infrastructure.cache import EntityCache
+from app.main import app
+
+
+def test_get_cache_stats_disabled(client: TestClient) -> None:
+    response = client.get("/metrics/cache")
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["enabled"] is False
+
+
+def test_get_cache_stats(
+    user_sqlalchemy_factory: UserSQLAlchemyFactory,
+    client: TestClient,
+    entity_cache: EntityCache,
+) -> None:
+    app.dependency_overrides[get_entity_cache] = lambda: entity_cache
+    user = user_sqlalchemy_factory.create_one()
+    for _ in range(3):
+        client.get(f"/users/{user.id}")
+
+    response = client.get("/metrics/cache")
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json() == {
+        "enabled": True,
+        "hits": 2,
+        "misses": 1,
+        "negative_hits": 0,
+        "invalidations": 0,
+    }
+
+
+def test_get_pool_stats(client: TestClient, settings: Settings) -> None:
+    pool_size = 3
+    settings.DATABASE_POOL_SIZE = pool_size
+
+    response = client.get("/metrics/pool")
+
+    assert response.status_code == status.HTTP_200_OK
+    data = response.json()
+    assert data["size"] == pool_size
+    assert data["checked_out"] == 0
+    assert data["overflow"] == 0
+    assert data["timeouts"] == 0
@@ -1,9 +1,14 @@
+import json
 import uuid
 
+import pytest
 from fastapi import status
 from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
 
+from app.domain.constants import BatchConstants, PaginationConstants
 from app.factories.post import PostSQLAlchemyFactory
+from app.factories.seed import Seeder
 from app.factories.user import UserSQLAlchemyFactory
 
 
@@ -41,6 +46,166 @@ def test_get_posts_with_pagination(
     assert len(data["items"]) == limit
 
 
+def test_get_posts_with_fields(
+    post_sqlalchemy_factory: PostSQLAlchemyFactory,
+    client: TestClient,
+) -> None:
+    count = 3
+    post_sqlalchemy_factory.create_many(count)
+
+    response = client.get("/posts/?fields=id,title")
+
+    assert response.status_code == status.HTTP_200_OK
+    data = response.json()
+    assert data["total"] == count
+    assert all(post.keys() == {"id", "title"} for post in data["items"])
+
+
+def test_get_posts_with_tags(
+    user_sqlalchemy_factory: UserSQLAlchemyFactory,
+    client: TestClient,
+) -> None:
+    author_id = str(user_sqlalchemy_factory.create_one().id)
+    for tags in (["sql"], ["sql", "python"], ["rust"]):
+        post_data = {"title": "T", "content": "C", "author_id": author_id, "tags": tags}
+        client.post("/posts/", json=post_data)
+
+    tagged_posts = 2
+    any_response = client.get("/posts/?tag=sql&tag=python")
+    all_response = client.get("/posts/?tag=sql&tag=python&tag_match=all")
+
+    assert any_response.status_code == status.HTTP_200_OK
+    assert any_response.json()["total"] == tagged_posts
+    assert all_response.status_code == status.HTTP_200_OK
+    assert [set(post["tags"]) for post in all_response.json()["items"]] == [
+        {"python", "sql"}
+    ]
+    assert any_response.headers["etag"] != all_response.headers["etag"]
+
+
+def test_get_posts_by_author(
+    post_sqlalchemy_factory: PostSQLAlchemyFactory,
+    client: TestClient,
+) -> None:
+    post = post_sqlalchemy_factory.create_one()
+    post_sqlalchemy_factory.create_one()
+
+    response = client.get(f"/posts/?filter=author_id:{post.author_id}")
+
+    assert response.status_code == status.HTTP_200_OK
+    assert [item["id"] for item in response.json()["items"]] == [str(post.id)]
+
+
+@pytest.mark.parametrize(
+    ("fields", "invalid_fields"),
+    [
+        ("title,secret", ["secret"]),
+        # A field of the domain object that responses do not expose
+        ("title,author", ["author"]),
+    ],
+)
+def test_get_posts_with_invalid_fields(
+    client: TestClient, fields: str, invalid_fields: list[str]
+) -> None:
+    response = client.get(f"/posts/?fields={fields}")
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert response.json()["fields"] == invalid_fields
+
+
+def test_get_posts_with_cursor(
+    post_sqlalchemy_factory: PostSQLAlchemyFactory,
+    client: TestClient,
+) -> None:
+    total_posts = 15
+    limit = 10
+    post_sqlalchemy_factory.create_many(total_posts)
+
+    first_response = client.get(f"/posts/?after=&limit={limit}")
+    first_page = first_response.json()
+    second_response = client.get(
+        f"/posts/?after={first_page['next_cursor']}&limit={limit}"
+    )
+    second_page = second_response.json()
+
+    assert first_response.status_code == status.HTTP_200_OK
+    assert len(first_page["items"]) == limit
+    assert first_page["next_cursor"]
+    assert second_response.status_code == status.HTTP_200_OK
+    assert len(second_page["items"]) == total_posts - limit
+    assert second_page["next_cursor"] is None
+    first_ids = {post["id"] for post in first_page["items"]}
+    assert first_ids.isdisjoint(post["id"] for post in second_page["items"])
+
+
+def test_get_posts_with_invalid_cursor(client: TestClient) -> None:
+    response = client.get("/posts/?after=invalid")
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+def test_search_posts(
+    post_sqlalchemy_factory: PostSQLAlchemyFactory,
+    client: TestClient,
+) -> None:
+    total_posts = 3
+    limit = 2
+    for _ in range(total_posts):
+        post_sqlalchemy_factory.create_one(title="T", content="Full-text search")
+    post_sqlalchemy_factory.create_one(title="T", content="Something else")
+
+    first_response = client.get(f"/posts/search?q=search&limit={limit}")
+    first_page = first_response.json()
+    second_response = client.get(
+        f"/posts/search?q=search&limit={limit}&after={first_page['next_cursor']}"
+    )
+    second_page = second_response.json()
+
+    assert first_response.status_code == status.HTTP_200_OK
+    assert first_page["total"] is None
+    assert len(first_page["items"]) == limit
+    assert first_page["items"][0]["snippet"] == "Full-text <mark>search</mark>"
+    assert second_response.status_code == status.HTTP_200_OK
+    assert len(second_page["items"]) == total_posts - limit
+    assert second_page["next_cursor"] is None
+
+
+def test_search_posts_with_fields(
+    post_sqlalchemy_factory: PostSQLAlchemyFactory,
+    client: TestClient,
+) -> None:
+    post_sqlalchemy_factory.create_one(title="T", content="Full-text search")
+
+    response = client.get("/posts/search?q=search&fields=id,title")
+
+    assert response.status_code == status.HTTP_200_OK
+    items = response.json()["items"]
+    assert items[0].keys() == {"id", "title", "rank", "snippet"}
+
+
+def test_search_posts_without_query(client: TestClient) -> None:
+    response = client.get("/posts/search?q=")
+
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+
+def test_export_posts(
+    post_sqlalchemy_factory: PostSQLAlchemyFactory,
+    client: TestClient,
+) -> None:
+    created_posts = post_sqlalchemy_factory.create_many(3)
+
+    response = client.get("/posts/export?fields=title,tags")
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["content-type"] == "application/x-ndjson"
+    posts = [json.loads(line) for line in response.text.splitlines()]
+    assert sorted(post["id"] for post in posts) == sorted(
+        str(post.id) for post in created_posts
+    )
+    assert all(post.keys() == {"id", "title", "tags"} for post in posts)
+
+
 def test_get_post(
     post_sqlalchemy_factory: PostSQLAlchemyFactory,
     client: TestClient,
@@ -58,6 +223,22 @@ def test_get_post(
     assert set(post["tags"]) == set(created_post.tags)
 
 
+def test_get_post_not_modified(
+    post_sqlalchemy_factory: PostSQLAlchemyFactory,
+    client: TestClient,
+) -> None:
+    created_post = post_sqlalchemy_factory.create_one()
+    response = client.get(f"/posts/{created_post.id}")
+    etag = response.headers["etag"]
+
+    response = client.get(
+        f"/posts/{created_post.id}", headers={"If-None-Match": f'W/{etag}, "x"'}
+    )
+
+    assert response.status_code == status.HTTP_304_NOT_MODIFIED
+    assert response.headers["etag"] == etag
+
+
 def test_get_post_not_found(client: TestClient) -> None:
     post_id = uuid.uuid4()
 
@@ -118,6 +299,89 @@ def test_create_post_too_many_tags(
     assert response.status_code == status.HTTP_400_BAD_REQUEST
 
 
+def test_get_posts_batch(
+    post_sqlalchemy_factory: PostSQLAlchemyFactory,
+    client: TestClient,
+) -> None:
+    post = post_sqlalchemy_factory.create_one()
+    missing_id = uuid.uuid4()
+
+    response = client.get(
+        f"/posts/batch-get?ids={missing_id}&ids={post.id}&fields=id,title"
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json() == {
+        "found": 1,
+        "missing": 1,
+        "items": [
+            {"id": str(missing_id), "found": False, "item": None},
+            {
+                "id": str(post.id),
+                "found": True,
+                "item": {"id": str(post.id), "title": post.title},
+            },
+        ],
+    }
+
+
+def test_post_posts_batch(
+    user_sqlalchemy_factory: UserSQLAlchemyFactory,
+    client: TestClient,
+) -> None:
+    count = 500
+    author_id = str(user_sqlalchemy_factory.create_one().id)
+    posts_data = [
+        {"title": f"Post {i}", "content": "C", "author_id": author_id, "tags": ["sql"]}
+        for i in range(count)
+    ]
+    created = client.post("/posts/bulk", json=posts_data).json()["items"]
+    post_ids = [item["item"]["id"] for item in reversed(created)]
+
+    # Within the query budget of the route, enforced by the test settings
+    response = client.post("/posts/batch-get", json=post_ids)
+
+    assert response.status_code == status.HTTP_200_OK
+    data = response.json()
+    assert data["found"] == count
+    assert [item["item"]["id"] for item in data["items"]] == post_ids
+    assert data["items"][0]["item"]["tags"] == ["sql"]
+
+
+def test_post_posts_batch_too_many_ids(client: TestClient) -> None:
+    post_ids = [str(uuid.uuid4()) for _ in range(BatchConstants.MAX_IDS + 1)]
+
+    response = client.post("/posts/batch-get", json=post_ids)
+
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+
+def test_create_posts_bulk(
+    user_sqlalchemy_factory: UserSQLAlchemyFactory,
+    client: TestClient,
+) -> None:
+    user = user_sqlalchemy_factory.create_one()
+    posts_data = [
+        {
+            "title": f"Test Post {i}",
+            "content": "This is a test post content",
+            "author_id": str(user.id),
+            "tags": ["test", "python"],
+        }
+        for i in range(3)
+    ]
+
+    response = client.post("/posts/bulk", json=posts_data)
+
+    assert response.status_code == status.HTTP_200_OK
+    data = response.json()
+    assert data["created"] == len(posts_data)
+    assert data["failed"] == 0
+    for result, post_data in zip(data["items"], posts_data, strict=True):
+        assert result["item"]["title"] == post_data["title"]
+        assert set(result["item"]["tags"]) == set(post_data["tags"])
+
+
 def test_update_post(
     post_sqlalchemy_factory: PostSQLAlchemyFactory,
     client: TestClient,
@@ -162,3 +426,26 @@ def test_delete_post_not_found(client: TestClient) -> None:
     response = client.delete(f"/posts/{post_id}")
 
     assert response.status_code == status.HTTP_404_NOT_FOUND
+
+
+@pytest.mark.parametrize("headers", [{}, {"If-None-Match": '"stale"'}])
+def test_get_posts_at_max_limit(
+    session: Session, client: TestClient, headers: dict[str, str]
+) -> None:
+    limit = PaginationConstants.MAX_LIMIT
+    seeder = Seeder(session, author_pool_size=limit + 1)
+    seeder.seed_users(limit + 1)
+    seeder.seed_posts(limit + 1)
+
+    # Within the query budget of the route, enforced by the test settings
+    response = client.get(f"/posts/?limit={limit}", headers=headers)
+
+    assert response.status_code == status.HTTP_200_OK
+    assert len(response.json()["items"]) == limit
+    assert response.json()["has_more"] is True
+
+
+def test_get_posts_over_max_limit(client: TestClient) -> None:
+    response = client.get(f"/posts/?limit={PaginationConstants.MAX_LIMIT + 1}")
+
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
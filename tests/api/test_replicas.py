@@ -0,0 +1,77 @@
+import datetime
+import uuid
+
+from fastapi import status
+from fastapi.testclient import TestClient
+from sqlalchemy import Engine
+from sqlalchemy.orm import Session
+
+from app.api.dependencies import get_entity_cache
+from app.api.replicas import RECENT_WRITE_COOKIE
+from app.infrastructure.cache import EntityCache, LRUCache
+from app.infrastructure.models import User
+from app.main import app
+
+
+def test_reads_go_to_replica(replica_client: TestClient) -> None:
+    user_data = {
+        "username": "johndoe",
+        "email": "john@example.com",
+        "level": 1,
+        "height": 180.0,
+        "birth_date": "1990-01-01",
+    }
+    response = replica_client.post("/users/", json=user_data)
+    assert response.status_code == status.HTTP_201_CREATED
+    assert RECENT_WRITE_COOKIE in response.cookies
+    user_id = response.json()["id"]
+
+    # The client that wrote reads from the primary
+    response = replica_client.get(f"/users/{user_id}")
+    assert response.status_code == status.HTTP_200_OK
+
+    # Other clients read from the replica, which is not replicated here
+    replica_client.cookies.clear()
+    response = replica_client.get(f"/users/{user_id}")
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+
+
+def test_failed_write_keeps_reading_from_replica(replica_client: TestClient) -> None:
+    response = replica_client.put(f"/users/{uuid.uuid4()}", json={"height": 180.0})
+
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+    assert RECENT_WRITE_COOKIE not in response.cookies
+
+
+def test_replica_reads_do_not_fill_entity_cache(
+    primary_engine: Engine, replica_engine: Engine, replica_client: TestClient
+) -> None:
+    cache = EntityCache(backend=LRUCache())
+    app.dependency_overrides[get_entity_cache] = lambda: cache
+    user_id = uuid.uuid4()
+    height, new_height = 180.0, 190.0
+    # The replica has the user, but not the update below yet
+    for engine in (primary_engine, replica_engine):
+        with Session(engine) as session:
+            session.add(
+                User(
+                    id=user_id,
+                    username="johndoe",
+                    email="john@example.com",
+                    level=1,
+                    height=height,
+                    birth_date=datetime.date(1990, 1, 1),
+                )
+            )
+            session.commit()
+
+    response = replica_client.put(f"/users/{user_id}", json={"height": new_height})
+    assert response.status_code == status.HTTP_200_OK
+
+    # Another client reads the stale user from the replica
+    response = TestClient(app).get(f"/users/{user_id}")
+    assert response.json()["height"] == height
+
+    # The client that wrote reads it from the primary, not from the cache
+    response = replica_client.get(f"/users/{user_id}")
+    assert response.json()["height"] == new_height
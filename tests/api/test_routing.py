@@ -0,0 +1,44 @@
+from app.api.routing import response_include
+from app.api.schemas import (
+    BulkResponse,
+    PaginatedResponse,
+    PostResponse,
+    UserResponse,
+)
+
+
+def test_response_include() -> None:
+    post_include = {
+        "id": True,
+        "title": True,
+        "content": True,
+        "author_id": True,
+        "tags": True,
+    }
+
+    assert response_include(PostResponse) == post_include
+    assert response_include(PaginatedResponse[PostResponse]) == {
+        "total": True,
+        "limit": True,
+        "items": {"__all__": post_include},
+        "has_more": True,
+        "next_cursor": True,
+    }
+    assert response_include(BulkResponse[PostResponse])["items"] == {
+        "__all__": {"index": True, "item": post_include, "error": True}
+    }
+
+
+def test_response_include_sparse_fieldset() -> None:
+    sparse = (PostResponse, frozenset({"id", "title"}))
+
+    assert response_include(PaginatedResponse[PostResponse], sparse)["items"] == {
+        "__all__": {"id": True, "title": True}
+    }
+    # Only objects of the sparse model are trimmed
+    assert response_include(UserResponse, sparse)["posts"] == {
+        "__all__": {"id": True, "title": True}
+    }
+    assert response_include(UserResponse, sparse).keys() == (
+        UserResponse.model_fields.keys()
+    )
@@ -1,9 +1,18 @@
 import uuid
 
+import pytest
 from fastapi import status
 from fastapi.testclient import TestClient
+from sqlalchemy import update
+from sqlalchemy.orm import Session
 
+from app.api.schemas import PaginatedResponse, PostResponse, UserResponse
+from app.domain.constants import PaginationConstants
+from app.factories.post import PostSQLAlchemyFactory
+from app.factories.seed import Seeder
 from app.factories.user import UserSQLAlchemyFactory
+from app.infrastructure.models import User
+from tests.fixtures.database import QueryCounter
 
 
 def test_get_users(
@@ -22,6 +31,133 @@ def test_get_users(
     assert len(data["items"]) == count
 
 
+def test_get_users_with_filter_and_sort(
+    user_sqlalchemy_factory: UserSQLAlchemyFactory,
+    client: TestClient,
+) -> None:
+    for level in (10, 20, 30, 40):
+        user_sqlalchemy_factory.create_one(level=level)
+
+    response = client.get(
+        "/users/?filter=level:gt:10&filter=level:lte:30&sort=-level,height"
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    assert [user["level"] for user in response.json()["items"]] == [30, 20]
+
+
+def test_get_users_with_unsupported_filter(client: TestClient) -> None:
+    response = client.get("/users/?filter=email:a@example.com")
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert response.json()["field"] == "email"
+
+
+def test_get_users_with_malformed_query(client: TestClient) -> None:
+    assert client.get("/users/?filter=level").status_code == (
+        status.HTTP_422_UNPROCESSABLE_ENTITY
+    )
+    assert client.get("/users/?filter=level:like:3").status_code == (
+        status.HTTP_422_UNPROCESSABLE_ENTITY
+    )
+    assert client.get("/users/?sort=level,,height").status_code == (
+        status.HTTP_422_UNPROCESSABLE_ENTITY
+    )
+
+
+def test_get_users_matches_response_model(
+    post_sqlalchemy_factory: PostSQLAlchemyFactory,
+    client: TestClient,
+) -> None:
+    post_sqlalchemy_factory.create_one()
+
+    response = client.get("/users/")
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["content-type"] == "application/json"
+    data = response.json()
+    assert data.keys() == PaginatedResponse[UserResponse].model_fields.keys()
+    user = data["items"][0]
+    assert user.keys() == UserResponse.model_fields.keys()
+    # Posts of the domain object also carry an author, which is not exposed
+    assert user["posts"][0].keys() == PostResponse.model_fields.keys()
+    assert PaginatedResponse[UserResponse].model_validate(data)
+
+
+def test_get_user_with_fields(
+    post_sqlalchemy_factory: PostSQLAlchemyFactory,
+    client: TestClient,
+) -> None:
+    created_post = post_sqlalchemy_factory.create_one()
+
+    response = client.get(f"/users/{created_post.author_id}?fields=username,posts")
+
+    assert response.status_code == status.HTTP_200_OK
+    data = response.json()
+    assert data.keys() == {"id", "username", "posts"}
+    assert data["posts"][0]["id"] == str(created_post.id)
+
+
+def test_get_user_not_modified(
+    user_sqlalchemy_factory: UserSQLAlchemyFactory,
+    client: TestClient,
+) -> None:
+    created_user = user_sqlalchemy_factory.create_one()
+    response = client.get(f"/users/{created_user.id}")
+    etag = response.headers["etag"]
+
+    response = client.get(f"/users/{created_user.id}", headers={"If-None-Match": etag})
+
+    assert response.status_code == status.HTTP_304_NOT_MODIFIED
+    assert response.headers["etag"] == etag
+    assert not response.content
+
+    client.put(f"/users/{created_user.id}", json={"height": 180.0})
+    response = client.get(f"/users/{created_user.id}", headers={"If-None-Match": etag})
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["etag"] != etag
+
+
+def test_get_users_reads_versions_only_when_conditional(
+    post_sqlalchemy_factory: PostSQLAlchemyFactory,
+    client: TestClient,
+    query_counter: QueryCounter,
+) -> None:
+    post_sqlalchemy_factory.create_many(3)
+    query_counter.count = 0
+    response = client.get("/users/")
+    queries = query_counter.count
+    query_counter.count = 0
+
+    conditional_response = client.get("/users/", headers={"If-None-Match": '"x"'})
+
+    assert conditional_response.status_code == status.HTTP_200_OK
+    assert conditional_response.headers["etag"] == response.headers["etag"]
+    # The page version first, then the page as without the header
+    assert query_counter.count > queries
+
+
+def test_get_users_not_modified(
+    user_sqlalchemy_factory: UserSQLAlchemyFactory,
+    client: TestClient,
+) -> None:
+    user_sqlalchemy_factory.create_many(2)
+    response = client.get("/users/?limit=1")
+    etag = response.headers["etag"]
+
+    response = client.get("/users/?limit=1", headers={"If-None-Match": etag})
+    assert response.status_code == status.HTTP_304_NOT_MODIFIED
+
+    # Same rows in another representation
+    response = client.get("/users/?limit=1&fields=username")
+    assert response.headers["etag"] != etag
+
+    user_sqlalchemy_factory.create_one()
+    response = client.get("/users/?limit=1", headers={"If-None-Match": etag})
+    assert response.status_code == status.HTTP_200_OK
+
+
 def test_get_users_with_pagination(
     user_sqlalchemy_factory: UserSQLAlchemyFactory,
     client: TestClient,
@@ -40,6 +176,23 @@ def test_get_users_with_pagination(
     assert len(data["items"]) == limit
 
 
+def test_get_users_without_count(
+    user_sqlalchemy_factory: UserSQLAlchemyFactory,
+    client: TestClient,
+) -> None:
+    count = 3
+    limit = 2
+    user_sqlalchemy_factory.create_many(count)
+
+    response = client.get(f"/users/?limit={limit}&count=none")
+
+    assert response.status_code == status.HTTP_200_OK
+    data = response.json()
+    assert data["total"] is None
+    assert data["has_more"] is True
+    assert len(data["items"]) == limit
+
+
 def test_get_user(
     user_sqlalchemy_factory: UserSQLAlchemyFactory,
     client: TestClient,
@@ -60,6 +213,23 @@ def test_get_user(
     assert user["posts"] == []
 
 
+def test_get_user_with_include(
+    post_sqlalchemy_factory: PostSQLAlchemyFactory,
+    client: TestClient,
+) -> None:
+    created_post = post_sqlalchemy_factory.create_one()
+
+    full_response = client.get(f"/users/{created_post.author_id}")
+    minimal_response = client.get(f"/users/{created_post.author_id}?include=minimal")
+
+    assert full_response.status_code == status.HTTP_200_OK
+    assert [post["id"] for post in full_response.json()["posts"]] == [
+        str(created_post.id)
+    ]
+    assert minimal_response.status_code == status.HTTP_200_OK
+    assert minimal_response.json()["posts"] == []
+
+
 def test_get_user_not_found(client: TestClient) -> None:
     user_id = uuid.uuid4()
 
@@ -109,6 +279,43 @@ def test_create_user_duplicate_email(
     assert response.status_code == status.HTTP_409_CONFLICT
 
 
+def test_create_users_bulk(
+    user_sqlalchemy_factory: UserSQLAlchemyFactory,
+    client: TestClient,
+) -> None:
+    existing_user = user_sqlalchemy_factory.create_one()
+    users_data = [
+        {
+            "username": f"user{i}",
+            "email": email,
+            "level": 1,
+            "height": 180.0,
+            "birth_date": "1990-01-01",
+        }
+        for i, email in enumerate(["john@example.com", existing_user.email])
+    ]
+
+    response = client.post("/users/bulk", json=users_data)
+
+    assert response.status_code == status.HTTP_200_OK
+    data = response.json()
+    assert data["created"] == 1
+    assert data["failed"] == 1
+    created, failed = data["items"]
+    assert created["index"] == 0
+    assert created["item"]["email"] == users_data[0]["email"]
+    assert created["error"] is None
+    assert failed["index"] == 1
+    assert failed["item"] is None
+    assert failed["error"]
+
+
+def test_create_users_bulk_invalid_item(client: TestClient) -> None:
+    response = client.post("/users/bulk", json=[{"username": "johndoe"}])
+
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+
 def test_update_user(
     user_sqlalchemy_factory: UserSQLAlchemyFactory,
     client: TestClient,
@@ -136,6 +343,29 @@ def test_update_user_not_found(client: TestClient) -> None:
     assert response.status_code == status.HTTP_404_NOT_FOUND
 
 
+def test_update_user_changed_concurrently(
+    session: Session,
+    user_sqlalchemy_factory: UserSQLAlchemyFactory,
+    client: TestClient,
+) -> None:
+    created_user = user_sqlalchemy_factory.create_one()
+    # Another writer bumps the row after this session loaded it
+    loaded_user = session.get(User, created_user.id)
+    assert loaded_user
+    session.execute(
+        update(User)
+        .where(User.id == created_user.id)
+        .values(version=User.version + 1)
+        .execution_options(synchronize_session=False)
+    )
+
+    response = client.put(f"/users/{created_user.id}", json={"height": 190.0})
+
+    assert response.status_code == status.HTTP_409_CONFLICT
+    assert response.json()["id"] == str(created_user.id)
+    assert loaded_user.height == created_user.height
+
+
 def test_delete_user(
     user_sqlalchemy_factory: UserSQLAlchemyFactory,
     client: TestClient,
@@ -153,3 +383,26 @@ def test_delete_user_not_found(client: TestClient) -> None:
     response = client.delete(f"/users/{user_id}")
 
     assert response.status_code == status.HTTP_404_NOT_FOUND
+
+
+@pytest.mark.parametrize("headers", [{}, {"If-None-Match": '"stale"'}])
+def test_get_users_at_max_limit(
+    session: Session, client: TestClient, headers: dict[str, str]
+) -> None:
+    limit = PaginationConstants.MAX_LIMIT
+    seeder = Seeder(session, author_pool_size=limit + 1)
+    seeder.seed_users(limit + 1)
+    seeder.seed_posts(limit + 1)
+
+    # Within the query budget of the route, enforced by the test settings
+    response = client.get(f"/users/?limit={limit}", headers=headers)
+
+    assert response.status_code == status.HTTP_200_OK
+    assert len(response.json()["items"]) == limit
+    assert response.json()["has_more"] is True
+
+
+def test_get_users_over_max_limit(client: TestClient) -> None:
+    response = client.get(f"/users/?limit={PaginationConstants.MAX_LIMIT + 1}")
+
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
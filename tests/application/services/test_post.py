@@ -74,3 +74,35 @@ def test_create_post_too_many_tags(
         post_service.create(post_create)
 
     assert exc_info.value.max_tags == PostConstants.MAX_TAGS
+
+
+def test_create_many_posts(
+    user_sqlalchemy_factory: UserSQLAlchemyFactory,
+    post_service: PostService,
+) -> None:
+    created_user = user_sqlalchemy_factory.create_one()
+    posts_create = [
+        PostCreate(
+            title="  Test Post  ",
+            content="Test Content",
+            author_id=created_user.id,
+            tags=["Python  ", "python"],
+        ),
+        PostCreate(
+            title="Test Post",
+            content="Test Content",
+            author_id=created_user.id,
+            tags=[f"tag{i}" for i in range(PostConstants.MAX_TAGS + 1)],
+        ),
+    ]
+
+    result = post_service.create_many(posts_create)
+
+    assert result.created == 1
+    assert result.failed == 1
+    created, failed = result.items
+    assert created.item
+    assert created.item.title == "Test Post"
+    assert created.item.tags == ["python"]
+    assert failed.index == 1
+    assert failed.error == str(TooManyTagsError(PostConstants.MAX_TAGS))
@@ -1,4 +1,5 @@
 import datetime
+import uuid
 
 from app.application.dtos import UserCreate, UserUpdate
 from app.application.services.user import UserService
@@ -37,6 +38,25 @@ def test_get_by_id(
     assert user.posts == []
 
 
+def test_get_many(
+    user_sqlalchemy_factory: UserSQLAlchemyFactory,
+    user_service: UserService,
+) -> None:
+    created_user = user_sqlalchemy_factory.create_one()
+    missing_id = uuid.uuid4()
+
+    result = user_service.get_many([missing_id, created_user.id])
+
+    assert result.found == 1
+    assert result.missing == 1
+    assert [(item.id, item.found) for item in result.items] == [
+        (missing_id, False),
+        (created_user.id, True),
+    ]
+    assert result.items[0].item is None
+    assert result.items[1].item == user_service.get_by_id(created_user.id)
+
+
 def test_create_user(user_service: UserService) -> None:
     user_create = UserCreate(
         username="johndoe",
@@ -0,0 +1,43 @@
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from app.factories.seed import Seeder
+from app.infrastructure.models import Post, Tag, User, post_tags
+
+
+def test_seed_users_and_posts(session: Session) -> None:
+    users_count = 25
+    posts_count = 120
+    author_pool_size = 10
+    seeder = Seeder(session, chunk_size=50, author_pool_size=author_pool_size)
+
+    users_report = seeder.seed_users(users_count)
+    posts_report = seeder.seed_posts(posts_count)
+
+    assert users_report.rows == users_count
+    assert posts_report.rows == posts_count
+    assert session.scalar(select(func.count()).select_from(User)) == users_count
+    assert session.scalar(select(func.count()).select_from(Post)) == posts_count
+    authors = session.scalars(select(Post.author_id).distinct()).all()
+    assert len(authors) <= author_pool_size
+    posts_tags = session.execute(
+        select(post_tags.c.post_id, func.count()).group_by(post_tags.c.post_id)
+    ).all()
+    assert len(posts_tags) == posts_count
+    max_tags = 3
+    assert all(1 <= tags_count <= max_tags for _, tags_count in posts_tags)
+
+
+def test_seed_posts_reuses_existing_users_and_tags(session: Session) -> None:
+    users_count = 5
+    posts_count = 10
+    Seeder(session).seed_users(users_count)
+
+    # A second run must not insert tags that already exist
+    for _ in range(2):
+        Seeder(session, tag_pool_size=50).seed_posts(posts_count)
+
+    assert session.scalar(select(func.count()).select_from(User)) == users_count
+    assert session.scalar(select(func.count()).select_from(Post)) == 2 * posts_count
+    tag_names = session.scalars(select(Tag.name)).all()
+    assert len(tag_names) == len(set(tag_names))
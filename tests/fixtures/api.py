@@ -1,18 +1,70 @@
-from collections.abc import Iterator
+from collections.abc import AsyncIterator, Iterator
+from contextlib import nullcontext
 
 import pytest
 from fastapi.testclient import TestClient
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import Engine
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from app.api.dependencies import get_session
+from app.api.dependencies import (
+    get_database_uri,
+    get_replica_uris,
+    get_session,
+    get_session_factory,
+)
+from app.core.config import Settings, get_settings
 from app.main import app
 
 
 @pytest.fixture
-def client(session: Session) -> Iterator[TestClient]:
+def settings() -> Settings:
+    return Settings(
+        POSTGRES_USER="test",
+        POSTGRES_PASSWORD="test",
+        POSTGRES_SERVER="localhost",
+        POSTGRES_DB="test",
+        QUERY_BUDGET_STRICT=True,
+    )
+
+
+@pytest.fixture
+def client(session: Session, settings: Settings) -> Iterator[TestClient]:
     def get_session_override() -> Session:
         return session
 
+    app.dependency_overrides[get_settings] = lambda: settings
+    app.dependency_overrides[get_session] = get_session_override
+    app.dependency_overrides[get_session_factory] = lambda: lambda: nullcontext(session)
+    yield TestClient(app)
+    app.dependency_overrides.clear()
+
+
+@pytest.fixture
+async def async_client(
+    async_session: AsyncSession, settings: Settings
+) -> AsyncIterator[AsyncClient]:
+    def get_session_override() -> AsyncSession:
+        return async_session
+
+    app.dependency_overrides[get_settings] = lambda: settings
     app.dependency_overrides[get_session] = get_session_override
+    app.dependency_overrides[get_session_factory] = lambda: lambda: nullcontext(
+        async_session
+    )
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        yield client
+    app.dependency_overrides.clear()
+
+
+@pytest.fixture
+def replica_client(
+    primary_engine: Engine, replica_engine: Engine, settings: Settings
+) -> Iterator[TestClient]:
+    app.dependency_overrides[get_settings] = lambda: settings
+    app.dependency_overrides[get_database_uri] = lambda: str(primary_engine.url)
+    app.dependency_overrides[get_replica_uris] = lambda: (str(replica_engine.url),)
     yield TestClient(app)
     app.dependency_overrides.clear()
@@ -1,10 +1,14 @@
-from collections.abc import Iterator
+from collections.abc import AsyncIterator, Iterator
+from pathlib import Path
+from typing import Any
 
 import pytest
-from sqlalchemy import Engine, StaticPool, create_engine
+from sqlalchemy import Engine, StaticPool, create_engine, event
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine
 from sqlalchemy.orm import Session
 
 from app.infrastructure.models import Base
+from app.infrastructure.repositories.post import PostSQLAlchemyRepository
 
 
 @pytest.fixture
@@ -13,6 +17,9 @@ def engine() -> Engine:
         "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool
     )
     Base.metadata.create_all(engine)
+    # Every in-memory database has the same URL, hence cache keys
+    PostSQLAlchemyRepository.tag_cache.clear()
+    PostSQLAlchemyRepository.count_cache.clear()
     return engine
 
 
@@ -20,3 +27,62 @@ def engine() -> Engine:
 def session(engine: Engine) -> Iterator[Session]:
     with Session(engine) as session:
         yield session
+
+
+def _file_engine(path: Path) -> Iterator[Engine]:
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(engine)
+    yield engine
+    engine.dispose()
+
+
+# Two database files standing in for a primary and its read replica
+@pytest.fixture
+def primary_engine(tmp_path: Path) -> Iterator[Engine]:
+    yield from _file_engine(tmp_path / "primary.db")
+
+
+@pytest.fixture
+def replica_engine(tmp_path: Path) -> Iterator[Engine]:
+    yield from _file_engine(tmp_path / "replica.db")
+
+
+@pytest.fixture
+def anyio_backend() -> str:
+    return "asyncio"
+
+
+@pytest.fixture
+async def async_engine() -> AsyncIterator[AsyncEngine]:
+    engine = create_async_engine("sqlite+aiosqlite://", poolclass=StaticPool)
+    PostSQLAlchemyRepository.tag_cache.clear()
+    PostSQLAlchemyRepository.count_cache.clear()
+    async with engine.begin() as connection:
+        await connection.run_sync(Base.metadata.create_all)
+    yield engine
+    await engine.dispose()
+
+
+@pytest.fixture
+async def async_session(async_engine: AsyncEngine) -> AsyncIterator[AsyncSession]:
+    async with AsyncSession(async_engine) as session:
+        yield session
+
+
+class QueryCounter:
+    def __init__(self) -> None:
+        self.count = 0
+        self.statements: list[str] = []
+
+    def __call__(self, *args: Any) -> None:
+        # Arguments of `before_cursor_execute`: connection, cursor, statement...
+        self.count += 1
+        self.statements.append(args[2])
+
+
+@pytest.fixture
+def query_counter(engine: Engine) -> Iterator[QueryCounter]:
+    counter = QueryCounter()
+    event.listen(engine, "before_cursor_execute", counter)
+    yield counter
+    event.remove(engine, "before_cursor_execute", counter)
@@ -1,8 +1,21 @@
 import pytest
 from sqlalchemy.orm import Session
 
-from app.infrastructure.repositories.post import PostSQLAlchemyRepository
-from app.infrastructure.repositories.user import UserSQLAlchemyRepository
+from app.application.dtos import UserCreate, UserUpdate
+from app.domain.models import UserDomain
+from app.infrastructure.cache import EntityCache, LRUCache
+from app.infrastructure.repositories.cached import (
+    CachedPostRepository,
+    CachedRepository,
+)
+from app.infrastructure.repositories.post import (
+    PostSQLAlchemyRepository,
+    post_dependents,
+)
+from app.infrastructure.repositories.user import (
+    UserSQLAlchemyRepository,
+    user_dependents,
+)
 
 
 @pytest.fixture
@@ -13,3 +26,26 @@ def user_repository(session: Session) -> UserSQLAlchemyRepository:
 @pytest.fixture
 def post_repository(session: Session) -> PostSQLAlchemyRepository:
     return PostSQLAlchemyRepository(session=session)
+
+
+@pytest.fixture
+def entity_cache() -> EntityCache:
+    return EntityCache(backend=LRUCache(maxsize=100))
+
+
+@pytest.fixture
+def cached_user_repository(
+    user_repository: UserSQLAlchemyRepository, entity_cache: EntityCache
+) -> CachedRepository[UserDomain, UserCreate, UserUpdate]:
+    return CachedRepository(
+        user_repository, cache=entity_cache, dependents=user_dependents
+    )
+
+
+@pytest.fixture
+def cached_post_repository(
+    post_repository: PostSQLAlchemyRepository, entity_cache: EntityCache
+) -> CachedPostRepository:
+    return CachedPostRepository(
+        post_repository, cache=entity_cache, dependents=post_dependents
+    )
@@ -0,0 +1,112 @@
+import io
+import json
+from pathlib import Path
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.importer.pipeline import Importer
+from app.infrastructure.models import Post, Tag, User
+
+AUTHOR_ID = "11111111-1111-1111-1111-111111111111"
+UNKNOWN_AUTHOR_ID = "22222222-2222-2222-2222-222222222222"
+POST_ID = "33333333-3333-3333-3333-333333333333"
+
+
+def _write_users(path: Path) -> None:
+    path.write_text(
+        "id,username,email,level,height,is_active,birth_date\n"
+        f"{AUTHOR_ID},alice,alice@example.com,3,170.5,true,1990-01-01\n"
+        ",bob,bob@example.com,,180,,1985-05-05\n"
+        ",carol,alice@example.com,1,160,false,1991-02-02\n"
+        ",dave,dave@example.com,1,tall,true,1990-01-01\n"
+    )
+
+
+def test_import_users(session: Session, tmp_path: Path) -> None:
+    path = tmp_path / "users.csv"
+    _write_users(path)
+    errors = io.StringIO()
+    importer = Importer(session, batch_size=2, errors=errors)
+
+    report = importer.import_users(path)
+
+    expected_read = 4
+    expected_imported = 2
+    assert report.read == expected_read
+    assert report.imported == expected_imported
+    assert report.rejected == expected_read - expected_imported
+    users = {user.username: user for user in session.scalars(select(User))}
+    assert users.keys() == {"alice", "bob"}
+    # Empty cells take the defaults
+    assert users["bob"].level == 0
+    assert users["bob"].is_active is True
+    rejected = {
+        row["line"]: row["error"]
+        for row in map(json.loads, errors.getvalue().splitlines())
+    }
+    assert rejected.keys() == {4, 5}
+    assert rejected[4] == "User already exists."
+    assert rejected[5].startswith("height: Input should be a valid number")
+
+
+def test_import_posts(session: Session, tmp_path: Path) -> None:
+    users_path = tmp_path / "users.csv"
+    _write_users(users_path)
+    posts_path = tmp_path / "posts.ndjson"
+    posts = [
+        {"title": " Hello ", "content": "c", "author_id": AUTHOR_ID, "tags": ["SQL"]},
+        {"title": "Tags", "content": "c", "author_id": AUTHOR_ID, "tags": ["A", "a "]},
+        {"title": "Orphan", "content": "c", "author_id": UNKNOWN_AUTHOR_ID},
+        # Tags of CSV dumps
+        {
+            "title": "Many",
+            "content": "c",
+            "author_id": AUTHOR_ID,
+            "tags": "a|b|c|d|e|f",
+        },
+    ]
+    posts_path.write_text("\n".join(json.dumps(post) for post in posts) + "\nnope\n")
+    errors = io.StringIO()
+    importer = Importer(session, errors=errors)
+    importer.import_users(users_path)
+
+    report = importer.import_posts(posts_path)
+
+    expected_imported = 2
+    assert report.imported == expected_imported
+    titles = set(session.scalars(select(Post.title)))
+    assert titles == {"Hello", "Tags"}
+    assert set(session.scalars(select(Tag.name))) == {"sql", "a"}
+    tagged = session.scalars(select(Post).where(Post.title == "Tags")).one()
+    assert [tag.name for tag in tagged.tags] == ["a"]
+    rejected = {
+        row["line"]: row["error"]
+        for row in map(json.loads, errors.getvalue().splitlines())
+    }
+    assert rejected.keys() == {3, 4, 5}
+    assert rejected[3] == f"User {UNKNOWN_AUTHOR_ID} not found."
+    assert rejected[4] == "A post cannot have more than 5 tags"
+    assert rejected[5].startswith("row: Invalid JSON")
+
+
+def test_reimport_posts_keeps_existing_tags(session: Session, tmp_path: Path) -> None:
+    users_path = tmp_path / "users.csv"
+    _write_users(users_path)
+    importer = Importer(session, errors=io.StringIO())
+    importer.import_users(users_path)
+    post = {"id": POST_ID, "title": "T", "content": "c", "author_id": AUTHOR_ID}
+    first_path = tmp_path / "first.ndjson"
+    first_path.write_text(json.dumps({**post, "tags": ["kept"]}))
+    importer.import_posts(first_path)
+    second_path = tmp_path / "second.ndjson"
+    second_path.write_text(json.dumps({**post, "tags": ["kept", "rejected"]}))
+
+    report = importer.import_posts(second_path)
+
+    assert report.imported == 0
+    assert report.rejected == 1
+    # The rejected row neither tags the existing post nor creates its tags
+    assert set(session.scalars(select(Tag.name))) == {"kept"}
+    existing = session.scalars(select(Post)).one()
+    assert [tag.name for tag in existing.tags] == ["kept"]
@@ -0,0 +1,173 @@
+import uuid
+
+import pytest
+
+from app.application.dtos import PostCreate, PostUpdate, UserCreate, UserUpdate
+from app.domain.models import UserDomain, UserInclude
+from app.factories.post import PostSQLAlchemyFactory
+from app.infrastructure.cache import EntityCache
+from app.infrastructure.exceptions import EntityNotFoundError
+from app.infrastructure.repositories.cached import (
+    CachedPostRepository,
+    CachedRepository,
+)
+from app.infrastructure.repositories.user import UserSQLAlchemyRepository
+from tests.fixtures.database import QueryCounter
+
+CachedUserRepository = CachedRepository[UserDomain, UserCreate, UserUpdate]
+
+
+def test_get_by_id_reads_through(
+    post_sqlalchemy_factory: PostSQLAlchemyFactory,
+    cached_user_repository: CachedUserRepository,
+    entity_cache: EntityCache,
+    query_counter: QueryCounter,
+) -> None:
+    user_id = post_sqlalchemy_factory.create_one().author_id
+    user = cached_user_repository.get_by_id(user_id)
+    query_counter.count = 0
+
+    cached_user = cached_user_repository.get_by_id(user_id)
+
+    assert cached_user == user
+    assert query_counter.count == 0
+    assert entity_cache.stats.hits == 1
+    assert entity_cache.stats.misses == 1
+
+
+def test_get_version_of_cached_entity(
+    post_sqlalchemy_factory: PostSQLAlchemyFactory,
+    cached_user_repository: CachedUserRepository,
+    user_repository: UserSQLAlchemyRepository,
+    query_counter: QueryCounter,
+) -> None:
+    user_id = post_sqlalchemy_factory.create_one().author_id
+    version = cached_user_repository.get_version(user_id)
+    cached_user_repository.get_by_id(user_id)
+    query_counter.count = 0
+
+    cached_version = cached_user_repository.get_version(user_id)
+
+    assert query_counter.count == 0
+    assert cached_version == version == user_repository.get_version(user_id)
+
+
+def test_get_many_reads_misses_only(
+    post_sqlalchemy_factory: PostSQLAlchemyFactory,
+    cached_user_repository: CachedUserRepository,
+    query_counter: QueryCounter,
+) -> None:
+    cached_id, read_id = (
+        post.author_id for post in post_sqlalchemy_factory.create_many(2)
+    )
+    missing_id = uuid.uuid4()
+    cached_user_repository.get_by_id(cached_id)
+    query_counter.count = 0
+
+    users = cached_user_repository.get_many([read_id, cached_id, missing_id])
+    queries = query_counter.count
+    again = cached_user_repository.get_many([read_id, cached_id, missing_id])
+
+    assert [user.id if user else None for user in users] == [read_id, cached_id, None]
+    assert again == users
+    # The users not cached yet, then their posts and the tags of those
+    statements = 3
+    assert queries == statements
+    assert query_counter.count == queries
+
+
+def test_get_by_id_caches_each_variant(
+    post_sqlalchemy_factory: PostSQLAlchemyFactory,
+    cached_user_repository: CachedUserRepository,
+) -> None:
+    user_id = post_sqlalchemy_factory.create_one().author_id
+
+    user = cached_user_repository.get_by_id(user_id)
+    minimal_user = cached_user_repository.get_by_id(
+        user_id, include=UserInclude.MINIMAL
+    )
+
+    assert len(user.posts) == 1
+    assert minimal_user.posts == []
+
+
+def test_get_by_id_caches_not_found(
+    cached_user_repository: CachedUserRepository,
+    entity_cache: EntityCache,
+    query_counter: QueryCounter,
+) -> None:
+    user_id = uuid.uuid4()
+    with pytest.raises(EntityNotFoundError):
+        cached_user_repository.get_by_id(user_id)
+    query_counter.count = 0
+
+    with pytest.raises(EntityNotFoundError):
+        cached_user_repository.get_by_id(user_id)
+
+    assert query_counter.count == 0
+    assert entity_cache.stats.negative_hits == 1
+
+
+def test_update_invalidates_entity(
+    post_sqlalchemy_factory: PostSQLAlchemyFactory,
+    cached_user_repository: CachedUserRepository,
+) -> None:
+    user_id = post_sqlalchemy_factory.create_one().author_id
+    cached_user_repository.get_by_id(user_id)
+
+    cached_user_repository.update(user_id, UserUpdate(username="updated"))
+    user = cached_user_repository.get_by_id(user_id)
+
+    assert user.username == "updated"
+
+
+def test_post_writes_invalidate_author(
+    post_sqlalchemy_factory: PostSQLAlchemyFactory,
+    cached_user_repository: CachedUserRepository,
+    cached_post_repository: CachedPostRepository,
+) -> None:
+    created_post = post_sqlalchemy_factory.create_one()
+    user_id = created_post.author_id
+    cached_user_repository.get_by_id(user_id)
+
+    cached_post_repository.update(created_post.id, PostUpdate(title="Updated"))
+    assert cached_user_repository.get_by_id(user_id).posts[0].title == "Updated"
+
+    cached_post_repository.create(
+        PostCreate(title="Second", content="Content", author_id=user_id)
+    )
+    posts_count = 2
+    assert len(cached_user_repository.get_by_id(user_id).posts) == posts_count
+
+    cached_post_repository.delete(created_post.id)
+    assert len(cached_user_repository.get_by_id(user_id).posts) == 1
+
+
+def test_user_update_invalidates_posts(
+    post_sqlalchemy_factory: PostSQLAlchemyFactory,
+    cached_user_repository: CachedUserRepository,
+    cached_post_repository: CachedPostRepository,
+) -> None:
+    created_post = post_sqlalchemy_factory.create_one()
+    cached_post_repository.get_by_id(created_post.id)
+
+    cached_user_repository.update(
+        created_post.author_id, UserUpdate(username="updated")
+    )
+    post = cached_post_repository.get_by_id(created_post.id)
+
+    assert post.author
+    assert post.author.username == "updated"
+
+
+def test_search_is_not_cached(
+    post_sqlalchemy_factory: PostSQLAlchemyFactory,
+    cached_post_repository: CachedPostRepository,
+) -> None:
+    created_post = post_sqlalchemy_factory.create_one(title="Before", content="C")
+    cached_post_repository.search("before")
+
+    cached_post_repository.update(created_post.id, PostUpdate(title="After"))
+
+    assert cached_post_repository.search("before").items == []
+    assert cached_post_repository.search("after").items[0].title == "After"
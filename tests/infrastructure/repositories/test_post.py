@@ -1,15 +1,27 @@
 import uuid
 
 import pytest
+from sqlalchemy import Engine, event, func, select, text
 from sqlalchemy.orm import Session
 
 from app.application.dtos import PostCreate, PostUpdate
-from app.domain.models import PaginationParams
+from app.domain.models import (
+    CountMode,
+    PaginationParams,
+    PostDomain,
+    PostInclude,
+    PostQuerySpec,
+    TagMatch,
+)
 from app.factories.post import PostSQLAlchemyFactory
 from app.factories.user import UserSQLAlchemyFactory
-from app.infrastructure.exceptions import EntityNotFoundError
-from app.infrastructure.models import Post
+from app.infrastructure.exceptions import (
+    EntityNotFoundError,
+    InvalidCursorError,
+)
+from app.infrastructure.models import Post, Tag
 from app.infrastructure.repositories.post import PostSQLAlchemyRepository
+from tests.fixtures.database import QueryCounter
 
 
 def test_get_all(
@@ -49,6 +61,36 @@ def test_get_all_with_pagination(
     assert actual_titles == expected_titles
 
 
+def test_get_all_with_cursor(
+    post_sqlalchemy_factory: PostSQLAlchemyFactory,
+    post_repository: PostSQLAlchemyRepository,
+) -> None:
+    count = 25
+    limit = 10
+    created_posts = post_sqlalchemy_factory.create_many(count)
+
+    pages = []
+    cursor: str | None = ""
+    while cursor is not None:
+        results = post_repository.get_all(
+            pagination=PaginationParams(limit=limit, after=cursor)
+        )
+        pages.append(results)
+        cursor = results.next_cursor
+
+    assert [len(page.items) for page in pages] == [10, 10, 5]
+    assert all(page.total == count for page in pages)
+    actual_ids = [post.id for page in pages for post in page.items]
+    assert actual_ids == sorted(post.id for post in created_posts)
+
+
+def test_get_all_with_invalid_cursor(
+    post_repository: PostSQLAlchemyRepository,
+) -> None:
+    with pytest.raises(InvalidCursorError):
+        post_repository.get_all(pagination=PaginationParams(after="not-a-cursor"))
+
+
 def test_get_all_without_author(
     post_sqlalchemy_factory: PostSQLAlchemyFactory,
     post_repository: PostSQLAlchemyRepository,
@@ -84,6 +126,203 @@ def test_get_all_with_pagination_without_author(
     assert post.author is None
 
 
+def test_get_all_with_fields(
+    post_sqlalchemy_factory: PostSQLAlchemyFactory,
+    post_repository: PostSQLAlchemyRepository,
+    query_counter: QueryCounter,
+) -> None:
+    count = 3
+    created_posts = post_sqlalchemy_factory.create_many(count)
+    query_counter.count = 0
+    query_counter.statements.clear()
+
+    results = post_repository.get_all(
+        pagination=PaginationParams(count=CountMode.NONE), fields={"title"}
+    )
+
+    # A single query, of the requested columns only
+    assert query_counter.count == 1
+    [statement] = query_counter.statements
+    assert "post.title" in statement
+    assert "post.content" not in statement
+    assert [(post.id, post.title) for post in results.items] == [
+        (post.id, post.title) for post in created_posts
+    ]
+    assert all(post.content is None for post in results.items)
+    assert all(post.author is None and post.tags == [] for post in results.items)
+
+
+def test_get_all_with_trusted_mapping(
+    session: Session,
+    post_sqlalchemy_factory: PostSQLAlchemyFactory,
+    post_repository: PostSQLAlchemyRepository,
+) -> None:
+    post_sqlalchemy_factory.create_many(3)
+    trusted_repository = PostSQLAlchemyRepository(session=session, trusted_mapping=True)
+
+    results = post_repository.get_all()
+    trusted_results = trusted_repository.get_all()
+
+    assert trusted_results.items == results.items
+    assert all(post.author and post.tags for post in trusted_results.items)
+
+
+def test_get_many(
+    post_sqlalchemy_factory: PostSQLAlchemyFactory,
+    post_repository: PostSQLAlchemyRepository,
+) -> None:
+    first, second = post_sqlalchemy_factory.create_many(2)
+    missing_id = uuid.uuid4()
+
+    posts = post_repository.get_many([second.id, missing_id, first.id, second.id])
+
+    assert [post.id if post else None for post in posts] == [
+        second.id,
+        None,
+        first.id,
+        second.id,
+    ]
+    assert posts[0] is not None
+    assert posts[0].author is not None
+
+
+@pytest.mark.parametrize(
+    ("include", "queries"),
+    [(PostInclude.WITH_AUTHOR, 1), (PostInclude.WITH_AUTHOR_AND_TAGS, 2)],
+)
+def test_get_many_query_count(
+    user_sqlalchemy_factory: UserSQLAlchemyFactory,
+    post_repository: PostSQLAlchemyRepository,
+    query_counter: QueryCounter,
+    include: PostInclude,
+    queries: int,
+) -> None:
+    count = 500
+    author_id = user_sqlalchemy_factory.create_one().id
+    results = post_repository.create_many(
+        [
+            PostCreate(title="T", content="C", author_id=author_id, tags=["sql"])
+            for _ in range(count)
+        ]
+    )
+    post_ids = [result.item.id for result in results if result.item]
+    query_counter.count = 0
+
+    posts = post_repository.get_many(post_ids, include=include)
+
+    assert query_counter.count == queries
+    assert [post.id for post in posts if post] == post_ids
+
+
+def test_get_by_id_with_fields(
+    post_sqlalchemy_factory: PostSQLAlchemyFactory,
+    post_repository: PostSQLAlchemyRepository,
+) -> None:
+    created_post = post_sqlalchemy_factory.create_one()
+
+    post = post_repository.get_by_id(created_post.id, fields={"author", "tags"})
+
+    assert post.title is None
+    assert post.author_id == created_post.author_id
+    assert post.author
+    assert post.author.id == created_post.author_id
+    assert set(post.tags) == set(created_post.tags)
+
+
+def create_tagged_posts(
+    user_sqlalchemy_factory: UserSQLAlchemyFactory,
+    post_repository: PostSQLAlchemyRepository,
+    tags: list[list[str]],
+) -> list[PostDomain]:
+    author_id = user_sqlalchemy_factory.create_one().id
+    return [
+        post_repository.create(
+            PostCreate(title="Title", content="Content", author_id=author_id, tags=t)
+        )
+        for t in tags
+    ]
+
+
+@pytest.mark.parametrize(
+    ("tag_match", "expected"), [(TagMatch.ANY, [0, 1, 2]), (TagMatch.ALL, [1])]
+)
+def test_get_all_with_tags(
+    user_sqlalchemy_factory: UserSQLAlchemyFactory,
+    post_repository: PostSQLAlchemyRepository,
+    tag_match: TagMatch,
+    expected: list[int],
+) -> None:
+    posts = create_tagged_posts(
+        user_sqlalchemy_factory,
+        post_repository,
+        [["sql"], ["sql", "python"], ["python", "rust"], ["rust"]],
+    )
+    spec = PostQuerySpec(tags=["SQL", " python"], tag_match=tag_match)
+
+    results = post_repository.get_all(spec=spec)
+
+    assert results.total == len(expected)
+    assert {post.id for post in results.items} == {posts[i].id for i in expected}
+    assert post_repository.get_page_version(spec=spec) != (
+        post_repository.get_page_version()
+    )
+
+
+def test_get_all_with_tags_and_cursor(
+    user_sqlalchemy_factory: UserSQLAlchemyFactory,
+    post_repository: PostSQLAlchemyRepository,
+) -> None:
+    count = 5
+    limit = 2
+    posts = create_tagged_posts(
+        user_sqlalchemy_factory, post_repository, [["sql"], ["rust"]] * count
+    )
+    spec = PostQuerySpec(tags=["sql"])
+
+    ids = []
+    cursor: str | None = ""
+    while cursor is not None:
+        results = post_repository.get_all(
+            pagination=PaginationParams(limit=limit, after=cursor), spec=spec
+        )
+        assert results.total == count
+        ids += [post.id for post in results.items]
+        cursor = results.next_cursor
+
+    assert ids == sorted(post.id for post in posts if post.tags == ["sql"])
+
+
+def test_get_all_with_tags_reads_tag_index(
+    session: Session, post_repository: PostSQLAlchemyRepository
+) -> None:
+    spec = PostQuerySpec(tags=["sql"])
+    stmt = post_repository._apply_filters(select(Post.id), spec).params(
+        post_repository._filter_params(spec)
+    )
+    compiled = stmt.compile(session.get_bind(), compile_kwargs={"literal_binds": True})
+
+    plan = session.execute(text(f"EXPLAIN QUERY PLAN {compiled}")).all()
+
+    assert any("ix_post_tags_tag_id_post_id" in row.detail for row in plan)
+
+
+def test_iter_all(
+    post_sqlalchemy_factory: PostSQLAlchemyFactory,
+    post_repository: PostSQLAlchemyRepository,
+) -> None:
+    created_posts = post_sqlalchemy_factory.create_many(5)
+    batch_size = 2
+
+    batches = list(post_repository.iter_all(batch_size=batch_size))
+
+    assert [len(batch) for batch in batches] == [2, 2, 1]
+    posts = {post.id: post for batch in batches for post in batch}
+    assert posts.keys() == {post.id for post in created_posts}
+    for created_post in created_posts:
+        assert posts[created_post.id].author == created_post.author
+        assert set(posts[created_post.id].tags) == set(created_post.tags)
+
+
 def test_get_by_id(
     post_sqlalchemy_factory: PostSQLAlchemyFactory,
     post_repository: PostSQLAlchemyRepository,
@@ -123,6 +362,19 @@ def test_get_by_id_without_author(
     assert post.author is None
 
 
+def test_get_by_id_minimal(
+    post_sqlalchemy_factory: PostSQLAlchemyFactory,
+    post_repository: PostSQLAlchemyRepository,
+) -> None:
+    created_post = post_sqlalchemy_factory.create_one()
+
+    post = post_repository.get_by_id(created_post.id, include=PostInclude.MINIMAL)
+
+    assert post.id == created_post.id
+    assert post.author is None
+    assert post.tags == []
+
+
 def test_get_by_id_not_found(post_repository: PostSQLAlchemyRepository) -> None:
     post_id = uuid.uuid4()
 
@@ -179,6 +431,107 @@ def test_create_post_with_non_existent_user(
     assert exc_info.value.args[0] == f"User {non_existent_user_id} not found."
 
 
+def test_create_posts_sharing_tags(
+    session: Session,
+    engine: Engine,
+    user_sqlalchemy_factory: UserSQLAlchemyFactory,
+    post_repository: PostSQLAlchemyRepository,
+) -> None:
+    created_user = user_sqlalchemy_factory.create_one()
+    existing_tag = Tag(name="python")
+    session.add(existing_tag)
+    session.commit()
+
+    posts = [
+        post_repository.create(
+            PostCreate(
+                title=f"Post {i}",
+                content="Test Content",
+                author_id=created_user.id,
+                tags=["python", "fastapi"],
+            )
+        )
+        for i in range(2)
+    ]
+
+    assert all(set(post.tags) == {"python", "fastapi"} for post in posts)
+    tags = {tag.name: tag.id for tag in session.scalars(select(Tag))}
+    assert sorted(tags) == ["fastapi", "python"]
+    assert tags["python"] == existing_tag.id
+    cache = PostSQLAlchemyRepository.tag_cache
+    database = engine.url.render_as_string()
+    assert cache.get((database, "python")) == tags["python"]
+    assert cache.get((database, "fastapi")) == tags["fastapi"]
+
+
+def test_create_post_failed_commit_does_not_cache_tags(
+    session: Session,
+    engine: Engine,
+    user_sqlalchemy_factory: UserSQLAlchemyFactory,
+    post_repository: PostSQLAlchemyRepository,
+) -> None:
+    created_user = user_sqlalchemy_factory.create_one()
+    post_create = PostCreate(
+        title="Test Post",
+        content="Test Content",
+        author_id=created_user.id,
+        tags=["python"],
+    )
+
+    def fail_commit(*args: object) -> None:
+        raise RuntimeError("commit failed")
+
+    event.listen(session, "before_commit", fail_commit)
+    with pytest.raises(RuntimeError):
+        post_repository.create(post_create)
+    event.remove(session, "before_commit", fail_commit)
+    session.rollback()
+
+    post_repository.create(post_create.model_copy(update={"tags": ["fastapi"]}))
+
+    cache = PostSQLAlchemyRepository.tag_cache
+    database = engine.url.render_as_string()
+    assert cache.get((database, "python")) is None
+    assert cache.get((database, "fastapi")) is not None
+
+
+def test_create_many_posts(
+    session: Session,
+    user_sqlalchemy_factory: UserSQLAlchemyFactory,
+    post_repository: PostSQLAlchemyRepository,
+) -> None:
+    created_user = user_sqlalchemy_factory.create_one()
+    missing_user_id = uuid.uuid4()
+    posts_create = [
+        PostCreate(
+            title=f"Post {i}",
+            content="Test Content",
+            author_id=author_id,
+            tags=["python", f"tag{i}"],
+        )
+        for i, author_id in enumerate(
+            [created_user.id, missing_user_id, created_user.id]
+        )
+    ]
+
+    results = post_repository.create_many(posts_create)
+
+    assert [result.index for result in results] == [0, 1, 2]
+    assert results[1].item is None
+    assert results[1].error == f"User {missing_user_id} not found."
+    for result, post_create in zip(results[::2], posts_create[::2], strict=True):
+        assert result.item
+        assert result.item.title == post_create.title
+        assert result.item.author
+        assert result.item.author.id == created_user.id
+        assert set(result.item.tags) == set(post_create.tags)
+    tag_names = session.scalars(select(Tag.name)).all()
+    assert sorted(tag_names) == ["python", "tag0", "tag2"]
+    assert (
+        session.scalar(select(func.count()).select_from(Post)) == len(posts_create) - 1
+    )
+
+
 def test_update_post(
     session: Session,
     user_sqlalchemy_factory: UserSQLAlchemyFactory,
@@ -237,3 +590,111 @@ def test_delete_post_not_found(post_repository: PostSQLAlchemyRepository) -> Non
         post_repository.delete(post_id)
 
     assert exc_info.value.args[0] == f"Post {post_id} not found."
+
+
+def test_search(
+    post_sqlalchemy_factory: PostSQLAlchemyFactory,
+    post_repository: PostSQLAlchemyRepository,
+) -> None:
+    in_title = post_sqlalchemy_factory.create_one(
+        title="Indexing tips", content="Indexing everything"
+    )
+    in_content = post_sqlalchemy_factory.create_one(
+        title="Databases", content="Tips about indexes"
+    )
+    post_sqlalchemy_factory.create_one(title="Other", content="Nothing to see")
+
+    results = post_repository.search("index")
+
+    assert results.total is None
+    assert [post.id for post in results.items] == [in_title.id, in_content.id]
+    assert results.items[0].rank > results.items[1].rank
+    assert results.items[1].snippet == "Tips about <mark>indexes</mark>"
+    assert results.items[1].author is not None
+    assert not results.has_more
+
+
+def test_search_snippet_escapes_content(
+    post_sqlalchemy_factory: PostSQLAlchemyFactory,
+    post_repository: PostSQLAlchemyRepository,
+) -> None:
+    post_sqlalchemy_factory.create_one(
+        title="Markup", content="<script>alert(1)</script> & indexes"
+    )
+
+    results = post_repository.search("indexes")
+
+    assert results.items[0].snippet == (
+        "&lt;script&gt;alert(1)&lt;/script&gt; &amp; <mark>indexes</mark>"
+    )
+
+
+def test_search_with_cursor(
+    post_sqlalchemy_factory: PostSQLAlchemyFactory,
+    post_repository: PostSQLAlchemyRepository,
+) -> None:
+    count = 25
+    limit = 10
+    created_posts = [
+        post_sqlalchemy_factory.create_one(title="T", content="Common " * (i % 3 + 1))
+        for i in range(count)
+    ]
+
+    pages = []
+    cursor: str | None = ""
+    while cursor is not None:
+        results = post_repository.search(
+            "common", pagination=PaginationParams(limit=limit, after=cursor)
+        )
+        pages.append(results)
+        cursor = results.next_cursor
+
+    assert [len(page.items) for page in pages] == [10, 10, 5]
+    hits = [post for page in pages for post in page.items]
+    assert {post.id for post in hits} == {post.id for post in created_posts}
+    assert [post.rank for post in hits] == sorted(
+        (post.rank for post in hits), reverse=True
+    )
+
+
+def test_search_follows_writes(
+    post_sqlalchemy_factory: PostSQLAlchemyFactory,
+    post_repository: PostSQLAlchemyRepository,
+) -> None:
+    created_post = post_sqlalchemy_factory.create_one(title="T", content="Before")
+
+    post_repository.update(created_post.id, PostUpdate(content="After"))
+    assert post_repository.search("before").items == []
+    assert [post.id for post in post_repository.search("after").items] == [
+        created_post.id
+    ]
+
+    post_repository.delete(created_post.id)
+    assert post_repository.search("after").items == []
+
+
+def test_search_with_fields(
+    post_sqlalchemy_factory: PostSQLAlchemyFactory,
+    post_repository: PostSQLAlchemyRepository,
+) -> None:
+    post_sqlalchemy_factory.create_one(title="Indexing tips")
+
+    results = post_repository.search("index", fields={"id", "title", "rank"})
+
+    hit = results.items[0]
+    assert hit.title == "Indexing tips"
+    assert hit.content is None
+    assert hit.author is None
+    assert hit.snippet
+
+
+def test_search_without_terms(
+    post_sqlalchemy_factory: PostSQLAlchemyFactory,
+    post_repository: PostSQLAlchemyRepository,
+) -> None:
+    post_sqlalchemy_factory.create_one(title="Indexing tips")
+
+    results = post_repository.search(' "-" ')
+
+    assert results.items == []
+    assert not results.has_more
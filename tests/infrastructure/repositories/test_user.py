@@ -1,17 +1,39 @@
 import datetime
+import json
+import subprocess
+import sys
 import uuid
+from pathlib import Path
+from typing import Any
 
 import pytest
+from pydantic import ValidationError
+from sqlalchemy import create_engine, select, text, update
 from sqlalchemy.orm import Session
 
 from app.application.dtos import UserCreate, UserUpdate
-from app.factories.user import UserSQLAlchemyFactory
+from app.domain.models import (
+    CountMode,
+    FieldFilter,
+    FilterOp,
+    PaginationParams,
+    QuerySpec,
+    SortField,
+    SortOrder,
+    UserDomain,
+    UserInclude,
+)
+from app.factories.post import PostSQLAlchemyFactory
+from app.factories.user import UserDataFactory, UserSQLAlchemyFactory
 from app.infrastructure.exceptions import (
     EntityAlreadyExistsError,
+    EntityConflictError,
     EntityNotFoundError,
+    InvalidQueryError,
 )
-from app.infrastructure.models import User
+from app.infrastructure.models import Base, Post, User
 from app.infrastructure.repositories.user import UserSQLAlchemyRepository
+from tests.fixtures.database import QueryCounter
 
 
 def test_get_all(
@@ -28,6 +50,141 @@ def test_get_all(
     assert len(results.items) == count
 
 
+@pytest.mark.parametrize(
+    "count_mode", [CountMode.EXACT, CountMode.WINDOW, CountMode.ESTIMATE]
+)
+def test_get_all_count_modes(
+    user_sqlalchemy_factory: UserSQLAlchemyFactory,
+    user_repository: UserSQLAlchemyRepository,
+    count_mode: CountMode,
+) -> None:
+    count = 5
+    limit = 2
+    user_sqlalchemy_factory.create_many(count)
+
+    results = user_repository.get_all(
+        pagination=PaginationParams(limit=limit, count=count_mode)
+    )
+
+    assert results.total == count
+    assert results.limit == limit
+    assert results.has_more is True
+
+
+def test_cached_count_is_keyed_by_database_url(
+    tmp_path: Path, user_data_factory: UserDataFactory
+) -> None:
+    totals = {"first.db": 2, "second.db": 3}
+    for name, count in totals.items():
+        engine = create_engine(f"sqlite:///{tmp_path / name}")
+        Base.metadata.create_all(engine)
+        with Session(engine) as session:
+            UserSQLAlchemyFactory(session, user_data_factory).create_many(count)
+            repository = UserSQLAlchemyRepository(session)
+
+            results = repository.get_all(PaginationParams(count=CountMode.CACHED))
+
+            assert results.total == count
+            key = (engine.url.render_as_string(), "user")
+            assert UserSQLAlchemyRepository.count_cache.get(key) == count
+        engine.dispose()
+
+
+def test_get_all_window_count_past_last_page(
+    user_sqlalchemy_factory: UserSQLAlchemyFactory,
+    user_repository: UserSQLAlchemyRepository,
+) -> None:
+    count = 3
+    user_sqlalchemy_factory.create_many(count)
+
+    results = user_repository.get_all(
+        pagination=PaginationParams(page=5, count=CountMode.WINDOW)
+    )
+
+    assert results.total == count
+    assert results.items == []
+    assert results.has_more is False
+
+
+def test_get_all_without_count(
+    user_sqlalchemy_factory: UserSQLAlchemyFactory,
+    user_repository: UserSQLAlchemyRepository,
+) -> None:
+    count = 3
+    user_sqlalchemy_factory.create_many(count)
+
+    first_page = user_repository.get_all(
+        pagination=PaginationParams(limit=2, count=CountMode.NONE)
+    )
+    last_page = user_repository.get_all(
+        pagination=PaginationParams(page=2, limit=2, count=CountMode.NONE)
+    )
+
+    assert first_page.total is None
+    assert first_page.has_more is True
+    assert last_page.total is None
+    assert last_page.has_more is False
+
+
+def test_get_all_cached_count(
+    user_sqlalchemy_factory: UserSQLAlchemyFactory,
+    user_repository: UserSQLAlchemyRepository,
+) -> None:
+    count = 3
+    pagination = PaginationParams(count=CountMode.CACHED)
+    user_sqlalchemy_factory.create_many(count)
+    user_repository.get_all(pagination=pagination)
+
+    # Bypasses the repository, so the cached count is not invalidated
+    user_sqlalchemy_factory.create_one()
+    stale_results = user_repository.get_all(pagination=pagination)
+    user_repository.create(
+        UserCreate(
+            username="johndoe",
+            email="john@example.com",
+            level=1,
+            height=180.0,
+            birth_date=datetime.date(1990, 1, 1),
+        )
+    )
+    fresh_results = user_repository.get_all(pagination=pagination)
+
+    assert stale_results.total == count
+    assert fresh_results.total == count + 2
+
+
+@pytest.mark.parametrize("include", list(UserInclude))
+def test_get_all_query_count_does_not_depend_on_page_size(
+    post_sqlalchemy_factory: PostSQLAlchemyFactory,
+    user_repository: UserSQLAlchemyRepository,
+    query_counter: QueryCounter,
+    include: UserInclude,
+) -> None:
+    query_counts = []
+    for _ in range(2):
+        # Each post is created with its own author
+        post_sqlalchemy_factory.create_many(5)
+
+        query_counter.count = 0
+        user_repository.get_all(include=include)
+        query_counts.append(query_counter.count)
+
+    assert query_counts[0] == query_counts[1]
+
+
+def test_get_all_with_posts_without_tags(
+    post_sqlalchemy_factory: PostSQLAlchemyFactory,
+    user_repository: UserSQLAlchemyRepository,
+) -> None:
+    post_sqlalchemy_factory.create_one()
+
+    results = user_repository.get_all(include=UserInclude.WITH_POSTS)
+
+    user = results.items[0]
+    assert len(user.posts) == 1
+    assert user.posts[0].tags == []
+
+
 def test_get_by_id(
     user_sqlalchemy_factory: UserSQLAlchemyFactory,
     user_repository: UserSQLAlchemyRepository,
@@ -46,6 +203,236 @@ def test_get_by_id(
     assert user.posts == []
 
 
+def test_get_by_id_reuses_statement(
+    user_sqlalchemy_factory: UserSQLAlchemyFactory,
+    user_repository: UserSQLAlchemyRepository,
+) -> None:
+    users = user_sqlalchemy_factory.create_many(2)
+    user_repository.statement_cache.clear()
+
+    for user in users:
+        assert user_repository.get_by_id(user.id).id == user.id
+
+    assert len(user_repository.statement_cache) == 1
+
+
+def test_get_all_pages_reuse_statement(
+    user_sqlalchemy_factory: UserSQLAlchemyFactory,
+    user_repository: UserSQLAlchemyRepository,
+) -> None:
+    count = 3
+    user_sqlalchemy_factory.create_many(count)
+    user_repository.statement_cache.clear()
+
+    ids: set[uuid.UUID] = set()
+    for page in range(1, count + 1):
+        pagination = PaginationParams(page=page, limit=1, count=CountMode.NONE)
+        ids.update(user.id for user in user_repository.get_all(pagination).items)
+
+    assert len(ids) == count
+    assert len(user_repository.statement_cache) == 1
+
+
+def create_levelled_users(
+    user_sqlalchemy_factory: UserSQLAlchemyFactory, levels: list[int]
+) -> list[UserDomain]:
+    return [
+        user_sqlalchemy_factory.create_one(level=level, is_active=i % 2 == 0)
+        for i, level in enumerate(levels)
+    ]
+
+
+def test_get_all_with_spec(
+    user_sqlalchemy_factory: UserSQLAlchemyFactory,
+    user_repository: UserSQLAlchemyRepository,
+) -> None:
+    create_levelled_users(user_sqlalchemy_factory, [10, 20, 30, 40, 50, 60])
+    spec = QuerySpec(
+        filters=[
+            FieldFilter(field="level", op=FilterOp.GTE, value=20),
+            FieldFilter(field="level", op=FilterOp.LT, value="60"),
+            FieldFilter(field="is_active", value="true"),
+        ],
+        sort=[SortField(field="level", order=SortOrder.DESC)],
+    )
+
+    results = user_repository.get_all(spec=spec)
+
+    # Levels 30 and 50, of the active users
+    assert [user.level for user in results.items] == [50, 30]
+    assert results.total == len(results.items)
+    assert user_repository.get_page_version(spec=spec) != (
+        user_repository.get_page_version()
+    )
+
+
+def test_get_all_with_spec_and_mixed_order_cursor(
+    user_sqlalchemy_factory: UserSQLAlchemyFactory,
+    user_repository: UserSQLAlchemyRepository,
+) -> None:
+    users = create_levelled_users(user_sqlalchemy_factory, [1, 2, 2, 2, 3, 3, 4])
+    spec = QuerySpec(
+        sort=[
+            SortField(field="level", order=SortOrder.DESC),
+            SortField(field="height"),
+        ]
+    )
+
+    ids = []
+    cursor: str | None = ""
+    while cursor is not None:
+        results = user_repository.get_all(
+            pagination=PaginationParams(limit=2, after=cursor), spec=spec
+        )
+        ids += [user.id for user in results.items]
+        cursor = results.next_cursor
+
+    expected = sorted(users, key=lambda user: (-user.level, user.height, user.id))
+    assert ids == [user.id for user in expected]
+
+
+def test_get_all_with_spec_and_offset(
+    user_sqlalchemy_factory: UserSQLAlchemyFactory,
+    user_repository: UserSQLAlchemyRepository,
+) -> None:
+    create_levelled_users(user_sqlalchemy_factory, [5, 3, 4, 1, 2])
+    spec = QuerySpec(sort=[SortField(field="level")])
+
+    results = user_repository.get_all(
+        pagination=PaginationParams(page=2, limit=2), spec=spec
+    )
+
+    assert [user.level for user in results.items] == [3, 4]
+
+
+@pytest.mark.parametrize(
+    "spec",
+    [
+        QuerySpec(filters=[FieldFilter(field="email", value="a@example.com")]),
+        QuerySpec(filters=[FieldFilter(field="is_active", op=FilterOp.GT, value=1)]),
+        QuerySpec(filters=[FieldFilter(field="level", value="high")]),
+        QuerySpec(sort=[SortField(field="username")]),
+    ],
+)
+def test_get_all_with_invalid_spec(
+    user_repository: UserSQLAlchemyRepository, spec: QuerySpec
+) -> None:
+    with pytest.raises(InvalidQueryError):
+        user_repository.get_all(spec=spec)
+
+
+@pytest.mark.parametrize("order", list(SortOrder))
+def test_get_all_with_spec_reads_field_index(
+    session: Session, user_repository: UserSQLAlchemyRepository, order: SortOrder
+) -> None:
+    spec = QuerySpec(
+        filters=[FieldFilter(field="level", op=FilterOp.GT, value=3)],
+        sort=[SortField(field="level", order=order)],
+    )
+    stmt = user_repository._paginate(
+        user_repository._apply_filters(select(User.id), spec), None, spec
+    ).params(user_repository._filter_params(spec))
+    compiled = stmt.compile(session.get_bind(), compile_kwargs={"literal_binds": True})
+
+    plan = session.execute(text(f"EXPLAIN QUERY PLAN {compiled}")).all()
+
+    assert any("ix_user_level_id" in row.detail for row in plan)
+    assert not any("TEMP B-TREE" in row.detail for row in plan)
+
+
+def test_get_by_id_minimal(
+    post_sqlalchemy_factory: PostSQLAlchemyFactory,
+    user_repository: UserSQLAlchemyRepository,
+    query_counter: QueryCounter,
+) -> None:
+    created_post = post_sqlalchemy_factory.create_one()
+    query_counter.count = 0
+
+    user = user_repository.get_by_id(
+        created_post.author_id, include=UserInclude.MINIMAL
+    )
+
+    assert user.id == created_post.author_id
+    assert user.posts == []
+    assert query_counter.count == 1
+
+
+def test_get_all_with_trusted_mapping(
+    session: Session,
+    post_sqlalchemy_factory: PostSQLAlchemyFactory,
+    user_repository: UserSQLAlchemyRepository,
+) -> None:
+    post_sqlalchemy_factory.create_many(3)
+    trusted_repository = UserSQLAlchemyRepository(session=session, trusted_mapping=True)
+
+    results = user_repository.get_all()
+    trusted_results = trusted_repository.get_all()
+
+    assert trusted_results.items == results.items
+
+
+def test_get_by_id_with_trusted_mapping_skips_validation(
+    session: Session,
+    user_sqlalchemy_factory: UserSQLAlchemyFactory,
+    user_repository: UserSQLAlchemyRepository,
+) -> None:
+    invalid_level = 0
+    created_user = user_sqlalchemy_factory.create_one()
+    # Written behind the domain's back, so it breaks the level constraint
+    session.execute(
+        update(User).where(User.id == created_user.id).values(level=invalid_level)
+    )
+    session.commit()
+    trusted_repository = UserSQLAlchemyRepository(session=session, trusted_mapping=True)
+
+    with pytest.raises(ValidationError):
+        user_repository.get_by_id(created_user.id)
+    user = trusted_repository.get_by_id(created_user.id)
+
+    assert user.level == invalid_level
+
+
+# Run in a fresh interpreter: the first validation of a user in this one has
+# long resolved UserDomain's forward reference to PostDomain.
+TRUSTED_PAGE_SCRIPT = """
+import datetime
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+from app.infrastructure.models import Base, User
+from app.infrastructure.repositories.user import UserSQLAlchemyRepository
+
+engine = create_engine("sqlite://")
+Base.metadata.create_all(engine)
+with Session(engine) as session:
+    session.add(
+        User(
+            username="user",
+            email="user@example.com",
+            level=1,
+            height=170.0,
+            is_active=True,
+            birth_date=datetime.date(2000, 1, 1),
+        )
+    )
+    session.commit()
+    repository = UserSQLAlchemyRepository(session=session, trusted_mapping=True)
+    print(repository.get_all().model_dump_json())
+"""
+
+
+def test_trusted_mapping_serializes_before_any_validation() -> None:
+    result = subprocess.run(
+        [sys.executable, "-c", TRUSTED_PAGE_SCRIPT],
+        cwd=Path(__file__).parents[3],
+        capture_output=True,
+        text=True,
+        check=False,
+    )
+
+    assert result.returncode == 0, result.stderr
+    assert json.loads(result.stdout)["items"][0]["posts"] == []
+
+
 def test_get_by_id_not_found(user_repository: UserSQLAlchemyRepository) -> None:
     user_id = uuid.uuid4()
 
@@ -55,6 +442,92 @@ def test_get_by_id_not_found(user_repository: UserSQLAlchemyRepository) -> None:
     assert exc_info.value.args[0] == f"User {user_id} not found."
 
 
+def test_get_version(
+    session: Session,
+    post_sqlalchemy_factory: PostSQLAlchemyFactory,
+    user_repository: UserSQLAlchemyRepository,
+    query_counter: QueryCounter,
+) -> None:
+    created_post = post_sqlalchemy_factory.create_one()
+    user_id = created_post.author_id
+
+    query_counter.count = 0
+    version = user_repository.get_version(user_id)
+    # The user version and the versions of its posts
+    expected_query_count = 2
+    assert query_counter.count == expected_query_count
+    assert user_repository.get_version(user_id) == version
+
+    user_repository.update(user_id, UserUpdate(height=180.0))
+    updated_version = user_repository.get_version(user_id)
+    assert updated_version != version
+
+    session.add(Post(title="Title", content="Content", author_id=user_id))
+    session.commit()
+    assert user_repository.get_version(user_id) != updated_version
+
+
+@pytest.mark.parametrize(
+    "options",
+    [{}, {"include": UserInclude.MINIMAL}, {"fields": {"username"}}],
+)
+def test_get_version_matches_loaded_entity(
+    post_sqlalchemy_factory: PostSQLAlchemyFactory,
+    user_repository: UserSQLAlchemyRepository,
+    options: dict[str, Any],
+) -> None:
+    user_id = post_sqlalchemy_factory.create_one().author_id
+
+    user = user_repository.get_by_id(user_id, **options)
+
+    assert user_repository.get_version(user_id, **options) == user.version_token()
+
+
+def test_get_version_not_found(user_repository: UserSQLAlchemyRepository) -> None:
+    with pytest.raises(EntityNotFoundError):
+        user_repository.get_version(uuid.uuid4())
+
+
+def test_get_page_version(
+    user_sqlalchemy_factory: UserSQLAlchemyFactory,
+    user_repository: UserSQLAlchemyRepository,
+) -> None:
+    users = user_sqlalchemy_factory.create_many(3)
+    pagination = PaginationParams(limit=2)
+
+    version = user_repository.get_page_version(pagination)
+    assert user_repository.get_page_version(pagination) == version
+    assert user_repository.get_page_version(PaginationParams(page=2)) != version
+
+    user_repository.update(users[0].id, UserUpdate(height=180.0))
+    updated_version = user_repository.get_page_version(pagination)
+    assert updated_version != version
+
+    # A new row changes the total even when it is not on the page
+    user_sqlalchemy_factory.create_one()
+    assert user_repository.get_page_version(pagination) != updated_version
+
+
+@pytest.mark.parametrize(
+    "options",
+    [{}, {"include": UserInclude.MINIMAL}, {"fields": {"username"}}],
+)
+def test_get_page_version_matches_loaded_page(
+    post_sqlalchemy_factory: PostSQLAlchemyFactory,
+    user_repository: UserSQLAlchemyRepository,
+    options: dict[str, Any],
+) -> None:
+    post_sqlalchemy_factory.create_many(3)
+    pagination = PaginationParams(limit=2)
+
+    page = user_repository.get_all(pagination, **options)
+
+    assert page.has_more
+    assert user_repository.get_page_version(pagination, **options) == (
+        page.version_token()
+    )
+
+
 def test_create_user(
     session: Session,
     user_repository: UserSQLAlchemyRepository,
@@ -102,6 +575,42 @@ def test_create_user_already_exists(
     assert exc_info.value.args[0] == "User already exists."
 
 
+def test_create_many_users(
+    session: Session,
+    user_sqlalchemy_factory: UserSQLAlchemyFactory,
+    user_repository: UserSQLAlchemyRepository,
+) -> None:
+    existing_user = user_sqlalchemy_factory.create_one()
+    users_create = [
+        UserCreate(
+            username=f"user{i}",
+            email=email,
+            level=1,
+            height=180.0,
+            birth_date=datetime.date(1990, 1, 1),
+        )
+        for i, email in enumerate(
+            [
+                "first@example.com",
+                existing_user.email,
+                "second@example.com",
+                "first@example.com",
+            ]
+        )
+    ]
+
+    results = user_repository.create_many(users_create)
+
+    assert [result.index for result in results] == [0, 1, 2, 3]
+    assert [result.error is None for result in results] == [True, False, True, False]
+    assert results[1].error == "User already exists."
+    for result, user_create in zip(results[::2], users_create[::2], strict=True):
+        assert result.item
+        user_db = session.get(User, result.item.id)
+        assert user_db
+        assert user_db.email == user_create.email
+
+
 def test_update_user(
     session: Session,
     user_sqlalchemy_factory: UserSQLAlchemyFactory,
@@ -135,6 +644,52 @@ def test_update_user_not_found(user_repository: UserSQLAlchemyRepository) -> Non
     assert exc_info.value.args[0] == f"User {user_id} not found."
 
 
+def bump_version_behind(session: Session, user_id: uuid.UUID) -> User:
+    """
+    Simulate a concurrent write: the row moves on, the user loaded in the
+    session keeps its version while the caller holds it.
+    """
+    user = session.get(User, user_id)
+    assert user
+    session.execute(
+        update(User)
+        .where(User.id == user_id)
+        .values(version=User.version + 1)
+        .execution_options(synchronize_session=False)
+    )
+    return user
+
+
+def test_update_user_changed_concurrently(
+    session: Session,
+    user_sqlalchemy_factory: UserSQLAlchemyFactory,
+    user_repository: UserSQLAlchemyRepository,
+) -> None:
+    created_user = user_sqlalchemy_factory.create_one()
+    loaded_user = bump_version_behind(session, created_user.id)
+
+    with pytest.raises(EntityConflictError) as exc_info:
+        user_repository.update(created_user.id, UserUpdate(height=1.8))
+
+    assert exc_info.value.args[0] == f"User {created_user.id} was changed concurrently."
+    # The session was rolled back, with the change it had not written
+    assert loaded_user.height == created_user.height
+
+
+def test_delete_user_changed_concurrently(
+    session: Session,
+    user_sqlalchemy_factory: UserSQLAlchemyFactory,
+    user_repository: UserSQLAlchemyRepository,
+) -> None:
+    created_user = user_sqlalchemy_factory.create_one()
+    loaded_user = bump_version_behind(session, created_user.id)
+
+    with pytest.raises(EntityConflictError):
+        user_repository.delete(created_user.id)
+
+    assert session.get(User, created_user.id) is loaded_user
+
+
 def test_delete_user(
     session: Session,
     user_sqlalchemy_factory: UserSQLAlchemyFactory,
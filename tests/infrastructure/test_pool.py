@@ -0,0 +1,58 @@
+from collections.abc import Iterator
+
+import pytest
+from sqlalchemy import Engine, create_engine, exc
+
+from app.infrastructure.pool import InstrumentedQueuePool, instrument
+
+
+@pytest.fixture
+def pooled_engine() -> Iterator[Engine]:
+    engine = create_engine(
+        "sqlite://",
+        poolclass=InstrumentedQueuePool,
+        pool_size=1,
+        max_overflow=0,
+        pool_timeout=0.01,
+    )
+    instrument(engine.pool)  # type: ignore[arg-type]
+    yield engine
+    engine.dispose()
+
+
+def test_pool_stats(pooled_engine: Engine) -> None:
+    pool = pooled_engine.pool
+    assert isinstance(pool, InstrumentedQueuePool)
+
+    with pooled_engine.connect():
+        assert pool.stats.checkouts == 1
+        assert pool.stats.checked_out == 1
+        assert pool.stats.connects == 1
+
+        with pytest.raises(exc.TimeoutError), pooled_engine.connect():
+            pass
+        assert pool.stats.timeouts == 1
+        assert pool.stats.max_wait_time > 0
+
+    with pooled_engine.connect():
+        pass
+
+    expected_checkouts = 2
+    assert pool.stats.checkouts == expected_checkouts
+    assert pool.stats.checked_out == 0
+    # The connection is reused
+    assert pool.stats.connects == 1
+
+
+def test_pool_stats_survive_dispose(pooled_engine: Engine) -> None:
+    with pooled_engine.connect():
+        pass
+    stats = pooled_engine.pool.stats  # type: ignore[attr-defined]
+
+    pooled_engine.dispose()
+    with pooled_engine.connect():
+        pass
+
+    assert pooled_engine.pool.stats is stats  # type: ignore[attr-defined]
+    expected_checkouts = 2
+    assert stats.checkouts == expected_checkouts
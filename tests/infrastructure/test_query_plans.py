@@ -0,0 +1,229 @@
+"""
+Plans of the hot repository queries on a seeded database.
+
+Every statement a case runs is explained. A case fails when one of them reads
+a table in full that the case does not expect, or, on PostgreSQL, when its
+estimated cost exceeds the budget of the case. Set QUERY_PLAN_DATABASE_URL
+to a scratch PostgreSQL database to check the plans production would use:
+its tables are created, seeded, analyzed, then dropped.
+"""
+
+import os
+import uuid
+from collections.abc import Callable, Iterator
+from dataclasses import dataclass
+
+import pytest
+from sqlalchemy import Engine, StaticPool, create_engine, select, text
+from sqlalchemy.orm import Session
+
+from app.application.dtos import PostCreate, PostUpdate
+from app.domain.models import (
+    CountMode,
+    FieldFilter,
+    FilterOp,
+    PaginationParams,
+    PostQuerySpec,
+    QuerySpec,
+    SortField,
+    SortOrder,
+)
+from app.factories.seed import Seeder
+from app.infrastructure.models import Base, Post, Tag
+from app.infrastructure.plans import capture_statements, explain
+from app.infrastructure.repositories.post import PostSQLAlchemyRepository
+from app.infrastructure.repositories.user import UserSQLAlchemyRepository
+
+DATABASE_URL = os.environ.get("QUERY_PLAN_DATABASE_URL", "sqlite://")
+USERS = 1_000
+POSTS = 10_000
+# In PostgreSQL cost units, roughly pages read plus a fraction per row
+DEFAULT_COST_BUDGET = 1_000.0
+PAGE = PaginationParams(limit=20, after="", count=CountMode.NONE)
+
+
+@dataclass
+class Seeded:
+    user_id: uuid.UUID
+    post_id: uuid.UUID
+    tag: str
+    word: str
+
+
+@dataclass
+class PlanCase:
+    run: Callable[[Session, Seeded], object]
+    # Tables the case reads in full on purpose
+    full_scans: frozenset[str] = frozenset()
+    cost_budget: float = DEFAULT_COST_BUDGET
+
+
+def next_page(
+    get_page: Callable[[PaginationParams], object], first: PaginationParams
+) -> None:
+    page = get_page(first)
+    cursor = getattr(page, "next_cursor", None)
+    get_page(first.model_copy(update={"after": cursor}))
+
+
+def write_post(session: Session, seeded: Seeded) -> None:
+    repository = PostSQLAlchemyRepository(session)
+    post = repository.create(
+        PostCreate(title="T", content="C", author_id=seeded.user_id, tags=["plans"])
+    )
+    repository.update(post.id, PostUpdate(title="Updated"))
+    repository.delete(post.id)
+
+
+LEVELS = QuerySpec(
+    filters=[FieldFilter(field="level", op=FilterOp.GTE, value=50)],
+    sort=[SortField(field="level", order=SortOrder.DESC)],
+)
+
+CASES = {
+    "user.get_by_id": PlanCase(
+        lambda session, seeded: UserSQLAlchemyRepository(session).get_by_id(
+            seeded.user_id
+        )
+    ),
+    "user.get_version": PlanCase(
+        lambda session, seeded: UserSQLAlchemyRepository(session).get_version(
+            seeded.user_id
+        )
+    ),
+    # First rows in storage order: the scan stops at the limit
+    "user.get_all.offset": PlanCase(
+        lambda session, _: UserSQLAlchemyRepository(session).get_all(
+            PAGE.model_copy(update={"after": None})
+        ),
+        full_scans=frozenset({"user"}),
+    ),
+    "user.get_all.keyset": PlanCase(
+        lambda session, _: next_page(UserSQLAlchemyRepository(session).get_all, PAGE)
+    ),
+    "user.get_all.spec": PlanCase(
+        lambda session, _: next_page(
+            lambda pagination: UserSQLAlchemyRepository(session).get_all(
+                pagination, spec=LEVELS
+            ),
+            PAGE,
+        )
+    ),
+    # Exact totals count every row, which is why listings can opt out
+    "user.get_all.exact_count": PlanCase(
+        lambda session, _: UserSQLAlchemyRepository(session).get_all(
+            PAGE.model_copy(update={"count": CountMode.EXACT})
+        ),
+        full_scans=frozenset({"user"}),
+        cost_budget=10 * DEFAULT_COST_BUDGET,
+    ),
+    "user.get_page_version": PlanCase(
+        lambda session, _: UserSQLAlchemyRepository(session).get_page_version(
+            PAGE, spec=LEVELS
+        )
+    ),
+    "post.get_by_id": PlanCase(
+        lambda session, seeded: PostSQLAlchemyRepository(session).get_by_id(
+            seeded.post_id
+        )
+    ),
+    "post.get_many": PlanCase(
+        lambda session, seeded: PostSQLAlchemyRepository(session).get_many(
+            [seeded.post_id, uuid.uuid4()]
+        )
+    ),
+    "post.get_all.keyset": PlanCase(
+        lambda session, _: next_page(PostSQLAlchemyRepository(session).get_all, PAGE)
+    ),
+    "post.get_all.author": PlanCase(
+        lambda session, seeded: PostSQLAlchemyRepository(session).get_all(
+            PAGE,
+            spec=QuerySpec(
+                filters=[FieldFilter(field="author_id", value=seeded.user_id)]
+            ),
+        )
+    ),
+    "post.get_all.tags": PlanCase(
+        lambda session, seeded: next_page(
+            lambda pagination: PostSQLAlchemyRepository(session).get_all(
+                pagination, spec=PostQuerySpec(tags=[seeded.tag])
+            ),
+            PAGE,
+        )
+    ),
+    "post.search": PlanCase(
+        lambda session, seeded: next_page(
+            lambda pagination: PostSQLAlchemyRepository(session).search(
+                seeded.word, pagination
+            ),
+            PAGE,
+        ),
+        cost_budget=10 * DEFAULT_COST_BUDGET,
+    ),
+    "post.write": PlanCase(write_post),
+}
+
+
+@pytest.fixture(scope="module")
+def plan_engine() -> Iterator[Engine]:
+    engine = create_engine(DATABASE_URL, poolclass=StaticPool)
+    Base.metadata.create_all(engine)
+    PostSQLAlchemyRepository.tag_cache.clear()
+    PostSQLAlchemyRepository.count_cache.clear()
+    with Session(engine) as session:
+        seeder = Seeder(session, author_pool_size=USERS)
+        seeder.seed_users(USERS)
+        seeder.seed_posts(POSTS)
+    if engine.dialect.name == "postgresql":
+        # Plans follow the statistics, which autovacuum keeps in production
+        with engine.connect().execution_options(
+            isolation_level="AUTOCOMMIT"
+        ) as connection:
+            connection.execute(text("ANALYZE"))
+    yield engine
+    Base.metadata.drop_all(engine)
+    engine.dispose()
+
+
+@pytest.fixture(scope="module")
+def seeded(plan_engine: Engine) -> Seeded:
+    with Session(plan_engine) as session:
+        post = session.scalars(select(Post).limit(1)).one()
+        return Seeded(
+            user_id=post.author_id,
+            post_id=post.id,
+            tag=session.scalars(select(Tag.name).limit(1)).one(),
+            word=max(post.title.split(), key=len).strip("."),
+        )
+
+
+@pytest.mark.parametrize("name", CASES)
+def test_query_plan(plan_engine: Engine, seeded: Seeded, name: str) -> None:
+    case = CASES[name]
+    with Session(plan_engine) as session:
+        with capture_statements(plan_engine) as statements:
+            case.run(session, seeded)
+        plans = [
+            explain(session.connection(), statement, Base.metadata.tables)
+            for statement in statements
+        ]
+
+    assert plans
+    for plan in plans:
+        assert set(plan.full_scans) <= case.full_scans, plan.statement.sql
+        if plan.cost is not None:
+            assert plan.cost <= case.cost_budget, plan.statement.sql
+
+
+def test_explain_reports_full_scans(plan_engine: Engine) -> None:
+    with plan_engine.connect() as connection:
+        with capture_statements(plan_engine) as statements:
+            connection.execute(select(Post.id).where(Post.title == "T"))
+            connection.execute(select(Post.id).where(Post.author_id == uuid.uuid4()))
+        unindexed, indexed = (
+            explain(connection, statement, Base.metadata.tables)
+            for statement in statements
+        )
+
+    assert unindexed.full_scans == ["post"]
+    assert indexed.full_scans == []
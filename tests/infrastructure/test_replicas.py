@@ -0,0 +1,60 @@
+import datetime
+from pathlib import Path
+
+from sqlalchemy import Engine, create_engine, select
+
+from app.core.config import ReplicaSelection
+from app.infrastructure.models import User
+from app.infrastructure.replicas import ReplicaSet, RoutingSession
+
+
+def _user() -> User:
+    return User(
+        username="johndoe",
+        email="john@example.com",
+        level=1,
+        height=180.0,
+        birth_date=datetime.date(1990, 1, 1),
+    )
+
+
+def test_routing_session_reads_from_replica(
+    primary_engine: Engine, replica_engine: Engine
+) -> None:
+    replicas = ReplicaSet([replica_engine])
+    with RoutingSession(primary_engine) as session:
+        session.add(_user())
+        session.commit()
+
+    with RoutingSession(primary_engine, replicas=replicas) as session:
+        assert session.scalars(select(User)).all() == []
+
+
+def test_routing_session_reads_its_writes(
+    primary_engine: Engine, replica_engine: Engine
+) -> None:
+    replicas = ReplicaSet([replica_engine])
+    with RoutingSession(primary_engine, replicas=replicas) as session:
+        user = _user()
+        session.add(user)
+        session.commit()
+
+        assert session.wrote
+        assert session.scalars(select(User)).all() == [user]
+
+
+def test_replica_set_round_robin() -> None:
+    engines = [create_engine("sqlite://") for _ in range(2)]
+    replicas = ReplicaSet(engines)
+
+    assert [replicas.choose() for _ in range(4)] == engines * 2
+
+
+def test_replica_set_least_connections(tmp_path: Path) -> None:
+    engines = [create_engine(f"sqlite:///{tmp_path / f'{i}.db'}") for i in range(2)]
+    replicas = ReplicaSet(engines, selection=ReplicaSelection.LEAST_CONNECTIONS)
+
+    with engines[0].connect():
+        assert replicas.choose() is engines[1]
+    with engines[1].connect():
+        assert replicas.choose() is engines[0]